@@ -1,26 +1,88 @@
+import hashlib
 import json
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from datetime import datetime
-from typing import List, Dict, Any
-import google.generativeai as genai
-# Rich imports - optional for terminal output
-try:
-    from rich.console import Console
-    from rich.table import Table
-    from rich.panel import Panel
-    from rich.progress import Progress, SpinnerColumn, TextColumn
-    HAS_RICH = True
-except ImportError:
-    HAS_RICH = False
+from typing import List, Dict, Any, Callable, Optional
+import threading
+import time
+from importlib.util import find_spec
+# Rich - optional for terminal output; ağır modüller ilk kullanımda yüklenir
+HAS_RICH = find_spec('rich') is not None
 from config import Config
+from incremental import IncrementalState, is_json_lines
+from llm_backends import GeminiBackend, LLMBackend, create_backend
+from planner import TASK_NAMES, build_plan
+from prompt_format import compact_header, compact_row, compact_template, format_compact
+from rate_limiter import RequestScheduler
+from response_cache import ResponseCache
+from results_store import ResultsStore, file_digest, parse_entity_terms, tweets_digest
+from structured import LANGUAGE_RULES, merge_structured, normalize_chunk, parse_structured, render_markdown
+from telemetry import Telemetry
+from tokens import estimate_tokens
+from tweet_loader import LoadStats, iter_tweets
+
+# İki dilli yanıtlardaki bölüm işaretleri, örn. "[[TURKCE]]" veya "**[[ENGLISH]]**"
+BILINGUAL_MARKER_RE = re.compile(
+    r'^[ \t#*]*\[\[\s*(TURKCE|TÜRKÇE|ENGLISH)\s*\]\][ \t*:]*$',
+    re.IGNORECASE | re.MULTILINE,
+)
+
+class AnalysisCancelled(Exception):
+    """Analiz dışarıdan (cancel_event ile) iptal edildi"""
+
+def _streaming_progress_class():
+    """Görev satırlarının altında canlı yanıt önizlemesi gösteren rich Progress"""
+    from rich.progress import Progress
+    
+    class StreamingProgress(Progress):
+        preview = None
+        
+        def get_renderables(self):
+            yield from super().get_renderables()
+            if self.preview is not None:
+                yield self.preview
+    
+    return StreamingProgress
 
 class TweetAnalyzer:
-    def __init__(self):
+    def __init__(self, backend: Optional[LLMBackend] = None,
+                 scheduler: Optional[RequestScheduler] = None,
+                 cache: Optional[ResponseCache] = None,
+                 results_store: Optional[ResultsStore] = None):
         self.config = Config()
-        self.console = Console() if HAS_RICH else None
-        self.setup_gemini()
+        self.console = None
+        if HAS_RICH:
+            from rich.console import Console
+            self.console = Console()
+        # Zamanlayıcı ve önbellek dışarıdan verilirse süreçteki diğer analizlerle paylaşılır
+        self._cache = cache
+        self._results_store = results_store
+        self._cache_lock = threading.Lock()
+        self._request_slots = None
+        self._scheduler = scheduler
+        self._cancel_event: Optional[threading.Event] = None
+        self.telemetry = Telemetry()
+        self.model = backend
+        if self.model is None:
+            self.setup_backend()
         self.create_results_dir()
     
+    def setup_backend(self):
+        """Config.LLM_BACKEND'e göre model arka ucunu kur"""
+        if self.config.LLM_BACKEND == 'gemini':
+            self.setup_gemini()
+            return
+        
+        self.model = create_backend(self.config.LLM_BACKEND, self.config)
+        msg = f"🧪 '{self.config.LLM_BACKEND}' model arka ucu kullanılıyor (ağsız test)"
+        if self.console:
+            self.console.print(f"[yellow]{msg}[/yellow]")
+        else:
+            print(msg)
+    
     def setup_gemini(self):
         """Gemini API'sini yapılandır"""
         if not self.config.GEMINI_API_KEY:
@@ -31,57 +93,280 @@ class TweetAnalyzer:
                 print(msg)
             raise ValueError("GEMINI_API_KEY gerekli")
         
-        genai.configure(api_key=self.config.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel(self.config.GEMINI_MODEL)
+        self.model = GeminiBackend(self.config.GEMINI_API_KEY, self.config.GEMINI_MODEL)
         msg = "✅ Gemini API başarıyla yapılandırıldı"
         if self.console:
             self.console.print(f"[green]{msg}[/green]")
         else:
             print(msg)
     
+    def get_cache(self) -> Optional[ResponseCache]:
+        """Yanıt önbelleğini ilk kullanımda aç (kapalıysa None)"""
+        if not self.config.CACHE_ENABLED:
+            return None
+        with self._cache_lock:
+            if self._cache is None:
+                self._cache = ResponseCache(
+                    self.config.CACHE_DIR,
+                    max_bytes=self.config.CACHE_MAX_BYTES,
+                    ttl_seconds=self.config.CACHE_TTL_SECONDS,
+                )
+            return self._cache
+    
+    def get_results_store(self) -> ResultsStore:
+        """Sonuç veritabanını ilk kullanımda aç"""
+        with self._cache_lock:
+            if self._results_store is None:
+                self._results_store = ResultsStore(self.config.RESULTS_DB)
+            return self._results_store
+    
+    def analysis_config(self, language: str) -> Dict[str, Any]:
+        """Sonucu etkileyen ayarlar; aynı kaynak bu ayarlarla yeniden analiz edilmez"""
+        templates = (self.config.ANALYSIS_PROMPT_TR, self.config.ANALYSIS_PROMPT_EN,
+                     self.config.ANALYSIS_PROMPT_BILINGUAL, self.config.COMBINE_PROMPT_BILINGUAL,
+                     self.config.STRUCTURED_PROMPT)
+        config = {
+            'language': language,
+            'model': self.model.model_name,
+            'max_tweets': self.config.MAX_TWEETS_PER_ANALYSIS,
+            'chunking': self.config.CHUNKING_MODE,
+            'chunk_size': self.config.CHUNK_TOKEN_BUDGET if self.config.CHUNKING_MODE == 'tokens' else self.config.CHUNK_SIZE,
+            'dedup': self.config.DEDUP_THRESHOLD if self.config.DEDUP_ENABLED else None,
+            'ranking': [self.config.RANKING_HALF_LIFE_HOURS, self.config.RANKING_USER_DECAY] if self.config.RANKING_ENABLED else None,
+            'prompt_format': self.config.PROMPT_FORMAT,
+            'structured': self.config.STRUCTURED_OUTPUT,
+            'bilingual': self.config.BILINGUAL_MODE,
+            'fan_in': self.config.COMBINE_FAN_IN,
+            'prompts': hashlib.sha256('\0'.join(templates).encode('utf-8')).hexdigest()[:12],
+        }
+        # Süzgeçsiz çalıştırmaların ayar özeti, süzgeç eklenmeden önceki kayıtlarla aynı kalır
+        if self.config.ENTITY_FILTER:
+            config['entities'] = sorted(parse_entity_terms(self.config.ENTITY_FILTER))
+        return config
+    
+    def find_previous_run(self, source_hash: str, language: str) -> Optional[Dict[str, Any]]:
+        """Aynı kaynağın aynı ayarlarla yapılmış analizi (yeniden kullanım kapalıysa None)"""
+        if not self.config.REUSE_PREVIOUS_RUNS:
+            return None
+        return self.get_results_store().find_run(source_hash, self.analysis_config(language))
+    
+    def report_previous_run(self, run: Dict[str, Any]):
+        """Önceki çalıştırmanın sonucunu yeniden analiz etmeden göster"""
+        created = datetime.fromtimestamp(run['created_at']).strftime('%Y-%m-%d %H:%M:%S')
+        self.console.print(
+            f"♻️ [cyan]Bu kaynak aynı ayarlarla daha önce analiz edildi (çalıştırma #{run['id']}, {created}); "
+            f"model çağrısı yapılmadı. Yeniden analiz için --force kullanın.[/cyan]"
+        )
+        self.display_results(run['results'], run['tweet_count'])
+    
+    def get_scheduler(self) -> RequestScheduler:
+        """Hız sınırı ve yeniden deneme zamanlayıcısını ilk kullanımda oluştur"""
+        with self._cache_lock:
+            if self._scheduler is None:
+                self._scheduler = RequestScheduler(
+                    requests_per_minute=self.config.RATE_LIMIT_RPM,
+                    tokens_per_minute=self.config.RATE_LIMIT_TPM,
+                    max_retries=self.config.MAX_RETRIES,
+                    base_delay=self.config.RETRY_BASE_DELAY,
+                    max_delay=self.config.RETRY_MAX_DELAY,
+                )
+            return self._scheduler
+    
+    def _get_request_slots(self) -> threading.BoundedSemaphore:
+        """Eşzamanlı Gemini isteklerini sınırlayan semaforu ilk kullanımda oluştur"""
+        with self._cache_lock:
+            if self._request_slots is None:
+                self._request_slots = threading.BoundedSemaphore(max(1, self.config.MAX_CONCURRENT_REQUESTS))
+            return self._request_slots
+    
+    def _generate(self, prompt: str, kind: str = 'chunk',
+                  stream: Optional[Callable[[str], None]] = None, json_mode: bool = False) -> str:
+        """
+        Prompt'u önbellek üzerinden Gemini'ye gönder ve yanıt metnini döndür.
+        `stream` verilirse yanıt akışla alınır ve her parçada o ana kadarki metinle çağrılır;
+        `json_mode` yanıtı JSON olarak ister (akışsız).
+        """
+        self._check_cancelled()
+        prompt_tokens = estimate_tokens(prompt)
+        started = time.perf_counter()
+        cache = self.get_cache()
+        if cache:
+            cached = cache.get(self.model.model_name, prompt)
+            if cached is not None:
+                self.telemetry.record_call(kind, len(prompt), prompt_tokens, len(cached),
+                                           time.perf_counter() - started, cached=True)
+                if stream:
+                    stream(cached)
+                return cached
+        
+        first_token = None
+        
+        def generate_streaming() -> str:
+            nonlocal first_token
+            # Yeniden denemede metin baştan birikir
+            parts = []
+            for piece in self.model.generate_stream(prompt):
+                self._check_cancelled()
+                if first_token is None:
+                    first_token = time.perf_counter() - started
+                parts.append(piece)
+                stream(''.join(parts))
+            return ''.join(parts)
+        
+        try:
+            # İç içe havuzlar olsa da aynı anda uçuşta olan istek sayısı sınırlı kalır
+            with self._get_request_slots():
+                self._check_cancelled()
+                if json_mode:
+                    call = lambda: self.model.generate_json(prompt)
+                elif stream:
+                    call = generate_streaming
+                else:
+                    call = lambda: self.model.generate(prompt)
+                text, retries = self.get_scheduler().call(call, tokens=prompt_tokens)
+        except Exception as e:
+            self.telemetry.record_call(kind, len(prompt), prompt_tokens, 0,
+                                       time.perf_counter() - started, error=type(e).__name__)
+            raise
+        self.telemetry.record_call(kind, len(prompt), prompt_tokens, len(text),
+                                   time.perf_counter() - started, retries=retries, first_token=first_token)
+        if cache:
+            cache.set(self.model.model_name, prompt, text)
+        return text
+    
+    def _check_cancelled(self):
+        """İptal istendiyse yeni model çağrısı yapmadan AnalysisCancelled fırlat"""
+        if self._cancel_event is not None and self._cancel_event.is_set():
+            raise AnalysisCancelled("Analiz iptal edildi")
+    
     def create_results_dir(self):
         """Sonuçlar dizinini oluştur"""
         if not os.path.exists(self.config.RESULTS_DIR):
             os.makedirs(self.config.RESULTS_DIR)
     
     def load_tweets(self, json_file: str) -> List[Dict[str, Any]]:
-        """JSON dosyasından tweet verilerini yükle"""
+        """JSON veya JSON Lines dosyasından tweet verilerini akışlı olarak yükle"""
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                tweets = json.load(f)
-            msg = f"📁 {len(tweets)} tweet başarıyla yüklendi"
+            return self.read_tweets(json_file)
+        except (FileNotFoundError, json.JSONDecodeError, ValueError) as e:
+            msg = f"❌ {self.load_error_message(e, json_file)}"
             if self.console:
-                self.console.print(f"[green]{msg}[/green]")
+                self.console.print(f"[red]{msg}[/red]")
             else:
                 print(msg)
-            return tweets
-        except FileNotFoundError:
-            msg = f"❌ Dosya bulunamadı: {json_file}"
+            return []
+    
+    def read_tweets(self, json_file: str) -> List[Dict[str, Any]]:
+        """Dosyayı yükle; okunamayan ya da bozuk dosyada hatayı yükselt"""
+        stats = LoadStats()
+        tweets = list(iter_tweets(json_file, stats))
+        msg = f"📁 {len(tweets)} tweet başarıyla yüklendi"
+        if self.console:
+            self.console.print(f"[green]{msg}[/green]")
+        else:
+            print(msg)
+        if stats.skipped:
+            msg = f"⚠️ {stats.skipped} geçersiz kayıt atlandı ({stats.errors[0]})"
             if self.console:
-                self.console.print(f"[red]{msg}[/red]")
+                self.console.print(f"[yellow]{msg}[/yellow]")
             else:
                 print(msg)
-            return []
-        except json.JSONDecodeError:
-            msg = f"❌ JSON dosyası bozuk: {json_file}"
+        return tweets
+    
+    @staticmethod
+    def load_error_message(error: Exception, json_file: str) -> str:
+        """Yükleme hatasının kullanıcıya gösterilen açıklaması"""
+        if isinstance(error, FileNotFoundError):
+            return f"Dosya bulunamadı: {json_file}"
+        if isinstance(error, json.JSONDecodeError):
+            return f"JSON dosyası bozuk: {json_file} ({error})"
+        return f"{error}: {json_file}"
+    
+    def format_tweet(self, index: int, tweet: Dict[str, Any]) -> str:
+        """Tek bir tweet'i analiz şablonuna göre formatla"""
+        repeat = ""
+        if tweet.get('duplicate_count', 1) > 1:
+            repeat = f"Tekrar: {tweet['duplicate_count']} benzer tweet\n"
+        return f"""
+Tweet {index}:
+Kullanıcı: {tweet.get('username', 'Bilinmeyen')}
+Zaman: {tweet.get('timestamp', 'Bilinmeyen')}
+Metin: {tweet.get('text', '')}
+{repeat}---
+"""
+    
+    def tweet_cost(self, index: int, tweet: Dict[str, Any]) -> int:
+        """Tweet'in prompt'ta tuttuğu tahmini token (kompakt biçimde takma ad ve göreli zamandan önce, üst sınır)"""
+        if self.config.PROMPT_FORMAT == 'compact':
+            return estimate_tokens(compact_row(index, tweet.get('username') or 'Bilinmeyen', '00h', tweet))
+        return estimate_tokens(self.format_tweet(index, tweet))
+    
+    def prompt_overhead(self) -> int:
+        """Parça başına tweet'lerden bağımsız token (kompakt biçimin başlık satırı)"""
+        if self.config.PROMPT_FORMAT == 'compact':
+            return estimate_tokens(compact_header(0.0)) + 1
+        return 0
+    
+    def prompt_template(self, template: str) -> str:
+        """Kompakt biçimde şablonun satır başı girintisi atılır"""
+        if self.config.PROMPT_FORMAT == 'compact':
+            return compact_template(template)
+        return template
+    
+    def deduplicate(self, tweets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Yakın kopya tweet'leri tek temsilciye indir ve kazanılan token'ı raporla"""
+        from dedup import deduplicate_tweets  # numpy yalnızca eleme yapılırken yüklenir
+        
+        unique, removed = deduplicate_tweets(tweets, self.config.DEDUP_THRESHOLD)
+        if removed:
+            saved_tokens = sum(self.tweet_cost(1, tweet) for tweet in removed)
+            msg = f"🧹 {len(removed)} yakın kopya tweet birleştirildi (~{saved_tokens} token tasarruf)"
             if self.console:
-                self.console.print(f"[red]{msg}[/red]")
+                self.console.print(f"[cyan]{msg}[/cyan]")
             else:
                 print(msg)
-            return []
+        return unique
+    
+    def filter_by_entities(self, tweets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Yalnızca ENTITY_FILTER'daki varlıklardan en az birinin geçtiği tweet'leri tut"""
+        from entities import index_tweets  # numpy/pandas yalnızca süzme yapılırken yüklenir
+        
+        index = index_tweets(tweets)
+        terms = parse_entity_terms(self.config.ENTITY_FILTER)
+        selected = index.select(tweets, terms)
+        found = index.resolve(terms)
+        msg = (f"🏷️ {', '.join(terms)} için {len(selected)}/{len(tweets)} tweet seçildi"
+               f" (eşleşen varlıklar: {', '.join(found) or 'yok'})")
+        if self.console:
+            self.console.print(f"[cyan]{msg}[/cyan]")
+        else:
+            print(msg)
+        return selected
+    
+    def select_tweets(self, tweets: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+        """Sınırı aşan tweet'lerden alaka puanı en yüksek `limit` tanesini seç"""
+        from ranking import select_top_tweets  # numpy yalnızca sıralama yapılırken yüklenir
+        
+        selected = select_top_tweets(
+            tweets, limit,
+            half_life_hours=self.config.RANKING_HALF_LIFE_HOURS,
+            user_decay=self.config.RANKING_USER_DECAY,
+        )
+        msg = f"🎯 {len(tweets)} tweet arasından alaka puanı en yüksek {len(selected)} tanesi seçildi"
+        if self.console:
+            self.console.print(f"[yellow]{msg}[/yellow]")
+        else:
+            print(msg)
+        return selected
     
     def format_tweets_for_analysis(self, tweets: List[Dict[str, Any]]) -> str:
         """Tweet verilerini analiz için formatla"""
+        if self.config.PROMPT_FORMAT == 'compact':
+            return format_compact(tweets)
+        
         formatted_tweets = []
         for i, tweet in enumerate(tweets, 1):
-            formatted_tweet = f"""
-Tweet {i}:
-Kullanıcı: {tweet.get('username', 'Bilinmeyen')}
-Zaman: {tweet.get('timestamp', 'Bilinmeyen')}
-Metin: {tweet.get('text', '')}
----
-"""
-            formatted_tweets.append(formatted_tweet)
+            formatted_tweets.append(self.format_tweet(i, tweet))
         
         return '\n'.join(formatted_tweets)
     
@@ -92,18 +377,134 @@ Metin: {tweet.get('text', '')}
             chunks.append(tweets[i:i + chunk_size])
         return chunks
     
-    def analyze_tweets_chunk(self, tweets_chunk: List[Dict[str, Any]], language: str) -> str:
-        """Tweet parçasını analiz et"""
-        formatted_tweets = self.format_tweets_for_analysis(tweets_chunk)
+    def pack_tweets(self, tweets: List[Dict[str, Any]], token_budget: int) -> List[List[Dict[str, Any]]]:
+        """Tweet'leri sırayı bozmadan, her parça token bütçesini dolduracak şekilde paketle"""
+        chunks = []
+        current = []
+        overhead = self.prompt_overhead()
+        current_tokens = overhead
+        
+        for tweet in tweets:
+            # +1: parçalar arasındaki satır sonu
+            cost = self.tweet_cost(len(current) + 1, tweet) + 1
+            if current and current_tokens + cost > token_budget:
+                chunks.append(current)
+                current, current_tokens = [], overhead
+                cost = self.tweet_cost(1, tweet) + 1
+            # Bütçeden büyük tek bir tweet kendi parçasına yerleşir
+            current.append(tweet)
+            current_tokens += cost
+        if current:
+            chunks.append(current)
+        
+        if chunks:
+            used = sum(estimate_tokens(self.format_tweets_for_analysis(chunk)) for chunk in chunks)
+            fill_ratio = used / (token_budget * len(chunks))
+            msg = f"📦 {len(tweets)} tweet {len(chunks)} parçaya paketlendi (bütçe doluluğu: %{fill_ratio * 100:.0f})"
+            if self.console:
+                self.console.print(f"[cyan]{msg}[/cyan]")
+            else:
+                print(msg)
+        return chunks
+    
+    def prepare_chunks(self, tweets: List[Dict[str, Any]],
+                       overflow: Optional[List[Dict[str, Any]]] = None) -> List[List[Dict[str, Any]]]:
+        """
+        Varlık süzgecini uygula, yakın kopyaları ele, tweet sayısını sınırla ve model çağrısı yapılacak parçalara böl.
+        `overflow` verilirse sınır yüzünden seçilmeyen tweet'ler ona eklenir.
+        """
+        if self.config.ENTITY_FILTER:
+            with self.telemetry.span('entity_filter', tweets=len(tweets)):
+                tweets = self.filter_by_entities(tweets)
+        
+        # Yakın kopyaları ele (sınırlamadan önce, böylece sınır benzersiz tweet'lere uygulanır)
+        if self.config.DEDUP_ENABLED:
+            with self.telemetry.span('dedup', tweets=len(tweets)):
+                tweets = self.deduplicate(tweets)
+        
+        # Tweet sayısını sınırla
+        if len(tweets) > self.config.MAX_TWEETS_PER_ANALYSIS:
+            if self.config.RANKING_ENABLED:
+                with self.telemetry.span('ranking', tweets=len(tweets)):
+                    selected = self.select_tweets(tweets, self.config.MAX_TWEETS_PER_ANALYSIS)
+            else:
+                selected = tweets[:self.config.MAX_TWEETS_PER_ANALYSIS]
+                self.console.print(f"⚠️ [yellow]Tweet sayısı {self.config.MAX_TWEETS_PER_ANALYSIS} ile sınırlandı[/yellow]")
+            if overflow is not None:
+                chosen = {id(tweet) for tweet in selected}
+                overflow.extend(tweet for tweet in tweets if id(tweet) not in chosen)
+            tweets = selected
+        
+        # Tweet verilerini parçalara böl
+        with self.telemetry.span('chunking', tweets=len(tweets)):
+            if self.config.CHUNKING_MODE == 'tokens':
+                return self.pack_tweets(tweets, self.config.CHUNK_TOKEN_BUDGET)
+            return self.chunk_tweets(tweets, self.config.CHUNK_SIZE)
+    
+    def chunk_tasks(self, language: str) -> List[str]:
+        """Her parça için yapılacak çağrılar (ve ayrı birleştirme ağaçları)"""
+        # Yapılandırılmış modda her parça tek çağrıyla JSON döndürür, birleştirme yereldir;
+        # iki dilli modda her parça tek çağrıyla iki dilde analiz edilir
+        if self.config.STRUCTURED_OUTPUT:
+            return ['structured']
+        if language == 'both' and self.config.BILINGUAL_MODE:
+            return ['both']
+        return [lang for lang in ('turkish', 'english') if language in (lang, 'both')]
+    
+    def chunk_prompt(self, formatted_tweets: str, task: str, language: str = 'both') -> str:
+        """Parça çağrısının prompt'u; `task` 'turkish', 'english', 'both' (iki dilli) ya da 'structured'"""
+        if task == 'structured':
+            return self.prompt_template(self.config.STRUCTURED_PROMPT).format(
+                language_rule=LANGUAGE_RULES[language], tweets=formatted_tweets
+            )
+        template = {
+            'turkish': self.config.ANALYSIS_PROMPT_TR,
+            'english': self.config.ANALYSIS_PROMPT_EN,
+            'both': self.config.ANALYSIS_PROMPT_BILINGUAL,
+        }[task]
+        return self.prompt_template(template).format(tweets=formatted_tweets)
+    
+    def merge_prompt(self, analyses: List[Any], language: str) -> str:
+        """Birleştirme çağrısının prompt'u ('both' için parçalar {'turkish', 'english'} sözlükleridir)"""
+        if language == 'both':
+            return self.config.COMBINE_PROMPT_BILINGUAL.format(
+                turkish="\n\n".join(analysis['turkish'] for analysis in analyses),
+                english="\n\n".join(analysis['english'] for analysis in analyses),
+            )
+        
+        combined_text = "\n\n".join(analyses)
         
         if language == 'turkish':
-            prompt = self.config.ANALYSIS_PROMPT_TR.format(tweets=formatted_tweets)
-        else:
-            prompt = self.config.ANALYSIS_PROMPT_EN.format(tweets=formatted_tweets)
+            return f"""
+            Aşağıdaki Twitter analizi parçalarını tek bir kapsamlı analiz halinde birleştir:
+            
+            {combined_text}
+            
+            Lütfen tutarlı, organize ve özetlenmiş bir analiz sun.
+            """
+        return f"""
+            Combine the following Twitter analysis parts into one comprehensive analysis:
+            
+            {combined_text}
+            
+            Please provide a consistent, organized and summarized analysis.
+            """
+    
+    def analyze_tweets_chunk(self, tweets_chunk: List[Dict[str, Any]], language: str,
+                             stream: Optional[Callable[[str], None]] = None):
+        """Tweet parçasını analiz et ('both' için tek çağrıda iki dilli sonuç döner)"""
+        with self.telemetry.span('format_prompt', tweets=len(tweets_chunk)):
+            formatted_tweets = self.format_tweets_for_analysis(tweets_chunk)
+        
+        if language == 'both':
+            return self._analyze_chunk_bilingual(tweets_chunk, formatted_tweets, stream)
+        
+        prompt = self.chunk_prompt(formatted_tweets, language)
         
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            return self._generate(prompt, stream=stream)
+        except AnalysisCancelled:
+            raise
         except Exception as e:
             msg = f"❌ Analiz hatası: {str(e)}"
             if self.console:
@@ -112,87 +513,331 @@ Metin: {tweet.get('text', '')}
                 print(msg)
             return f"Analiz yapılamadı: {str(e)}"
     
-    def analyze_tweets(self, tweets: List[Dict[str, Any]], language: str = 'both') -> Dict[str, str]:
-        """Tweet verilerini analiz et"""
+    def _analyze_chunk_bilingual(self, tweets_chunk: List[Dict[str, Any]], formatted_tweets: str,
+                                 stream: Optional[Callable[[str], None]] = None) -> Dict[str, str]:
+        """Türkçe ve İngilizce analizi tek Gemini çağrısıyla al"""
+        prompt = self.chunk_prompt(formatted_tweets, 'both')
+        
+        try:
+            response_text = self._generate(prompt, stream=stream)
+        except AnalysisCancelled:
+            raise
+        except Exception as e:
+            msg = f"❌ Analiz hatası: {str(e)}"
+            if self.console:
+                self.console.print(f"[red]{msg}[/red]")
+            else:
+                print(msg)
+            error = f"Analiz yapılamadı: {str(e)}"
+            return {'turkish': error, 'english': error}
+        
+        sections = self.split_bilingual_response(response_text)
+        if sections:
+            return sections
+        
+        # Model işaretlere uymadıysa dilleri ayrı ayrı iste
+        msg = "⚠️ İki dilli yanıt ayrıştırılamadı, diller ayrı ayrı analiz ediliyor"
+        if self.console:
+            self.console.print(f"[yellow]{msg}[/yellow]")
+        else:
+            print(msg)
+        return {
+            'turkish': self.analyze_tweets_chunk(tweets_chunk, 'turkish'),
+            'english': self.analyze_tweets_chunk(tweets_chunk, 'english'),
+        }
+    
+    def analyze_chunk_structured(self, tweets_chunk: List[Dict[str, Any]], language: str) -> Dict[str, Any]:
+        """Tweet parçasından şemaya uygun JSON iste ve ortak biçime getir (hata olursa {'error'})"""
+        with self.telemetry.span('format_prompt', tweets=len(tweets_chunk)):
+            formatted_tweets = self.format_tweets_for_analysis(tweets_chunk)
+        prompt = self.chunk_prompt(formatted_tweets, 'structured', language)
+        
+        try:
+            data = parse_structured(self._generate(prompt, json_mode=True))
+        except AnalysisCancelled:
+            raise
+        except ValueError as e:
+            # json.JSONDecodeError da ValueError'dır
+            msg = f"⚠️ JSON yanıtı ayrıştırılamadı, parça atlandı: {str(e)}"
+            if self.console:
+                self.console.print(f"[yellow]{msg}[/yellow]")
+            else:
+                print(msg)
+            return {'error': str(e)}
+        except Exception as e:
+            msg = f"❌ Analiz hatası: {str(e)}"
+            if self.console:
+                self.console.print(f"[red]{msg}[/red]")
+            else:
+                print(msg)
+            return {'error': str(e)}
+        return normalize_chunk(data, len(tweets_chunk))
+    
+    def merge_structured_results(self, chunks: List[Dict[str, Any]], language: str) -> Dict[str, Any]:
+        """Parça JSON'larını yerelde birleştir ve istenen dillerde metne dök"""
+        valid = [chunk for chunk in chunks if 'error' not in chunk]
+        if not valid:
+            return {"error": f"Hiçbir parça analiz edilemedi: {chunks[0]['error']}"}
+        merged = merge_structured(valid)
+        results = {
+            lang: render_markdown(merged, code)
+            for lang, code in (('turkish', 'tr'), ('english', 'en')) if language in (lang, 'both')
+        }
+        results['structured'] = merged
+        return results
+    
+    def split_bilingual_response(self, text: str) -> Optional[Dict[str, str]]:
+        """İki dilli yanıtı {'turkish', 'english'} bölümlerine ayır"""
+        parts = BILINGUAL_MARKER_RE.split(text)
+        sections = {}
+        # parts: [önsöz, işaret, metin, işaret, metin, ...]
+        for marker, body in zip(parts[1::2], parts[2::2]):
+            key = 'english' if marker.upper() == 'ENGLISH' else 'turkish'
+            sections[key] = body.strip()
+        
+        if sections.get('turkish') and sections.get('english'):
+            return sections
+        return None
+    
+    def split_partial_response(self, text: str, language: str) -> Dict[str, str]:
+        """Akış sırasında gelen yarım yanıtı dillere ayır (iki dilli yanıtta işaret öncesi atlanır)"""
+        if language != 'both':
+            return {language: text}
+        parts = BILINGUAL_MARKER_RE.split(text)
+        return {
+            'english' if marker.upper() == 'ENGLISH' else 'turkish': body.strip()
+            for marker, body in zip(parts[1::2], parts[2::2])
+        }
+    
+    def analyze_tweets(self, tweets: List[Dict[str, Any]], language: str = 'both',
+                       on_partial: Optional[Callable[[Dict[str, str]], None]] = None,
+                       progress_callback: Optional[Callable[[int, int, str, Any], None]] = None,
+                       cancel_event: Optional[threading.Event] = None,
+                       progress=None, label: Optional[str] = None,
+                       overflow: Optional[List[Dict[str, Any]]] = None) -> Dict[str, str]:
+        """
+        Tweet verilerini analiz et.
+        Akış açıksa son birleştirme (tek parçada parça analizi) canlı gösterilir ve
+        `on_partial` o ana kadarki {'turkish', 'english'} metinleriyle çağrılır.
+        `progress_callback(tamamlanan, toplam, dil, sonuç)` her parça bittiğinde çağrılır;
+        `cancel_event` kurulursa bekleyen model çağrıları yapılmaz ve AnalysisCancelled fırlatılır.
+        `progress` verilirse (toplu analiz) görevler ona eklenir, `label` görev adının önüne yazılır.
+        `overflow` verilirse tweet sınırı yüzünden analize girmeyen tweet'ler ona eklenir.
+        """
         if not tweets:
             return {"error": "Analiz edilecek tweet bulunamadı"}
+        self._cancel_event = cancel_event
         
-        # Tweet sayısını sınırla
-        if len(tweets) > self.config.MAX_TWEETS_PER_ANALYSIS:
-            tweets = tweets[:self.config.MAX_TWEETS_PER_ANALYSIS]
-            self.console.print(f"⚠️ [yellow]Tweet sayısı {self.config.MAX_TWEETS_PER_ANALYSIS} ile sınırlandı[/yellow]")
+        tweet_chunks = self.prepare_chunks(tweets, overflow)
+        if not tweet_chunks:
+            return {"error": "Seçilen varlıkların geçtiği tweet bulunamadı"}
         
-        # Tweet verilerini parçalara böl
-        tweet_chunks = self.chunk_tweets(tweets, self.config.CHUNK_SIZE)
+        structured = self.config.STRUCTURED_OUTPUT
+        bilingual = language == 'both' and self.config.BILINGUAL_MODE
+        languages = self.chunk_tasks(language)
+        task_labels = {
+            'turkish': "🔍 Türkçe analiz yapılıyor...",
+            'english': "🔍 İngilizce analiz yapılıyor...",
+            'both': "🔍 Türkçe + İngilizce analiz yapılıyor...",
+            'structured': "🧱 Yapılandırılmış analiz yapılıyor...",
+        }
         
-        results = {}
+        from rich.progress import SpinnerColumn, TextColumn
+        
+        if label:
+            task_labels = {lang: f"📄 {label} — {text}" for lang, text in task_labels.items()}
+        
+        # Ortak ilerleme göstergesinde birden çok dosya aynı anda çalışır; canlı önizleme yalnızca tek analizde
+        own_progress = progress is None
+        live_preview = self.config.STREAM_OUTPUT and own_progress
+        partial: Dict[str, str] = {}
+        partial_lock = threading.Lock()
+        streaming = live_preview or on_partial is not None
+        
+        def stream_to(lang: str) -> Optional[Callable[[str], None]]:
+            """Son çağrının metnini canlı panele ve on_partial'a aktaran geri çağırma"""
+            if not streaming or structured:
+                return None
+            
+            def emit(text: str):
+                sections = self.split_partial_response(text, lang)
+                if not sections:
+                    return
+                with partial_lock:
+                    partial.update(sections)
+                    snapshot = dict(partial)
+                if live_preview:
+                    progress.preview = self.render_stream_preview(sections)
+                if on_partial:
+                    on_partial(snapshot)
+            return emit
         
-        with Progress(
+        StreamingProgress = _streaming_progress_class()
+        
+        with StreamingProgress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=self.console,
-        ) as progress:
+        ) if own_progress else nullcontext(progress) as progress:
+            tasks = {
+                lang: progress.add_task(task_labels[lang], total=len(tweet_chunks))
+                for lang in languages
+            }
+            
+            # Türkçe ve İngilizce parçalar aynı havuzda birlikte çalışır
+            jobs = [(lang, chunk) for lang in languages for chunk in tweet_chunks]
+            # Tek parça varsa onun analizi zaten nihai sonuçtur ve canlı akar
+            single_chunk = len(tweet_chunks) == 1
+            completed = 0
+            
+            def chunk_done(i: int, result: Any):
+                nonlocal completed
+                progress.update(tasks[jobs[i][0]], advance=1)
+                if progress_callback:
+                    with partial_lock:
+                        completed += 1
+                        done = completed
+                    progress_callback(done, len(jobs), jobs[i][0], result)
             
-            if language in ['turkish', 'both']:
-                task = progress.add_task("🔍 Türkçe analiz yapılıyor...", total=len(tweet_chunks))
-                
-                turkish_analyses = []
-                for chunk in tweet_chunks:
-                    analysis = self.analyze_tweets_chunk(chunk, 'turkish')
-                    turkish_analyses.append(analysis)
-                    progress.update(task, advance=1)
-                
-                # Parçaları birleştir
-                results['turkish'] = self.combine_analyses(turkish_analyses, 'turkish')
+            with self.telemetry.span('chunk_analysis', chunks=len(jobs)):
+                if structured:
+                    analyze = lambda job: self.analyze_chunk_structured(job[1], language)
+                else:
+                    analyze = lambda job: self.analyze_tweets_chunk(
+                        job[1], job[0], stream=stream_to(job[0]) if single_chunk else None)
+                analyses = self._run_concurrently(analyze, jobs, on_done=chunk_done)
             
-            if language in ['english', 'both']:
-                task = progress.add_task("🔍 İngilizce analiz yapılıyor...", total=len(tweet_chunks))
-                
-                english_analyses = []
-                for chunk in tweet_chunks:
-                    analysis = self.analyze_tweets_chunk(chunk, 'english')
-                    english_analyses.append(analysis)
-                    progress.update(task, advance=1)
-                
-                # Parçaları birleştir
-                results['english'] = self.combine_analyses(english_analyses, 'english')
+            # Parçaları birleştir
+            if structured:
+                with self.telemetry.span('merge_structured', chunks=len(analyses)):
+                    combined = [self.merge_structured_results(analyses, language)]
+            else:
+                analyses_by_language = {
+                    lang: analyses[n * len(tweet_chunks):(n + 1) * len(tweet_chunks)]
+                    for n, lang in enumerate(languages)
+                }
+                with self.telemetry.span('combine', languages=len(languages)):
+                    combined = self._run_concurrently(
+                        lambda lang: self.combine_analyses(analyses_by_language[lang], lang, stream=stream_to(lang)),
+                        languages,
+                    )
+            if own_progress:
+                # Nihai sonuç ayrıca gösterilir; canlı önizleme ekranda kalmasın
+                progress.preview = None
+                progress.refresh()
+            else:
+                for task in tasks.values():
+                    progress.remove_task(task)
         
+        # Tek parçada birleşik sonuç parça çıktısının kendisidir; kopyalanır ki parça listesi kendini içermesin
+        results = dict(combined[0]) if structured or bilingual else dict(zip(languages, combined))
+        if 'error' not in results:
+            results['chunks'] = [{'language': lang, 'output': output} for (lang, _), output in zip(jobs, analyses)]
         return results
     
-    def combine_analyses(self, analyses: List[str], language: str) -> str:
-        """Parçalanmış analizleri birleştir"""
+    def _run_concurrently(self, func: Callable[[Any], Any], items: List[Any],
+                          on_done: Optional[Callable[[int, Any], None]] = None) -> List[Any]:
+        """Görevleri sınırlı paralellikle çalıştır, sonuçları giriş sırasıyla döndür"""
+        results = [None] * len(items)
+        max_workers = min(max(1, self.config.MAX_CONCURRENT_REQUESTS), len(items))
+        
+        if max_workers <= 1:
+            for i, item in enumerate(items):
+                results[i] = func(item)
+                if on_done:
+                    on_done(i, results[i])
+            return results
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(func, item): i for i, item in enumerate(items)}
+            try:
+                for future in as_completed(futures):
+                    i = futures[future]
+                    results[i] = future.result()
+                    if on_done:
+                        on_done(i, results[i])
+            except BaseException:
+                # Hata ya da iptalde henüz başlamamış görevleri çalıştırma
+                for future in futures:
+                    future.cancel()
+                raise
+        return results
+    
+    def combine_analyses(self, analyses: List[Any], language: str,
+                         stream: Optional[Callable[[str], None]] = None):
+        """Parçalanmış analizleri ağaç şeklinde, seviye seviye paralel birleştir"""
+        fan_in = max(2, self.config.COMBINE_FAN_IN)
+        level = list(analyses)
+        
+        # Her birleştirme en fazla fan_in parça görür; seviye sayısı log(parça) ile büyür
+        while len(level) > 1:
+            groups = [level[i:i + fan_in] for i in range(0, len(level), fan_in)]
+            # Yalnızca köke ulaşan son birleştirme akışla alınır
+            final_stream = stream if len(groups) == 1 else None
+            level = self._run_concurrently(
+                lambda group: self._merge_group(group, language, final_stream),
+                groups,
+            )
+        return level[0]
+    
+    def _merge_group(self, analyses: List[Any], language: str,
+                     stream: Optional[Callable[[str], None]] = None):
+        """Bir grup analizi tek Gemini çağrısıyla birleştir"""
         if len(analyses) == 1:
             return analyses[0]
         
+        if language == 'both':
+            return self._combine_bilingual(analyses, stream)
+        
         # Eğer birden fazla parça varsa, bunları özetlesin
-        combined_text = "\n\n".join(analyses)
+        summary_prompt = self.merge_prompt(analyses, language)
         
-        if language == 'turkish':
-            summary_prompt = f"""
-            Aşağıdaki Twitter analizi parçalarını tek bir kapsamlı analiz halinde birleştir:
-            
-            {combined_text}
-            
-            Lütfen tutarlı, organize ve özetlenmiş bir analiz sun.
-            """
-        else:
-            summary_prompt = f"""
-            Combine the following Twitter analysis parts into one comprehensive analysis:
-            
-            {combined_text}
-            
-            Please provide a consistent, organized and summarized analysis.
-            """
+        try:
+            return self._generate(summary_prompt, kind='merge', stream=stream)
+        except AnalysisCancelled:
+            raise
+        except Exception as e:
+            self.console.print(f"❌ [red]Birleştirme hatası: {str(e)}[/red]")
+            return "\n\n".join(analyses)
+    
+    def _combine_bilingual(self, analyses: List[Dict[str, str]],
+                           stream: Optional[Callable[[str], None]] = None) -> Dict[str, str]:
+        """İki dilli parça analizlerini tek çağrıyla iki dilde birleştir"""
+        # Her dil kendi parçalarından birleştirilir; İngilizce, Türkçe metnin çevirisine dönüşmez
+        prompt = self.merge_prompt(analyses, 'both')
         
         try:
-            response = self.model.generate_content(summary_prompt)
-            return response.text
+            sections = self.split_bilingual_response(self._generate(prompt, kind='merge', stream=stream))
+            if sections:
+                return sections
+        except AnalysisCancelled:
+            raise
         except Exception as e:
             self.console.print(f"❌ [red]Birleştirme hatası: {str(e)}[/red]")
-            return combined_text
+        
+        return {
+            'turkish': self.combine_analyses([a['turkish'] for a in analyses], 'turkish'),
+            'english': self.combine_analyses([a['english'] for a in analyses], 'english'),
+        }
+    
+    def render_stream_preview(self, sections: Dict[str, str]):
+        """Akmakta olan metnin son satırlarını gösteren canlı panel"""
+        from rich.panel import Panel
+        
+        language = 'english' if sections.get('english') else 'turkish'
+        title = "🇺🇸 ENGLISH ANALYSIS" if language == 'english' else "🇹🇷 TÜRKÇE ANALİZ"
+        lines = sections[language].splitlines()[-self.config.STREAM_PREVIEW_LINES:]
+        return Panel(
+            '\n'.join(lines),
+            title=f"{title} (canlı)",
+            border_style="green" if language == 'turkish' else "blue",
+            padding=(0, 2)
+        )
     
     def display_results(self, results: Dict[str, str], tweet_count: int):
         """Sonuçları güzel bir formatta göster"""
+        from rich.panel import Panel
+        
         self.console.print("\n" + "="*80)
         self.console.print(f"📊 [bold blue]TWEET ANALİZ SONUÇLARI[/bold blue]")
         self.console.print(f"📈 Analiz edilen tweet sayısı: {tweet_count}")
@@ -217,10 +862,26 @@ Metin: {tweet.get('text', '')}
             )
             self.console.print(panel)
     
-    def save_results(self, results: Dict[str, str], filename: str, tweet_count: int):
-        """Sonuçları dosyaya kaydet"""
+    def save_results(self, results: Dict[str, Any], filename: str, tweet_count: int,
+                     source_hash: Optional[str] = None, language: Optional[str] = None) -> List[str]:
+        """
+        Sonuçları sonuç veritabanına kaydet ve yazılan konumları döndür ('results.sqlite#<kimlik>').
+        EXPORT_TEXT_FILES açıksa her dil için metin dosyası da yazılır.
+        """
+        saved = []
         if not self.config.SAVE_RESULTS:
-            return
+            return saved
+        
+        if language is None:
+            languages = [lang for lang in ('turkish', 'english') if lang in results]
+            language = 'both' if len(languages) == 2 else languages[0]
+        run_id = self.get_results_store().add_run(
+            filename, results, self.analysis_config(language), source_hash=source_hash, tweet_count=tweet_count
+        )
+        saved.append(f"{self.config.RESULTS_DB}#{run_id}")
+        self.console.print(f"💾 [green]Analiz sonuç veritabanına kaydedildi (çalıştırma #{run_id})[/green]")
+        if not self.config.EXPORT_TEXT_FILES:
+            return saved
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         base_filename = os.path.splitext(os.path.basename(filename))[0]
@@ -237,6 +898,7 @@ Metin: {tweet.get('text', '')}
                 f.write(f"="*50 + "\n\n")
                 f.write(results['turkish'])
             
+            saved.append(turkish_filename)
             self.console.print(f"💾 [green]Türkçe analiz kaydedildi: {turkish_filename}[/green]")
         
         if 'english' in results:
@@ -250,28 +912,381 @@ Metin: {tweet.get('text', '')}
                 f.write(f"="*50 + "\n\n")
                 f.write(results['english'])
             
+            saved.append(english_filename)
             self.console.print(f"💾 [green]English analysis saved: {english_filename}[/green]")
+        
+        # Yapılandırılmış modda birleşik JSON da yazılır (proje/token bazında sorgulamak için)
+        if 'structured' in results:
+            structured_filename = f"{self.config.RESULTS_DIR}/analiz_json_{base_filename}_{timestamp}.json"
+            with open(structured_filename, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'source': filename,
+                    'tweet_count': tweet_count,
+                    'analyzed_at': datetime.now().isoformat(timespec='seconds'),
+                    **results['structured'],
+                }, f, ensure_ascii=False, indent=2)
+            
+            saved.append(structured_filename)
+            self.console.print(f"💾 [green]Yapılandırılmış sonuç kaydedildi: {structured_filename}[/green]")
+        
+        return saved
     
     def analyze_file(self, json_file: str, language: str = 'both'):
         """Dosyayı analiz et (ana metod)"""
         self.console.print(f"🚀 [bold]Tweet analizi başlatılıyor...[/bold]")
         
+        # Aynı içerik aynı ayarlarla analiz edildiyse dosya okunmadan önceki sonuç gösterilir
+        source_hash, previous = self._previous_file_run(json_file, language)
+        if previous:
+            self.report_previous_run(previous)
+            return
+        
         # Tweet verilerini yükle
-        tweets = self.load_tweets(json_file)
+        with self.telemetry.span('load_tweets'):
+            tweets = self.load_tweets(json_file)
         if not tweets:
             return
         
+        self._analyze_and_report(tweets, json_file, language, source_hash)
+    
+    def _previous_file_run(self, json_file: str, language: str):
+        """Dosya içeriğinin özeti ve (varsa) aynı ayarlarla yapılmış önceki çalıştırma"""
+        try:
+            with self.telemetry.span('hash_source'):
+                source_hash = file_digest(json_file)
+        except OSError:
+            # Okunamayan dosyanın hatası yüklemede raporlanır
+            return None, None
+        return source_hash, self.find_previous_run(source_hash, language)
+    
+    def analyze_store(self, store, language: str = 'both', since: Optional[str] = None,
+                      match: Optional[str] = None):
+        """Yerel depodan zaman aralığı ve metin eşleşmesiyle seçilen tweet'leri analiz et"""
+        from tweet_store import describe_selection, parse_since
+        
+        self.console.print(f"🚀 [bold]Tweet analizi başlatılıyor...[/bold]")
+        
+        with self.telemetry.span('query_store'):
+            tweets = store.query(since=parse_since(since) if since else None, match=match)
+        label = describe_selection(since, match)
+        if not tweets:
+            self.console.print(f"[yellow]⚠️ Depoda seçime uyan tweet yok ({label})[/yellow]")
+            return
+        self.console.print(f"[green]🗄️ Depodan {len(tweets)} tweet seçildi ({label})[/green]")
+        
+        source_hash = tweets_digest(tweets)
+        previous = self.find_previous_run(source_hash, language)
+        if previous:
+            self.report_previous_run(previous)
+            return
+        
+        self._analyze_and_report(tweets, label, language, source_hash)
+    
+    def _analyze_and_report(self, tweets: List[Dict[str, Any]], source: str, language: str,
+                            source_hash: Optional[str] = None):
+        """Yüklenmiş tweet'leri analiz et, sonucu göster ve kaydet"""
         # Tweet verilerini analiz et
-        results = self.analyze_tweets(tweets, language)
+        with self.telemetry.span('analyze_tweets', tweets=len(tweets)):
+            results = self.analyze_tweets(tweets, language)
         
         if 'error' in results:
             self.console.print(f"❌ [red]{results['error']}[/red]")
             return
         
         # Sonuçları göster
-        self.display_results(results, len(tweets))
+        with self.telemetry.span('display_results'):
+            self.display_results(results, len(tweets))
         
         # Sonuçları kaydet
-        self.save_results(results, json_file, len(tweets))
+        with self.telemetry.span('save_results'):
+            self.save_results(results, source, len(tweets), source_hash, language)
+        
+        self.print_run_stats()
+        self.console.print(f"\n✅ [green]Analiz tamamlandı![/green]")
+    
+    def print_run_stats(self):
+        """Hız sınırı ve önbellek sayaçlarını yazdır"""
+        if self._scheduler:
+            stats = self._scheduler.stats()
+            if stats['retries'] or stats['throttled'] or stats['failures']:
+                self.console.print(
+                    f"🔁 {stats['requests']} istek: {stats['retries']} yeniden deneme, "
+                    f"{stats['throttled']} kez hız sınırı beklemesi ({stats['throttle_seconds']:.1f} sn), "
+                    f"{stats['failures']} başarısız"
+                )
         
-        self.console.print(f"\n✅ [green]Analiz tamamlandı![/green]") 
\ No newline at end of file
+        cache = self.get_cache()
+        if cache:
+            stats = cache.stats()
+            self.console.print(
+                f"🗄️ Önbellek: {stats['hits']} isabet, {stats['misses']} ıskalama "
+                f"({stats['entries']} kayıt, {stats['bytes'] / 1024:.0f} KB)"
+            )
+    
+    def plan_file(self, json_file: str, language: str = 'both') -> Optional[Dict[str, Any]]:
+        """Dosyanın analiz planını model çağrısı yapmadan çıkar ve göster"""
+        with self.telemetry.span('load_tweets'):
+            tweets = self.load_tweets(json_file)
+        if not tweets:
+            return None
+        source_hash = file_digest(json_file)
+        with self.telemetry.span('plan', tweets=len(tweets)):
+            plan = build_plan(self, tweets, language, source_hash)
+        self.display_plan(plan, json_file)
+        return plan
+    
+    def plan_store(self, store, language: str = 'both', since: Optional[str] = None,
+                   match: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Depo seçiminin analiz planını model çağrısı yapmadan çıkar ve göster"""
+        from tweet_store import describe_selection, parse_since
+        
+        with self.telemetry.span('query_store'):
+            tweets = store.query(since=parse_since(since) if since else None, match=match)
+        label = describe_selection(since, match)
+        if not tweets:
+            self.console.print(f"[yellow]⚠️ Depoda seçime uyan tweet yok ({label})[/yellow]")
+            return None
+        with self.telemetry.span('plan', tweets=len(tweets)):
+            plan = build_plan(self, tweets, language, tweets_digest(tweets))
+        self.display_plan(plan, label)
+        return plan
+    
+    def display_plan(self, plan: Dict[str, Any], source: str):
+        """Ön planlama tablosu ve tahminler"""
+        from rich.table import Table
+        
+        table = Table(title=f"🧪 Analiz Planı — {source}")
+        table.add_column("Görev")
+        table.add_column("Parça çağrısı", justify="right")
+        table.add_column("Birleştirme (seviye)", justify="right")
+        table.add_column("Derinlik", justify="right")
+        table.add_column("Önbellekte", justify="right")
+        table.add_column("Prompt token", justify="right")
+        for row in plan['tasks']:
+            table.add_row(
+                TASK_NAMES[row['task']],
+                str(row['chunk_calls']),
+                " + ".join(map(str, row['merge_calls'])) or ("yerel" if row['task'] == 'structured' else "-"),
+                str(row['depth']),
+                f"{row['cached']}/{row['calls']}",
+                f"~{row['prompt_tokens']:,}",
+            )
+        self.console.print(table)
+        
+        chunk_tokens = [tokens for row in plan['tasks'] for tokens in row['chunk_prompt_tokens']]
+        if chunk_tokens:
+            self.console.print(
+                f"🧮 {plan['tweets']} tweet → {plan['selected']} tweet, {plan['chunks']} parça "
+                f"(parça prompt'u ort. ~{sum(chunk_tokens) // len(chunk_tokens):,}, en büyük ~{max(chunk_tokens):,} token)"
+            )
+        self.console.print(
+            f"📡 {plan['api_calls']} model isteği ({plan['cached']} çağrı önbellekten), "
+            f"~{plan['api_prompt_tokens']:,} girdi token'ı"
+        )
+        limits = ", ".join(
+            f"{value:,} {name}" if value else f"{name} sınırsız"
+            for name, value in (('RPM', plan['rpm']), ('TPM', plan['tpm']))
+        )
+        self.console.print(
+            f"⏱️ Tahmini süre: ~{plan['wall_seconds']:.1f} sn (yerel hazırlık {plan['prep_seconds']:.2f} sn, "
+            f"hız sınırı beklemesi ~{plan['throttle_seconds']:.1f} sn; {plan['concurrency']} eşzamanlı istek, {limits})"
+        )
+        if plan['previous_run']:
+            self.console.print(
+                f"♻️ [cyan]Bu kaynak aynı ayarlarla daha önce analiz edildi (çalıştırma #{plan['previous_run']}); "
+                f"--force olmadan model çağrısı yapılmaz.[/cyan]"
+            )
+        self.console.print("[dim]Kuru çalıştırma: model çağrısı yapılmadı.[/dim]")
+    
+    def analyze_batch(self, json_files: List[str], language: str = 'both') -> Dict[str, Any]:
+        """
+        Birden çok dosyayı tek süreçte analiz et.
+        Dosyalar birlikte çalışır; tüm parçalar aynı istek semaforu, hız sınırlayıcı ve önbellekten
+        geçtiği için verim süreç sayısıyla değil API kotasıyla sınırlanır.
+        """
+        from rich.progress import BarColumn, MofNCompleteColumn, SpinnerColumn, TextColumn
+        
+        self.console.print(f"🚀 [bold]{len(json_files)} dosya için toplu analiz başlatılıyor...[/bold]")
+        started = time.perf_counter()
+        StreamingProgress = _streaming_progress_class()
+        
+        with StreamingProgress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            console=self.console,
+        ) as progress:
+            overall = progress.add_task("📚 Dosyalar", total=len(json_files))
+            
+            def analyze_one(json_file: str) -> Dict[str, Any]:
+                entry = self._analyze_batch_file(json_file, language, progress)
+                progress.update(overall, advance=1)
+                return entry
+            
+            with self.telemetry.span('batch', files=len(json_files)):
+                entries = self._run_concurrently(analyze_one, json_files)
+        
+        index = {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'language': language,
+            'seconds': round(time.perf_counter() - started, 3),
+            'files': entries,
+        }
+        if not self.config.SAVE_RESULTS:
+            for entry in entries:
+                if entry['status'] == 'ok':
+                    self.display_results(entry.pop('results'), entry['tweets'])
+        else:
+            for entry in entries:
+                entry.pop('results', None)
+            index_path = os.path.join(
+                self.config.RESULTS_DIR, f"batch_index_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            )
+            with open(index_path, 'w', encoding='utf-8') as f:
+                json.dump(index, f, indent=2, ensure_ascii=False)
+            index['path'] = index_path
+        
+        self.display_batch_summary(index)
+        self.print_run_stats()
+        return index
+    
+    def _analyze_batch_file(self, json_file: str, language: str, progress) -> Dict[str, Any]:
+        """Toplu analizde tek dosya: yükle, analiz et, kaydet; özet kaydını döndür"""
+        started = time.perf_counter()
+        entry = {'file': json_file, 'tweets': 0, 'status': 'ok', 'outputs': [], 'error': None}
+        try:
+            source_hash, previous = self._previous_file_run(json_file, language)
+            if previous:
+                entry.update(tweets=previous['tweet_count'], status='reused', results=previous['results'],
+                             outputs=[f"{self.config.RESULTS_DB}#{previous['id']}"])
+                entry['seconds'] = round(time.perf_counter() - started, 3)
+                return entry
+            
+            with self.telemetry.span('load_tweets', file=json_file):
+                try:
+                    tweets = self.read_tweets(json_file)
+                except (OSError, json.JSONDecodeError, ValueError) as e:
+                    # Bozuk ya da okunamayan dosya boş sayılmaz, hata olarak kaydedilir
+                    entry['status'], entry['error'] = 'error', self.load_error_message(e, json_file)
+                    entry['seconds'] = round(time.perf_counter() - started, 3)
+                    return entry
+            entry['tweets'] = len(tweets)
+            if not tweets:
+                entry['status'] = 'empty'
+            else:
+                with self.telemetry.span('analyze_tweets', file=json_file, tweets=len(tweets)):
+                    results = self.analyze_tweets(tweets, language, progress=progress,
+                                                  label=os.path.basename(json_file))
+                if 'error' in results:
+                    entry['status'], entry['error'] = 'error', results['error']
+                else:
+                    with self.telemetry.span('save_results', file=json_file):
+                        entry['outputs'] = self.save_results(results, json_file, len(tweets), source_hash, language)
+                    entry['results'] = results
+        except Exception as e:
+            entry['status'], entry['error'] = 'error', str(e)
+        entry['seconds'] = round(time.perf_counter() - started, 3)
+        return entry
+    
+    def display_batch_summary(self, index: Dict[str, Any]):
+        """Toplu analiz özet tablosu"""
+        from rich.table import Table
+        
+        table = Table(title="📚 Toplu Analiz Özeti")
+        table.add_column("Dosya")
+        table.add_column("Tweet", justify="right")
+        table.add_column("Durum")
+        table.add_column("Süre (sn)", justify="right")
+        table.add_column("Çıktılar")
+        status_labels = {'ok': "[green]✅ tamam[/green]", 'reused': "[cyan]♻️ önceki sonuç[/cyan]",
+                         'empty': "[yellow]⚠️ boş[/yellow]", 'error': "[red]❌ hata[/red]"}
+        for entry in index['files']:
+            table.add_row(
+                os.path.basename(entry['file']),
+                str(entry['tweets']),
+                status_labels[entry['status']] + (f" {entry['error']}" if entry['error'] else ""),
+                f"{entry['seconds']:.1f}",
+                "\n".join(entry['outputs']) or "-",
+            )
+        self.console.print(table)
+        
+        ok = sum(1 for entry in index['files'] if entry['status'] in ('ok', 'reused'))
+        self.console.print(f"\n✅ [green]{ok}/{len(index['files'])} dosya analiz edildi ({index['seconds']:.1f} sn)[/green]")
+        if 'path' in index:
+            self.console.print(f"🗂️ Özet dizini: {index['path']}")
+    
+    def fold_results(self, previous: Dict[str, str], delta: Dict[str, str], language: str) -> Dict[str, str]:
+        """Önceki analizi yeni tweet'lerin analiziyle birleştir"""
+        if not previous:
+            return delta
+        
+        # İki taraf da yapılandırılmışsa birleştirme model çağrısı olmadan yapılır (yeni özetler önde)
+        if 'structured' in previous and 'structured' in delta:
+            with self.telemetry.span('merge_structured', chunks=2):
+                return self.merge_structured_results([delta['structured'], previous['structured']], language)
+        
+        keys = [key for key in ('turkish', 'english') if key in delta]
+        if language == 'both' and self.config.BILINGUAL_MODE and all(key in previous for key in keys):
+            return self.combine_analyses([previous, delta], 'both')
+        
+        folded = self._run_concurrently(
+            lambda key: self.combine_analyses([previous[key], delta[key]], key) if key in previous else delta[key],
+            keys,
+        )
+        return dict(zip(keys, folded))
+    
+    def analyze_incremental(self, json_file: str, language: str = 'both') -> bool:
+        """Yalnızca son çalıştırmadan bu yana eklenen tweet'leri analiz et ve öncekiyle birleştir"""
+        state = IncrementalState.for_source(
+            self.config.RESULTS_DIR, json_file, self.config.INCREMENTAL_LOOKBACK_SECONDS
+        )
+        
+        try:
+            with self.telemetry.span('load_tweets', incremental=True):
+                new_tweets = state.read_new_tweets(json_file)
+        except (OSError, ValueError) as e:
+            self.console.print(f"❌ [red]Dosya okunamadı: {str(e)}[/red]")
+            return False
+        
+        if not new_tweets:
+            self.console.print(f"💤 Yeni tweet yok ({json_file})")
+            return False
+        
+        self.console.print(f"🆕 [bold]{len(new_tweets)} yeni tweet bulundu[/bold] (önceki toplam: {state.total_tweets})")
+        deferred: List[Dict[str, Any]] = []
+        with self.telemetry.span('analyze_tweets', tweets=len(new_tweets)):
+            delta = self.analyze_tweets(new_tweets, language, overflow=deferred)
+        if 'error' in delta:
+            self.console.print(f"❌ [red]{delta['error']}[/red]")
+            return False
+        
+        with self.telemetry.span('fold_results'):
+            results = self.fold_results(state.results, delta, language)
+        results.setdefault('chunks', delta.get('chunks', []))
+        # Sınırı aşanlar görülmüş sayılmaz; sonraki döngüde yeni tweet'lerle birlikte yeniden aday olur
+        state.update(new_tweets, results, deferred)
+        if deferred:
+            self.console.print(f"⏭️ [yellow]Tweet sınırını aşan {len(deferred)} tweet sonraki döngüye bırakıldı[/yellow]")
+        
+        self.display_results(results, state.total_tweets)
+        with self.telemetry.span('save_results'):
+            self.save_results(results, json_file, state.total_tweets, language=language)
+            state.save()
+        return True
+    
+    def watch_file(self, json_file: str, language: str = 'both', interval: float = 60):
+        """Dosyayı izle ve her döngüde yalnızca yeni tweet'leri analiz et (Ctrl+C ile durur)"""
+        self.console.print(f"👀 [bold]{json_file} izleniyor[/bold] (her {interval:.0f} saniyede bir)")
+        warned = False
+        while True:
+            if os.path.exists(json_file):
+                if not warned and not is_json_lines(json_file):
+                    warned = True
+                    self.console.print("⚠️ [yellow]JSON dizisi değiştikçe baştan okunur; büyük dosyalarda "
+                                       "yalnızca yeni satırları okumak için JSON Lines (.jsonl) kullanın[/yellow]")
+                self.analyze_incremental(json_file, language)
+            else:
+                self.console.print(f"⚠️ [yellow]Dosya henüz yok: {json_file}[/yellow]")
+            time.sleep(interval)
+
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Uçtan uca performans ölçümü.
+Gerçekçi sentetik kripto tweet derlemleri üretir (cashtag, hashtag, emoji, Türkçe/İngilizce
+karışık, kopyalar) ve yükleme, formatlama, parçalama, sahte modelle analiz ile Streamlit
+istatistik yardımcılarını ölçer. Sonuçlar commit'ler arası karşılaştırma için JSON'dur.
+
+Örnekler:
+  python benchmark.py                                   # 1k ve 10k tweet
+  python benchmark.py --sizes 1000 100000 1000000 --out bench.json
+  python benchmark.py --generate corpus.jsonl --count 50000
+  python benchmark.py --startup                         # CLI açılış süresi ve ağır import kontrolü
+  python benchmark.py --prompt-tokens dumps/*.jsonl     # Derlem başına ayrıntılı/kompakt prompt token'ı
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+PROJECTS = [
+    ('LayerZero', 'ZRO'), ('Solana', 'SOL'), ('Jupiter', 'JUP'), ('Arbitrum', 'ARB'),
+    ('Blast', 'BLAST'), ('Starknet', 'STRK'), ('zkSync', 'ZK'), ('EigenLayer', 'EIGEN'),
+    ('Celestia', 'TIA'), ('Pyth', 'PYTH'), ('Ethena', 'ENA'), ('Wormhole', 'W'),
+    ('Scroll', 'SCR'), ('Linea', 'LINEA'), ('Berachain', 'BERA'), ('Monad', 'MON'),
+]
+EMOJIS = ['🚀', '🔥', '💰', '🚨', '✅', '📅', '💎', '⚡', '🌟', '🎯', '📈', '👀']
+TEMPLATES_TR = [
+    "🚨 BÜYÜK AIRDROP! {name} (${symbol}) {month} ayında geliyor!\n\n✅ Gereksinimler:\n- Bridge işlemleri\n- {chains}+ farklı chain\n- ${volume}+ volume\n\n#{name} #Airdrop",
+    "{name} ekosisteminde patlama {emoji}\n\n${symbol}: %{pct} artış\nBu boğa piyasasında lider olabilir. #{name} #Kripto",
+    "{name} yeni farming programını duyurdu! APY %{apy}, kilitleme süresi {days} gün. Detaylar: https://t.co/{slug}",
+    "${symbol} snapshot tarihi: {date}. Cüzdanınızı kontrol edin {emoji}{emoji} #{name} #Airdrop",
+    "RT @{user}: {name} testnet görevleri açıldı, puan toplamayı unutmayın {emoji}",
+]
+TEMPLATES_EN = [
+    "🚨 HUGE AIRDROP! {name} (${symbol}) mainnet coming in {month}!\n\n✅ Requirements:\n- Bridge txs\n- {chains}+ chains\n- ${volume}+ volume\n\n#{name} #Airdrop #DeFi",
+    "{name} just announced a new yield farm with {apy}% APY {emoji} Lock period: {days} days. https://t.co/{slug}",
+    "${symbol} up {pct}% today {emoji}{emoji}{emoji} Is this the start of the {name} season? #{name} #Crypto",
+    "Snapshot for ${symbol} is on {date}. Make sure you bridged before then! #{name}",
+    "RT @{user}: {name} points program is live, farm early {emoji}",
+]
+# `main.py --help` ve erken hata yollarında yüklenmemesi gereken modüller
+HEAVY_MODULES = ('google.generativeai', 'numpy', 'pandas', 'rich', 'dotenv', 'analyzer')
+STARTUP_COMMANDS = {
+    'help': ['--help'],
+    'missing_file': ['__benchmark_missing__.json'],
+}
+MONTHS = ['Ocak', 'Şubat', 'Mart', 'Nisan', 'January', 'February', 'March', 'April']
+
+
+def generate_tweets(count: int, seed: int = 42, duplicate_rate: float = 0.15,
+                    turkish_ratio: float = 0.5, users: int = 0) -> List[Dict[str, Any]]:
+    """Uygulamanın beklediği şemada sentetik kripto tweet'leri üret"""
+    rng = random.Random(seed)
+    users = users or max(10, count // 20)
+    usernames = [f"crypto_user_{i}" for i in range(users)]
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    tweets: List[Dict[str, Any]] = []
+
+    for i in range(count):
+        moment = start + timedelta(seconds=i * 37)
+        if tweets and rng.random() < duplicate_rate:
+            # Kopyala-yapıştır shill'ler ve ufak değişiklikli yeniden paylaşımlar
+            text = rng.choice(tweets[-500:])['text']
+            if rng.random() < 0.5:
+                text += f" {rng.choice(EMOJIS)}"
+        else:
+            name, symbol = rng.choice(PROJECTS)
+            templates = TEMPLATES_TR if rng.random() < turkish_ratio else TEMPLATES_EN
+            text = rng.choice(templates).format(
+                name=name, symbol=symbol, emoji=rng.choice(EMOJIS), month=rng.choice(MONTHS),
+                chains=rng.randint(3, 15), volume=rng.choice([100, 500, 1000, 5000]),
+                pct=rng.randint(5, 250), apy=rng.randint(4, 900), days=rng.choice([7, 14, 30, 90]),
+                slug=f"{rng.getrandbits(40):x}", date=(moment + timedelta(days=rng.randint(1, 60))).strftime('%d.%m.%Y'),
+                user=rng.choice(usernames),
+            )
+        tweets.append({
+            'username': usernames[min(users - 1, int(rng.paretovariate(1.2)) - 1)],
+            'text': text,
+            'timestamp': moment.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+            'scraped_at': (moment + timedelta(minutes=5)).replace(tzinfo=None).isoformat(),
+        })
+    return tweets
+
+
+def write_tweets(tweets: List[Dict[str, Any]], path: str):
+    """Derlemi uzantıya göre JSON dizisi ya da JSON Lines olarak yaz"""
+    with open(path, 'w', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            for tweet in tweets:
+                f.write(json.dumps(tweet, ensure_ascii=False) + '\n')
+        else:
+            json.dump(tweets, f, ensure_ascii=False, indent=2)
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+    return {
+        'min': ordered[0], 'p50': pick(0.5), 'p90': pick(0.9), 'p99': pick(0.99),
+        'max': ordered[-1], 'mean': statistics.fmean(ordered),
+    }
+
+
+def peak_rss_mb() -> float:
+    """Sürecin şimdiye kadarki en yüksek RSS değeri (MB)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux KB, macOS bayt döndürür
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def measure(func: Callable[[], Any], items: int, repeat: int, trace_memory: bool) -> Dict[str, Any]:
+    """Bir aşamayı `repeat` kez çalıştırıp süre, verim ve bellek ölç"""
+    timings = []
+    peak_heap = 0
+    for _ in range(repeat):
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+        if trace_memory:
+            peak_heap = max(peak_heap, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    best = min(timings)
+    result = {
+        'seconds': percentiles(timings),
+        'throughput_per_sec': items / best if best else None,
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }
+    if trace_memory:
+        result['peak_heap_mb'] = round(peak_heap / (1024 * 1024), 1)
+    return result
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """`-X importtime` çıktısından modül -> kümülatif süre (mikrosaniye)"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|', 2)
+        # Girinti iç içe importları gösterir; en üst düzey satırların girintisi yoktur
+        modules[name[1:].rstrip()] = int(cumulative)
+    return modules
+
+
+def measure_startup(repeat: int) -> Dict[str, Any]:
+    """main.py'nin --help ve eksik dosya yollarındaki açılış süresi ve içe aktarılan ağır modüller"""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+    results = {}
+    for label, argv in STARTUP_COMMANDS.items():
+        timings, import_ms, heavy = [], 0.0, []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            completed = subprocess.run([sys.executable, '-X', 'importtime', script, *argv],
+                                       capture_output=True, text=True)
+            timings.append(time.perf_counter() - started)
+            modules = parse_importtime(completed.stderr)
+            import_ms = sum(us for name, us in modules.items() if not name.startswith(' ')) / 1000
+            loaded = {name.strip() for name in modules}
+            heavy = [module for module in HEAVY_MODULES if module in loaded]
+        results[label] = {
+            'seconds': percentiles(timings),
+            'import_ms': round(import_ms, 1),
+            'heavy_imports': heavy,
+        }
+    return results
+
+
+def quiet_analyzer(args):
+    """Ölçüm için sessiz, önbelleksiz ve hız sınırsız bir analizci"""
+    from rich.console import Console
+    from analyzer import TweetAnalyzer
+    from llm_backends import FakeBackend
+
+    backend = FakeBackend(latency_mean=args.latency, latency_jitter=args.latency / 2,
+                          error_rate=args.error_rate, seed=args.seed)
+    analyzer = TweetAnalyzer(backend=backend)
+    analyzer.console = Console(quiet=True)
+    analyzer.config.CACHE_ENABLED = False
+    analyzer.config.RATE_LIMIT_RPM = 0
+    analyzer.config.RATE_LIMIT_TPM = 0
+    analyzer.config.RETRY_BASE_DELAY = 0.01
+    analyzer.config.MAX_CONCURRENT_REQUESTS = args.concurrency
+    analyzer.config.MAX_TWEETS_PER_ANALYSIS = args.max_tweets
+    return analyzer, backend
+
+
+def measure_prompt_tokens(tweets: List[Dict[str, Any]], analyzer) -> Dict[str, Any]:
+    """Derlemin tamamı parçalanıp prompt'a çevrildiğinde ayrıntılı ve kompakt biçimdeki tahmini token"""
+    from tokens import estimate_tokens
+
+    report: Dict[str, Any] = {'tweets': len(tweets)}
+    original = analyzer.config.PROMPT_FORMAT
+    try:
+        for mode in ('verbose', 'compact'):
+            analyzer.config.PROMPT_FORMAT = mode
+            chunks = analyzer.pack_tweets(tweets, analyzer.config.CHUNK_TOKEN_BUDGET)
+            template = analyzer.prompt_template(analyzer.config.ANALYSIS_PROMPT_BILINGUAL)
+            report[mode] = {
+                'chunks': len(chunks),
+                'prompt_tokens': sum(
+                    estimate_tokens(template.format(tweets=analyzer.format_tweets_for_analysis(chunk)))
+                    for chunk in chunks
+                ),
+            }
+    finally:
+        analyzer.config.PROMPT_FORMAT = original
+    verbose = report['verbose']['prompt_tokens']
+    report['reduction'] = round(1 - report['compact']['prompt_tokens'] / verbose, 4) if verbose else 0.0
+    return report
+
+
+def run_size(size: int, args) -> Dict[str, Any]:
+    """Tek bir derlem boyutu için tüm aşamaları ölç"""
+    from ranking import select_top_tweets
+    from tweet_stats import build_tweet_columns, create_tweet_dataframe, create_tweet_stats
+
+    tweets = generate_tweets(size, seed=args.seed)
+    analyzer, backend = quiet_analyzer(args)
+
+    stages: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for extension in ('json', 'jsonl'):
+            path = os.path.join(tmp, f"corpus.{extension}")
+            write_tweets(tweets, path)
+            stages[f'load_tweets_{extension}'] = measure(
+                lambda: analyzer.load_tweets(path), size, args.repeat, args.trace_memory)
+            stages[f'load_tweets_{extension}']['file_mb'] = round(os.path.getsize(path) / (1024 * 1024), 2)
+
+    stages['format_tweets_for_analysis'] = measure(
+        lambda: analyzer.format_tweets_for_analysis(tweets), size, args.repeat, args.trace_memory)
+    stages['chunk_tweets'] = measure(
+        lambda: analyzer.chunk_tweets(tweets, analyzer.config.CHUNK_SIZE), size, args.repeat, args.trace_memory)
+    stages['pack_tweets'] = measure(
+        lambda: analyzer.pack_tweets(tweets, analyzer.config.CHUNK_TOKEN_BUDGET), size, args.repeat, args.trace_memory)
+    stages['select_tweets'] = measure(
+        lambda: select_top_tweets(tweets, args.max_tweets), size, args.repeat, args.trace_memory)
+    stages['build_tweet_columns'] = measure(
+        lambda: build_tweet_columns(tweets), size, args.repeat, args.trace_memory)
+    stages['create_tweet_dataframe'] = measure(
+        lambda: create_tweet_dataframe(tweets), size, args.repeat, args.trace_memory)
+    stages['create_tweet_stats'] = measure(
+        lambda: create_tweet_stats(tweets), size, args.repeat, args.trace_memory)
+
+    backend.latencies.clear()
+    stages['analyze_tweets'] = measure(
+        lambda: analyzer.analyze_tweets(tweets, 'both'), size, 1, args.trace_memory)
+    stages['analyze_tweets']['model_calls'] = backend.calls
+    stages['analyze_tweets']['model_latency_seconds'] = percentiles(backend.latencies)
+    stages['analyze_tweets']['scheduler'] = analyzer.get_scheduler().stats()
+
+    return {'tweets': size, 'stages': stages, 'prompt_tokens': measure_prompt_tokens(tweets, analyzer)}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Kripto Tweet Analyzer performans ölçümü',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000], help='Derlem boyutları')
+    parser.add_argument('--repeat', type=int, default=3, help='Aşama başına tekrar (analiz hariç)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--latency', type=float, default=0.05, help='Sahte model ortalama gecikmesi (sn)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Sahte model 429 oranı')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--max-tweets', type=int, default=50, help='MAX_TWEETS_PER_ANALYSIS')
+    parser.add_argument('--trace-memory', action='store_true', help='tracemalloc ile aşama başına heap tepe değeri')
+    parser.add_argument('--out', help='JSON çıktısının yazılacağı dosya (varsayılan: stdout)')
+    parser.add_argument('--generate', metavar='PATH', help='Yalnızca sentetik derlem üret ve yaz (.json/.jsonl)')
+    parser.add_argument('--count', type=int, default=10000, help='--generate için tweet sayısı')
+    parser.add_argument('--startup', action='store_true',
+                        help='Yalnızca CLI açılışını ölç; ağır modül yüklenirse hata koduyla çık')
+    parser.add_argument('--startup-budget', type=float, default=None, metavar='MS',
+                        help='--startup için izin verilen en fazla import süresi (ms)')
+    parser.add_argument('--prompt-tokens', nargs='*', metavar='PATH', default=None,
+                        help='Yalnızca prompt token karşılaştırması yap (dosya verilmezse --sizes derlemleri)')
+    args = parser.parse_args()
+
+    if args.startup:
+        startup = measure_startup(max(1, args.repeat))
+        print(json.dumps(startup, indent=2, ensure_ascii=False))
+        failed = False
+        for label, result in startup.items():
+            if result['heavy_imports']:
+                print(f"❌ {label}: ağır modüller yüklendi: {', '.join(result['heavy_imports'])}", file=sys.stderr)
+                failed = True
+            if args.startup_budget is not None and result['import_ms'] > args.startup_budget:
+                print(f"❌ {label}: import süresi {result['import_ms']} ms > {args.startup_budget} ms", file=sys.stderr)
+                failed = True
+        sys.exit(1 if failed else 0)
+
+    if args.prompt_tokens is not None:
+        from tweet_loader import iter_tweets
+
+        analyzer, _ = quiet_analyzer(args)
+        corpora = [(path, lambda path=path: list(iter_tweets(path))) for path in args.prompt_tokens] or [
+            (f'synthetic_{size}', lambda size=size: generate_tweets(size, seed=args.seed)) for size in args.sizes
+        ]
+        reports = []
+        for name, load in corpora:
+            result = {'corpus': name, **measure_prompt_tokens(load(), analyzer)}
+            reports.append(result)
+            print(f"📉 {name}: {result['verbose']['prompt_tokens']} → {result['compact']['prompt_tokens']} token "
+                  f"(%{result['reduction'] * 100:.1f} azalma, {result['verbose']['chunks']} → "
+                  f"{result['compact']['chunks']} parça)", file=sys.stderr)
+        print(json.dumps(reports, indent=2, ensure_ascii=False))
+        return
+
+    if args.generate:
+        write_tweets(generate_tweets(args.count, seed=args.seed), args.generate)
+        print(f"✅ {args.count} sentetik tweet yazıldı: {args.generate}", file=sys.stderr)
+        return
+
+    report = {
+        'revision': git_revision(),
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {key: value for key, value in vars(args).items() if key not in ('out', 'generate', 'count')},
+        'startup': measure_startup(args.repeat),
+        'results': [],
+    }
+    for size in args.sizes:
+        print(f"⏱️  {size} tweet ölçülüyor...", file=sys.stderr)
+        report['results'].append(run_size(size, args))
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+        print(f"💾 Sonuçlar kaydedildi: {args.out}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
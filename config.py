@@ -8,14 +8,74 @@ class Config:
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
     GEMINI_MODEL = 'gemini-1.5-flash'
     
+    # Model arka ucu: 'gemini', 'fake' (süreç içi sahte model) veya 'http' (yerel sahte sunucu)
+    LLM_BACKEND = os.getenv('LLM_BACKEND', 'gemini')
+    FAKE_LATENCY_MEAN = 0.5  # saniye
+    FAKE_LATENCY_JITTER = 0.2
+    FAKE_ERROR_RATE = 0.0
+    FAKE_OUTPUT_CHARS = 1500
+    FAKE_BACKEND_URL = os.getenv('FAKE_BACKEND_URL', 'http://127.0.0.1:8765')
+    
     # Analiz ayarları
     MAX_TWEETS_PER_ANALYSIS = 50
     CHUNK_SIZE = 10
+    CHUNKING_MODE = 'tokens'  # 'tokens': token bütçesine göre paketle, 'count': CHUNK_SIZE kadar tweet
+    CHUNK_TOKEN_BUDGET = 4000  # Parça başına yaklaşık tweet token'ı
+    MAX_CONCURRENT_REQUESTS = 4  # Aynı anda Gemini'ye gönderilecek en fazla istek
+    DEDUP_ENABLED = True  # Yakın kopya tweet'leri Gemini'ye göndermeden önce birleştir
+    DEDUP_THRESHOLD = 0.8  # MinHash ile tahmini Jaccard benzerlik eşiği
+    RANKING_ENABLED = True  # Sınır aşılınca ilk N yerine alaka puanı en yüksek tweet'leri seç
+    RANKING_HALF_LIFE_HOURS = 24.0  # Yenilik puanının yarılandığı süre (en yeni tweet'e göre)
+    RANKING_USER_DECAY = 0.5  # Aynı kullanıcının her ek tweet'inde puan çarpanı
+    ENTITY_FILTER = []  # Boş değilse yalnızca bu varlıklardan ('$ZRO', '#layerzero', '@handle' ya da proje adı) birinin geçtiği tweet'ler
+    RATE_LIMIT_RPM = int(os.getenv('GEMINI_RPM', '15'))  # Dakikalık istek sınırı (0: sınırsız)
+    RATE_LIMIT_TPM = int(os.getenv('GEMINI_TPM', '1000000'))  # Dakikalık girdi token sınırı (0: sınırsız)
+    MAX_RETRIES = 5  # Geçici hatalarda (429, 5xx) en fazla yeniden deneme
+    RETRY_BASE_DELAY = 1.0  # Üstel geri çekilmenin başlangıç süresi (saniye)
+    RETRY_MAX_DELAY = 60.0
+    COMBINE_FAN_IN = 4  # Ağaç birleştirmede tek çağrıda birleştirilen en fazla analiz
+    
+    # Ön planlama (--dry-run) tahminleri; parça prompt'ları birebir sayılır, yanıtlar tahmin edilir
+    PLAN_OUTPUT_TOKENS = 800  # Tek dilde bir parça ya da birleştirme yanıtının tahmini token'ı
+    PLAN_CALL_BASE_SECONDS = 1.5  # Çağrı başına sabit gecikme (ağ + ilk token)
+    PLAN_OUTPUT_TOKENS_PER_SECOND = 150.0  # Yanıt üretim hızı
+    
+    PROMPT_FORMAT = 'compact'  # 'compact': başlığı bir kez yazılan tablo, 'verbose': tweet başına etiketli şablon
+    STRUCTURED_OUTPUT = False  # Parçalardan JSON iste, birleştirmeyi model çağrısı olmadan yerelde yap
     
     # Çıktı ayarları
     OUTPUT_FORMAT = 'both'  # 'turkish', 'english', 'both'
+    BILINGUAL_MODE = True  # 'both' için her parçayı tek çağrıda iki dilde analiz et
+    STREAM_OUTPUT = True  # Son birleştirmeyi akışla al ve terminalde canlı göster
+    STREAM_PREVIEW_LINES = 12  # Canlı panelde gösterilen son satır sayısı
     SAVE_RESULTS = True
     RESULTS_DIR = 'results'
+    RESULTS_DB = os.path.join(RESULTS_DIR, 'results.sqlite')  # Çalıştırma geçmişi (SQLite + FTS5)
+    REUSE_PREVIOUS_RUNS = True  # Aynı kaynak aynı ayarlarla analiz edildiyse sonucu veritabanından al
+    EXPORT_TEXT_FILES = True  # Veritabanına ek olarak her dil için .txt (ve JSON) dosyası yaz (--no-export-text)
+    INCREMENTAL_LOOKBACK_SECONDS = 3600  # Artımlı modda filigranın gerisinde yine kontrol edilen süre
+    STORE_DIR = 'store'  # Yerel tweet deposu (aylık SQLite + FTS5 bölümleri)
+    
+    # Arka plan analiz işleri (Streamlit)
+    JOB_WORKERS = 2  # Aynı anda çalışan analiz işi
+    JOBS_DIR = os.path.join(RESULTS_DIR, '.jobs')
+    JOB_HISTORY_LIMIT = 50  # Diskte tutulan en fazla iş
+    JOB_POLL_SECONDS = 1.0  # Sonuç sekmesinin iş durumunu yenileme aralığı
+    JOB_SAVE_SECONDS = 2.0  # Çalışan işin ilerlemesinin diske yazılma aralığı
+    
+    # Yanıt önbelleği ayarları
+    CACHE_ENABLED = True
+    CACHE_DIR = '.cache'
+    CACHE_MAX_BYTES = 100 * 1024 * 1024  # 100 MB
+    CACHE_TTL_SECONDS = 7 * 24 * 3600  # 7 gün
+    
+    # Streamlit önbelleği: içerik özetine göre tutulan yüklemeler, tablolar ve istatistikler
+    UI_CACHE_MAX_ENTRIES = 4
+    UI_CACHE_TTL_SECONDS = 3600
+    UI_TABLE_MAX_ROWS = 1000  # İstatistik sekmesindeki detaylı tabloda gösterilen satır
+    UI_ENTITY_TOP = 20  # Varlık grafiğinde gösterilen en çok geçen varlık
+    UI_ENTITY_OPTIONS = 500  # Varlık filtresinde seçilebilen en çok geçen varlık
+    UI_SAVE_RESULTS = False  # Web arayüzü çalıştırmalarını sonuç veritabanına kaydet (kenar çubuğundan açılır)
     
     def __init__(self):
         self.MAX_TWEETS_PER_ANALYSIS = 50
@@ -51,4 +111,69 @@ class Config:
     {tweets}
     
     Please provide a detailed and organized analysis that would be useful for crypto investors.
-    """ 
\ No newline at end of file
+    """
+    
+    # İki dilli mod: tek çağrıda hem Türkçe hem İngilizce bölüm
+    ANALYSIS_PROMPT_BILINGUAL = """
+    Aşağıdaki kripto para ve airdrop tweet verilerini analiz et. Aynı analizi önce Türkçe, sonra İngilizce olarak ver.
+    Analyze the following cryptocurrency and airdrop tweet data. Give the same analysis first in Turkish, then in English.
+    
+    Her iki dilde şu bölümleri kullan / Use these sections in both languages:
+    1. GENEL ÖZET / GENERAL SUMMARY: Tweetlerin genel konuları ve bahsedilen projeler
+    2. AIRDROP BİLGİLERİ / AIRDROP INFORMATION: Airdrop'lar, tarihler, koşullar ve detaylar
+    3. PROJE VE TOKEN BİLGİLERİ / PROJECT AND TOKEN INFO: Kripto projeler, token'lar ve özellikleri
+    4. ÖNEMLİ DUYURULAR / IMPORTANT ANNOUNCEMENTS: Önemli açıklamalar, güncellemeler ve haberler
+    5. SONUÇ / CONCLUSION: Genel değerlendirme ve öneriler
+    
+    Yanıtı tam olarak şu biçimde ver, işaret satırlarını değiştirme:
+    Reply exactly in this layout and do not alter the marker lines:
+    [[TURKCE]]
+    <Türkçe analiz>
+    [[ENGLISH]]
+    <English analysis>
+    
+    Tweet verileri / Tweet data:
+    {tweets}
+    """
+    
+    COMBINE_PROMPT_BILINGUAL = """
+    Aşağıdaki Twitter analizi parçalarını tek bir kapsamlı analiz halinde birleştir ve sonucu hem Türkçe hem İngilizce ver.
+    Combine the following Twitter analysis parts into one comprehensive analysis and provide it in both Turkish and English.
+    Türkçe bölümü Türkçe parçalardan, İngilizce bölümü İngilizce parçalardan birleştir.
+    Build the Turkish section from the Turkish parts and the English section from the English parts.
+    
+    Türkçe parçalar / Turkish parts:
+    {turkish}
+    
+    İngilizce parçalar / English parts:
+    {english}
+    
+    Yanıtı tam olarak şu biçimde ver, işaret satırlarını değiştirme:
+    Reply exactly in this layout and do not alter the marker lines:
+    [[TURKCE]]
+    <Türkçe birleşik analiz>
+    [[ENGLISH]]
+    <Combined English analysis>
+    """
+    
+    # Yapılandırılmış mod: parça başına JSON; çift süslü parantezler .format için kaçış
+    STRUCTURED_PROMPT = """
+    Analyze the following cryptocurrency and airdrop tweet data and reply with a single JSON object only.
+    
+    Schema (TEXT is described below; use null or [] when nothing is known, never invent data):
+    {{
+      "summary": TEXT,
+      "projects": [{{"name": "project name", "token": "ticker or null", "description": TEXT}}],
+      "tokens": [{{"symbol": "ticker", "project": "project name or null", "note": TEXT}}],
+      "airdrops": [{{"project": "project name", "token": "ticker or null", "date": "YYYY-MM-DD or free text or null", "requirements": [TEXT], "details": TEXT}}],
+      "announcements": [{{"project": "project name or null", "date": "date or null", "text": TEXT}}],
+      "sentiment": {{"score": -1.0 to 1.0, "label": "positive, neutral or negative"}},
+      "conclusion": TEXT
+    }}
+    {language_rule}
+    The fields follow the report sections: summary (general summary), airdrops (dates, requirements, details),
+    projects and tokens, announcements (key news and updates), conclusion (evaluation and recommendations).
+    
+    Tweet data:
+    {tweets}
+    """
@@ -0,0 +1,210 @@
+"""
+Yakın kopya tweet eleme.
+Karakter shingle'ları üzerinden MinHash imzaları çıkarılır ve LSH bantlarıyla yalnızca
+aday çiftler karşılaştırılır; böylece 100 bin+ tweet'te bile karesel karşılaştırma yapılmaz.
+"""
+
+import re
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+SHINGLE_SIZE = 5
+NUM_PERMUTATIONS = 64
+NUM_BANDS = 16
+BATCH_SIZE = 10000
+_PRIME = (1 << 31) - 1
+_BASE = 1000003
+
+URL_RE = re.compile(r'https?://\S+')
+RETWEET_RE = re.compile(r'^rt @\w+:\s*')
+NON_WORD_RE = re.compile(r'[^\w$#@%]+')
+ENTITY_RE = re.compile(r'(?<!\w)(?:\$[^\W\d]\w*|@\w+)')
+
+
+def normalize_text(text: str) -> str:
+    """Karşılaştırma için metni sadeleştir (küçük harf, URL ve RT öneki yok, tek boşluk)"""
+    text = text.lower()
+    text = RETWEET_RE.sub('', text)
+    text = URL_RE.sub(' ', text)
+    return NON_WORD_RE.sub(' ', text).strip()
+
+
+class MinHasher:
+    """Sabit tohumlu evrensel hash ailesiyle toplu MinHash imzaları üretir"""
+
+    def __init__(self, num_permutations: int = NUM_PERMUTATIONS, seed: int = 42):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, 2 ** 63, size=num_permutations, dtype=np.uint64) | np.uint64(1)
+        self.b = rng.integers(0, 2 ** 63, size=num_permutations, dtype=np.uint64)
+
+    def _shingle_hashes(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Tüm metinlerin karakter shingle hash'leri ve her metnin başlangıç ofseti"""
+        padded = [text.ljust(SHINGLE_SIZE) for text in texts]
+        lengths = np.fromiter((len(text) for text in padded), dtype=np.int64, count=len(padded))
+        codes = np.frombuffer(''.join(padded).encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+
+        # Birleşik metin üzerinde kayan polinom hash
+        windows = len(codes) - SHINGLE_SIZE + 1
+        rolling = np.zeros(windows, dtype=np.uint64)
+        for j in range(SHINGLE_SIZE):
+            rolling = (rolling * _BASE + codes[j:j + windows]) % _PRIME
+
+        # Yalnızca tek bir metnin içinde kalan pencereleri al
+        counts = lengths - SHINGLE_SIZE + 1
+        text_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        out_starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        positions = np.arange(counts.sum()) + np.repeat(text_starts - out_starts, counts)
+        return rolling[positions], out_starts
+
+    def signatures(self, texts: List[str]) -> np.ndarray:
+        """(metin sayısı x permütasyon sayısı) boyutlu imza matrisi"""
+        result = np.empty((len(texts), len(self.a)), dtype=np.uint64)
+        for start in range(0, len(texts), BATCH_SIZE):
+            batch = texts[start:start + BATCH_SIZE]
+            hashes, offsets = self._shingle_hashes(batch)
+            for p in range(len(self.a)):
+                # Çarp-kaydır hash'i: modülo yerine 64 bitte taşma ve üst 32 bit
+                values = (self.a[p] * hashes + self.b[p]) >> np.uint64(32)
+                result[start:start + len(batch), p] = np.minimum.reduceat(values, offsets)
+        return result
+
+
+def entity_key(normalized: str) -> str:
+    """Normalize edilmiş metindeki cashtag ve bahsetmelerin sıralı, tekrarsız listesi"""
+    return ' '.join(sorted(set(ENTITY_RE.findall(normalized))))
+
+
+def find_duplicate_groups(texts: List[str], threshold: float = 0.8) -> List[int]:
+    """
+    Her metin için temsilcisinin (grubundaki ilk metnin) indeksini döndür.
+    LSH kovaları yalnızca aday üretir; iki grup ancak cashtag/bahsetme kümeleri aynıysa ve
+    birleşen grubun her üyesi kalan temsilciyle eşiği geçiyorsa birleşir (MinHash eleme yapar,
+    karar kesin shingle benzerliğiyle verilir). Böylece benzerlik zincirleme yayılmaz ve
+    yalnızca proje adı ya da token'ı farklı şablon tweet'ler ayrı kalır. Normalize edilince
+    boş kalan metinler (yalnızca emoji ya da URL) karşılaştırılamaz; her biri kendi grubudur.
+    """
+    parent = list(range(len(texts)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            # Temsilci her zaman daha önce gelen tweet olsun
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    # Birebir aynı (normalize edilmiş) metinler için hızlı yol
+    first_seen: Dict[str, int] = {}
+    candidates, candidate_texts = [], []
+    for i, text in enumerate(texts):
+        normalized = normalize_text(text)
+        if not normalized:
+            continue
+        if normalized in first_seen:
+            union(first_seen[normalized], i)
+        else:
+            first_seen[normalized] = i
+            candidates.append(i)
+            candidate_texts.append(normalized)
+
+    if len(candidates) < 2:
+        return [find(i) for i in range(len(texts))]
+
+    # Kalanlar için MinHash + LSH; birleşmeler aday sıraları üzerinde yapılır
+    signatures = MinHasher().signatures(candidate_texts)
+    _, entities = np.unique(np.array([entity_key(text) for text in candidate_texts], dtype=object),
+                            return_inverse=True)
+    entities = entities.ravel()
+    groups = list(range(len(candidates)))
+    group_members: Dict[int, List[int]] = {}
+
+    def find_group(i: int) -> int:
+        while groups[i] != i:
+            groups[i] = groups[groups[i]]
+            i = groups[i]
+        return i
+
+    shingle_sets: Dict[int, set] = {}
+    rejected = set()
+
+    def jaccard(i: int, j: int) -> float:
+        """MinHash tahmini yerine kesin shingle benzerliği (yalnızca birleşme adaylarında)"""
+        for k in (i, j):
+            if k not in shingle_sets:
+                text = candidate_texts[k].ljust(SHINGLE_SIZE)
+                shingle_sets[k] = {text[p:p + SHINGLE_SIZE] for p in range(len(text) - SHINGLE_SIZE + 1)}
+        first, second = shingle_sets[i], shingle_sets[j]
+        return len(first & second) / len(first | second)
+
+    def merge(i: int, j: int):
+        """Grupları, kalan temsilciye tüm üyeler eşiği geçiyorsa birleştir"""
+        keep, drop = min(i, j), max(i, j)
+        # Reddedilen çift başka bantlarda yeniden aday olur; grupları büyüse de karar değişmez
+        if entities[keep] != entities[drop] or (keep, drop) in rejected:
+            return
+        moved = group_members.get(drop, [drop])
+        if any(jaccard(keep, member) < threshold for member in moved):
+            rejected.add((keep, drop))
+            return
+        groups[drop] = keep
+        group_members[keep] = group_members.get(keep, [keep]) + moved
+        group_members.pop(drop, None)
+
+    rows = NUM_PERMUTATIONS // NUM_BANDS
+    for band in range(NUM_BANDS):
+        band_rows = signatures[:, band * rows:(band + 1) * rows]
+        keys = band_rows[:, 0].copy()
+        for r in range(1, rows):
+            keys = keys * np.uint64(_BASE) ^ band_rows[:, r]
+        # Kovadaki her öğe kovanın ilk öğesiyle aday çift olur
+        _, first_index, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        leaders = first_index[inverse.ravel()]
+        members = np.nonzero(leaders != np.arange(len(keys)))[0]
+        if not len(members):
+            continue
+        # Karşılaştırma kova liderleriyle değil, iki tarafın grup temsilcileriyle yapılır
+        roots = np.fromiter((find_group(i) for i in range(len(keys))), dtype=np.int64, count=len(keys))
+        member_roots, leader_roots = roots[members], roots[leaders[members]]
+        pending = member_roots != leader_roots
+        member_roots, leader_roots = member_roots[pending], leader_roots[pending]
+        passing = (entities[member_roots] == entities[leader_roots]) & (
+            (signatures[member_roots] == signatures[leader_roots]).mean(axis=1) >= threshold)
+        for i, j in zip(member_roots[passing].tolist(), leader_roots[passing].tolist()):
+            # Bu bantta daha önce birleşen grupların temsilcisi değişmiş olabilir
+            root_i, root_j = find_group(i), find_group(j)
+            if root_i != root_j:
+                merge(root_i, root_j)
+
+    for i in range(len(candidates)):
+        union(candidates[find_group(i)], candidates[i])
+    return [find(i) for i in range(len(texts))]
+
+
+def deduplicate_tweets(tweets: List[Dict[str, Any]],
+                       threshold: float = 0.8) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Yakın kopyaları tek bir temsilciye indir.
+    Temsilcinin kopyası `duplicate_count` alanıyla döner; ikinci değer elenen tweet'lerdir.
+    """
+    if not tweets:
+        return [], []
+
+    representatives = find_duplicate_groups([tweet.get('text', '') for tweet in tweets], threshold)
+    counts: Dict[int, int] = {}
+    for root in representatives:
+        counts[root] = counts.get(root, 0) + 1
+
+    unique, removed = [], []
+    for i, tweet in enumerate(tweets):
+        if representatives[i] != i:
+            removed.append(tweet)
+        elif counts[i] > 1:
+            unique.append({**tweet, 'duplicate_count': counts[i]})
+        else:
+            unique.append(tweet)
+    return unique, removed
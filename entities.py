@@ -0,0 +1,154 @@
+"""
+Yerel varlık çıkarımı ve ters indeks.
+Tweet metinlerindeki cashtag ($ZRO), hashtag (#LayerZero) ve kullanıcı bahsetmeleri (@handle)
+model çağrısı olmadan çıkarılır ve her varlıktan geçtiği tweet'lere bir ters indeks kurulur:
+geçiş sayısı, tekrarsız tweet sayısı, ilk/son görülme zamanı ve tweet sıraları.
+
+Metinler ayraçla tek bir dizgede birleştirilip derlenmiş tek bir düzenli ifadeyle taranır;
+ayraçlar da eşleştiği için her geçişin ait olduğu tweet ayraçların kümülatif sayısından bulunur.
+Varlıklar pandas'ın hash tablosuyla kodlanır, (varlık, tweet) çiftleri numpy ile sıralanıp varlık
+başına tekrarsız tweet listelerine (CSR) indirilir. Böylece 1M tweet birkaç saniyede indekslenir.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ranking import timestamp_seconds
+from results_store import normalize_entity, parse_entity_terms
+
+SEPARATOR = '\x00'
+# Geriye bakışlar işaretten sonra yazılır; böylece işaret karakterleri taramanın hızlı öneki olur.
+# Önünde kelime ya da işaret karakteri olan eşleşmeler (e-posta, "$$", "a#b") varlık sayılmaz.
+ENTITY_RE = re.compile(
+    r'\x00'
+    r'|\$(?<![\w$#@]\$)[A-Za-z]\w*'
+    r'|#(?<![\w$#@]#)[^\W\d_]\w*'
+    r'|@(?<![\w$#@]@)\w+'
+)
+KINDS = {'$': 'cashtag', '#': 'hashtag', '@': 'mention'}
+
+
+def _extract(texts: Sequence[str]):
+    """Her geçişin tweet sırası ve varlık kodu, kodların varlıkları"""
+    if not len(texts):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=object)
+    # Baştaki ayraç, ayraca 0 kodunu verir
+    found = [SEPARATOR] + ENTITY_RE.findall(SEPARATOR.join(texts))
+    raw_codes, raw = pd.factorize(np.array(found, dtype=object))
+    # Yazım farkları ($zro, $ZRO) yalnızca tekrarsız değerlerde normalize edilip birleştirilir
+    normalized_codes, entities = pd.factorize(np.array([normalize_entity(value) for value in raw], dtype=object))
+    codes = normalized_codes[raw_codes]
+
+    is_separator = codes == 0
+    if is_separator.sum() != len(texts):
+        # Metnin kendisinde ayraç karakteri var; temizleyip yeniden tara
+        return _extract([text.replace(SEPARATOR, ' ') for text in texts])
+    rows = np.cumsum(is_separator)[~is_separator] - 1
+    return rows, codes[~is_separator] - 1, np.asarray(entities[1:], dtype=object)
+
+
+class EntityIndex:
+    """Varlıktan, geçtiği tweet'lerin (indekslenen listedeki) sıralarına ters indeks"""
+
+    def __init__(self, entities: np.ndarray, mentions: np.ndarray, tweets: np.ndarray,
+                 first_seen: np.ndarray, last_seen: np.ndarray,
+                 offsets: np.ndarray, postings: np.ndarray, size: int):
+        self.entities = entities
+        self.mentions = mentions
+        self.tweets = tweets
+        self.first_seen = first_seen
+        self.last_seen = last_seen
+        self.offsets = offsets
+        self.postings = postings
+        self.size = size
+        self._ids = {entity: i for i, entity in enumerate(entities)}
+        self.kinds = np.array([KINDS[entity[0]] for entity in entities], dtype=object)
+        # En çok geçenden aza; eşitlikte ilk görülen önce
+        self.ranking = np.argsort(-mentions, kind='stable')
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def __contains__(self, entity: str) -> bool:
+        return normalize_entity(entity) in self._ids
+
+    def rows(self, entity: str) -> np.ndarray:
+        """Varlığın geçtiği tweet sıraları (artan)"""
+        i = self._ids.get(normalize_entity(entity))
+        if i is None:
+            return self.postings[:0]
+        return self.postings[self.offsets[i]:self.offsets[i + 1]]
+
+    def resolve(self, terms: Iterable[str]) -> List[str]:
+        """
+        Terimleri indeksteki varlıklara çevir. '$ZRO', '#layerzero' ve '@handle' birebir;
+        işaretsiz bir ad ('LayerZero') cashtag, hashtag ve kullanıcı adı olarak aranır.
+        """
+        resolved = []
+        for term in parse_entity_terms(terms):
+            candidates = [term] if term[0] in KINDS else [normalize_entity(prefix + term) for prefix in KINDS]
+            resolved.extend(entity for entity in candidates if entity in self._ids and entity not in resolved)
+        return resolved
+
+    def match(self, terms: Iterable[str]) -> np.ndarray:
+        """Terimlerden en az birinin geçtiği tweet sıraları (artan, tekrarsız)"""
+        entities = self.resolve(terms)
+        if not entities:
+            return self.postings[:0]
+        return np.unique(np.concatenate([self.rows(entity) for entity in entities]))
+
+    def select(self, tweets: List[Dict[str, Any]], terms: Iterable[str]) -> List[Dict[str, Any]]:
+        """İndekslenen tweet listesinden terimlerle eşleşenler, kaynak sırasıyla"""
+        return [tweets[i] for i in self.match(terms)]
+
+    def top(self, limit: Optional[int] = None, kind: Optional[str] = None) -> pd.DataFrame:
+        """En çok geçen varlıklar: tür, geçiş ve tweet sayısı, ilk ve son görülme (UTC)"""
+        order = self.ranking
+        if kind:
+            order = order[self.kinds[order] == kind]
+        order = order[:limit]
+        return pd.DataFrame({
+            'entity': self.entities[order],
+            'kind': self.kinds[order],
+            'mentions': self.mentions[order],
+            'tweets': self.tweets[order],
+            'first_seen': pd.to_datetime(self.first_seen[order], unit='s', utc=True),
+            'last_seen': pd.to_datetime(self.last_seen[order], unit='s', utc=True),
+        })
+
+
+def build_entity_index(texts: Sequence[str], timestamps: Optional[Sequence[Optional[str]]] = None) -> EntityIndex:
+    """Metinlerden (ve varsa zamanlarından) ters indeksi kur"""
+    rows, codes, entities = _extract(texts)
+    count = len(entities)
+    mentions = np.bincount(codes, minlength=count)
+
+    # (varlık, tweet) çiftlerini sırala; aynı tweet'teki tekrarlar tek kayda iner
+    order = np.lexsort((rows, codes))
+    codes, rows = codes[order], rows[order]
+    first = np.ones(len(codes), dtype=bool)
+    first[1:] = (codes[1:] != codes[:-1]) | (rows[1:] != rows[:-1])
+    codes, postings = codes[first], rows[first].astype(np.int32)
+    tweets = np.bincount(codes, minlength=count)
+    offsets = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(tweets, out=offsets[1:])
+
+    first_seen = np.full(count, np.nan)
+    last_seen = np.full(count, np.nan)
+    if timestamps is not None and count:
+        seconds = timestamp_seconds(list(timestamps))[postings]
+        # fmin/fmax zamanı okunamayan tweet'leri (NaN) atlar
+        first_seen = np.fmin.reduceat(seconds, offsets[:-1])
+        last_seen = np.fmax.reduceat(seconds, offsets[:-1])
+    return EntityIndex(entities, mentions, tweets, first_seen, last_seen, offsets, postings, len(texts))
+
+
+def index_tweets(tweets: List[Dict[str, Any]]) -> EntityIndex:
+    """Tweet sözlüklerinin metin ve zamanlarından ters indeks"""
+    return build_entity_index(
+        [tweet.get('text') or '' for tweet in tweets],
+        [tweet.get('timestamp') for tweet in tweets],
+    )
@@ -0,0 +1,198 @@
+"""
+Artımlı analiz durumu.
+Kaynak dosya başına son çalıştırmanın filigranı (scraped_at/timestamp), görülen tweet
+kimlikleri, JSON Lines okuma ofseti ve önceki analiz sonucu saklanır; böylece her döngü
+yalnızca yeni tweet'leri işler.
+
+JSON Lines dosyaları kalınan ofsetten okunur. JSON dizisinde ofset tutulamaz (dışa aktaran
+araçlar dosyayı baştan yazar); dizi dosyaları boyutu ya da değiştirilme zamanı değiştiğinde
+baştan okunur, değişmediyse hiç okunmaz.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from tweet_loader import LoadStats, iter_tweets, validate_tweet
+
+# Zamanı okunamayan tweet'ler filigranla elenemez; kimliklerinden en yeni bu kadarı saklanır
+MAX_UNTIMED_IDS = 10000
+# Tweet sınırını aştığı için sonraki döngüye bırakılan tweet'lerden en yeni bu kadarı saklanır
+MAX_PENDING_TWEETS = 10000
+
+
+def tweet_id(tweet: Dict[str, Any]) -> str:
+    """Kullanıcı, zaman ve metinden kararlı bir tweet kimliği üret"""
+    key = '\0'.join((
+        tweet.get('username') or '',
+        tweet.get('timestamp') or '',
+        tweet.get('text') or '',
+    ))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+
+
+def parse_time(value: Optional[str]) -> Optional[float]:
+    """ISO 8601 zamanını epoch saniyesine çevir (saat dilimi yoksa UTC kabul edilir)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def is_json_lines(json_file: str) -> bool:
+    """Dosya JSON Lines mı (ilk anlamlı karakter '{')"""
+    with open(json_file, 'rb') as f:
+        head = f.read(64).lstrip(b'\xef\xbb\xbf \t\r\n')
+    return head.startswith(b'{')
+
+
+def tweet_time(tweet: Dict[str, Any]) -> Optional[float]:
+    """Filigran için tweet zamanı: önce scraped_at, yoksa timestamp"""
+    return parse_time(tweet.get('scraped_at')) or parse_time(tweet.get('timestamp'))
+
+
+class IncrementalState:
+    """Bir kaynak dosya için kalıcı artımlı analiz durumu"""
+
+    def __init__(self, path: str, lookback_seconds: float = 3600, max_untimed: int = MAX_UNTIMED_IDS,
+                 max_pending: int = MAX_PENDING_TWEETS):
+        self.path = path
+        self.lookback_seconds = lookback_seconds
+        self.max_untimed = max_untimed
+        self.max_pending = max_pending
+        self.watermark: Optional[float] = None
+        self.seen: Dict[str, Optional[float]] = {}
+        self.offset = 0
+        self.checkpoint: Optional[List[int]] = None
+        self.pending: List[Dict[str, Any]] = []
+        self.total_tweets = 0
+        self.results: Dict[str, str] = {}
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.watermark = data.get('watermark')
+            self.seen = data.get('seen', {})
+            self.offset = data.get('offset', 0)
+            self.checkpoint = data.get('checkpoint')
+            self.pending = data.get('pending', [])
+            self.total_tweets = data.get('total_tweets', 0)
+            self.results = data.get('results', {})
+
+    @classmethod
+    def for_source(cls, results_dir: str, json_file: str, lookback_seconds: float = 3600) -> 'IncrementalState':
+        """Kaynak dosyaya ait durum dosyasını aç"""
+        source = os.path.abspath(json_file)
+        digest = hashlib.sha1(source.encode('utf-8')).hexdigest()[:10]
+        base = os.path.splitext(os.path.basename(json_file))[0]
+        path = os.path.join(results_dir, '.state', f"{base}_{digest}.json")
+        return cls(path, lookback_seconds)
+
+    def is_new(self, tweet: Dict[str, Any]) -> bool:
+        """Tweet filigrandan yeni ve daha önce görülmemişse True"""
+        moment = tweet_time(tweet)
+        if moment is not None and self.watermark is not None \
+                and moment < self.watermark - self.lookback_seconds:
+            return False
+        return tweet_id(tweet) not in self.seen
+
+    def read_new_tweets(self, json_file: str) -> List[Dict[str, Any]]:
+        """
+        Önceki döngüden ertelenen tweet'ler ve kaynaktaki yeni tweet'ler. JSON Lines dosyalarında
+        kalınan ofsetten devam edilir; JSON dizisi yalnızca değiştiyse yeniden okunur.
+        """
+        fresh = self._read_json_lines(json_file) if is_json_lines(json_file) else self._read_json_array(json_file)
+        pending = {tweet_id(tweet) for tweet in self.pending}
+        return self.pending + [tweet for tweet in fresh if tweet_id(tweet) not in pending and self.is_new(tweet)]
+
+    def _read_json_array(self, json_file: str):
+        """Dosya son okumadan beri değişmediyse hiçbir şey, değiştiyse tüm tweet'ler"""
+        stat = os.stat(json_file)
+        checkpoint = [stat.st_size, stat.st_mtime_ns]
+        if checkpoint == self.checkpoint:
+            return []
+        self.checkpoint = checkpoint
+        return iter_tweets(json_file, LoadStats())
+
+    def _read_json_lines(self, json_file: str):
+        """Ofsetten itibaren tamamlanmış satırları oku ve ofseti ilerlet"""
+        if os.path.getsize(json_file) < self.offset:
+            # Dosya kısalmış (döndürülmüş); görülen kimlikler tekrarları yine eler
+            self.offset = 0
+        with open(json_file, 'rb') as f:
+            f.seek(self.offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # Scraper hâlâ yazıyor; yarım satırı sonraki döngüye bırak
+                    break
+                self.offset += len(line)
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    tweet = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if validate_tweet(tweet) is None:
+                    yield tweet
+
+    def update(self, new_tweets: List[Dict[str, Any]], results: Dict[str, str],
+               deferred: Iterable[Dict[str, Any]] = ()):
+        """
+        Analiz edilen tweet'leri görülmüş say, filigranı ilerlet ve birleşik sonucu sakla.
+        `deferred` tweet sınırı yüzünden analize girmeyenlerdir; sonraki döngüde yeniden aday olurlar.
+        """
+        deferred = list(deferred)
+        self.pending = deferred[-self.max_pending:] if self.max_pending else []
+        skipped = {tweet_id(tweet) for tweet in deferred}
+        analyzed = 0
+        for tweet in new_tweets:
+            key = tweet_id(tweet)
+            if key in skipped:
+                continue
+            analyzed += 1
+            moment = tweet_time(tweet)
+            self.seen[key] = moment
+            if moment is not None and (self.watermark is None or moment > self.watermark):
+                self.watermark = moment
+        self.total_tweets += analyzed
+        self.results = {key: value for key, value in results.items() if key in ('turkish', 'english', 'structured')}
+
+        # Geri bakış penceresinin dışında kalan kimlikler artık filigranla eleniyor; zamansız
+        # kimlikler ekleme sırasıyla sınırlanır (en eskiler düşer), yoksa izleme modunda durum büyür
+        cutoff = self.watermark - self.lookback_seconds if self.watermark is not None else None
+        untimed = sum(1 for moment in self.seen.values() if moment is None)
+        drop_untimed = max(0, untimed - self.max_untimed)
+        seen = {}
+        for key, moment in self.seen.items():
+            if moment is None:
+                if drop_untimed:
+                    drop_untimed -= 1
+                    continue
+            elif cutoff is not None and moment < cutoff:
+                continue
+            seen[key] = moment
+        self.seen = seen
+
+    def save(self):
+        """Durumu atomik olarak diske yaz"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'watermark': self.watermark,
+                'seen': self.seen,
+                'offset': self.offset,
+                'checkpoint': self.checkpoint,
+                'pending': self.pending,
+                'total_tweets': self.total_tweets,
+                'results': self.results,
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,232 @@
+"""
+Arka planda çalışan analiz işleri.
+Streamlit betiği analiz bitene kadar bloklanmasın diye analizler süreç genelindeki bir iş
+havuzunda çalışır. Her işin kimliği, durumu, parça bazında ilerlemesi ve sonucu diske yazılır;
+oturum yenilense ya da sunucu yeniden başlasa da iş kimliğiyle sonuca yeniden ulaşılabilir.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from analyzer import AnalysisCancelled
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+INTERRUPTED = 'interrupted'
+FINISHED_STATES = (DONE, FAILED, CANCELLED, INTERRUPTED)
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec='seconds')
+
+
+class Job:
+    """Tek bir analiz işinin durumu"""
+
+    def __init__(self, job_id: str, language: str, tweet_count: int, label: str = ''):
+        self.id = job_id
+        self.language = language
+        self.tweet_count = tweet_count
+        self.label = label
+        self.status = QUEUED
+        self.created_at = _now()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.total_chunks = 0
+        self.completed_chunks = 0
+        self.chunk_results: List[Dict[str, Any]] = []
+        self.partial: Dict[str, str] = {}
+        self.results: Optional[Dict[str, str]] = None
+        self.error: Optional[str] = None
+        self.metrics: Optional[Dict[str, Any]] = None
+        self.telemetry = None  # Yalnızca bellekte; diske metrics özeti yazılır
+        self.cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'id': self.id,
+                'language': self.language,
+                'tweet_count': self.tweet_count,
+                'label': self.label,
+                'status': self.status,
+                'created_at': self.created_at,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at,
+                'total_chunks': self.total_chunks,
+                'completed_chunks': self.completed_chunks,
+                'chunk_results': list(self.chunk_results),
+                'partial': dict(self.partial),
+                'results': self.results,
+                'error': self.error,
+                'metrics': self.metrics,
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Job':
+        job = cls(data['id'], data['language'], data['tweet_count'], data.get('label', ''))
+        for key in ('status', 'created_at', 'started_at', 'finished_at', 'total_chunks',
+                    'completed_chunks', 'chunk_results', 'partial', 'results', 'error', 'metrics'):
+            if key in data:
+                setattr(job, key, data[key])
+        return job
+
+
+class JobManager:
+    """Analiz işlerini sınırlı bir iş parçacığı havuzunda çalıştırır ve diske kaydeder"""
+
+    def __init__(self, max_workers: int = 2, jobs_dir: str = 'results/.jobs', history_limit: int = 50,
+                 save_interval: float = 2.0):
+        self.jobs_dir = jobs_dir
+        self.history_limit = history_limit
+        self.save_interval = save_interval
+        self.jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='analysis-job')
+        os.makedirs(jobs_dir, exist_ok=True)
+        self._load()
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.jobs_dir, f"{job_id}.json")
+
+    def _load(self):
+        """Önceki süreçten kalan işleri oku; yarıda kalanları 'interrupted' işaretle"""
+        for name in os.listdir(self.jobs_dir):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.jobs_dir, name), 'r', encoding='utf-8') as f:
+                    job = Job.from_dict(json.load(f))
+            except (OSError, ValueError, KeyError):
+                continue
+            if not job.finished:
+                job.status = INTERRUPTED
+                job.finished_at = job.finished_at or _now()
+                self._save(job)
+            self.jobs[job.id] = job
+
+    def _save(self, job: Job):
+        """İş durumunu atomik olarak yaz"""
+        path = self._path(job.id)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(job.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _prune(self):
+        """En eski bitmiş işleri geçmiş sınırına kadar sil"""
+        with self._lock:
+            finished = sorted((job for job in self.jobs.values() if job.finished), key=lambda job: job.created_at)
+            excess = finished[:max(0, len(self.jobs) - self.history_limit)]
+            for job in excess:
+                del self.jobs[job.id]
+        for job in excess:
+            try:
+                os.remove(self._path(job.id))
+            except OSError:
+                pass
+
+    def submit(self, analyzer, tweets: List[Dict[str, Any]], language: str, label: str = '',
+               source_hash: Optional[str] = None) -> str:
+        """Analizi kuyruğa al ve iş kimliğini döndür; biten analiz sonuç veritabanına kaydedilir"""
+        job = Job(uuid.uuid4().hex[:12], language, len(tweets), label)
+        with self._lock:
+            self.jobs[job.id] = job
+        self._save(job)
+        self._prune()
+        self._executor.submit(self._run, job, analyzer, tweets, language, source_hash)
+        return job.id
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def list_jobs(self) -> List[Job]:
+        """İşler, en yenisi önce"""
+        with self._lock:
+            return sorted(self.jobs.values(), key=lambda job: job.created_at, reverse=True)
+
+    def cancel(self, job_id: str) -> bool:
+        """İşi iptal et; kuyruktaki iş hiç başlamaz, çalışan iş sıradaki model çağrısında durur"""
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.cancel_event.set()
+        return True
+
+    def _run(self, job: Job, analyzer, tweets: List[Dict[str, Any]], language: str,
+             source_hash: Optional[str] = None):
+        if job.cancel_event.is_set():
+            self._finish(job, CANCELLED)
+            return
+        with job._lock:
+            job.status = RUNNING
+            job.started_at = _now()
+        self._save(job)
+
+        last_save = time.monotonic()
+
+        def on_chunk(done: int, total: int, chunk_language: str, result: Any):
+            nonlocal last_save
+            with job._lock:
+                job.total_chunks = total
+                job.completed_chunks = done
+                job.chunk_results.append({'language': chunk_language, 'result': result})
+            # Her kayıt tüm parça sonuçlarını yeniden yazar; ilerleme diske en fazla save_interval'da bir yazılır
+            now = time.monotonic()
+            if now - last_save >= self.save_interval:
+                last_save = now
+                self._save(job)
+
+        def on_partial(partial: Dict[str, str]):
+            # Akış güncellemeleri sık gelir; yalnızca bellekte tutulur
+            with job._lock:
+                job.partial = partial
+
+        job.telemetry = analyzer.telemetry
+        try:
+            results = analyzer.analyze_tweets(
+                tweets, language,
+                on_partial=on_partial,
+                progress_callback=on_chunk,
+                cancel_event=job.cancel_event,
+            )
+        except AnalysisCancelled:
+            self._finish(job, CANCELLED)
+        except Exception as e:
+            self._finish(job, FAILED, error=str(e))
+        else:
+            if 'error' in results:
+                self._finish(job, FAILED, error=results['error'])
+                return
+            error = None
+            try:
+                analyzer.save_results(results, job.label, job.tweet_count, source_hash, language)
+            except Exception as e:
+                # Kayıt hatası analizi boşa çıkarmasın; sonuç yine gösterilir, hata işte saklanır
+                error = f"Sonuç kaydedilemedi: {str(e)}"
+            self._finish(job, DONE, results=results, error=error)
+
+    def _finish(self, job: Job, status: str, results: Optional[Dict[str, str]] = None, error: Optional[str] = None):
+        with job._lock:
+            job.status = status
+            job.finished_at = _now()
+            job.results = results
+            job.error = error
+            if job.telemetry is not None:
+                job.metrics = job.telemetry.summary()
+        self._save(job)
@@ -0,0 +1,331 @@
+"""
+Dil modeli arka uçları.
+TweetAnalyzer `self.model` üzerinden yalnızca `generate(prompt)` arayüzünü (yapılandırılmış
+modda `generate_json`) kullanır; böylece
+Gemini yerine ağ gerektirmeyen, gecikmesi ve hata oranı ayarlanabilen sahte bir arka uç
+(süreç içinde ya da küçük bir yerel HTTP sunucusu olarak) takılabilir.
+
+Sahte sunucuyu başlatmak için:
+    python llm_backends.py --port 8765 --latency 0.8 --error-rate 0.05
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from typing import Iterator, List, Optional
+
+CASHTAG_RE = re.compile(r'\$[A-Za-z][A-Za-z0-9]{1,9}\b')
+HASHTAG_RE = re.compile(r'#\w+')
+
+
+class LLMBackend:
+    """Metin üreten model arka ucu için ortak arayüz"""
+
+    name = 'base'
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def generate(self, prompt: str) -> str:
+        raise NotImplementedError
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        """Yanıtı parça parça üret; akış desteklemeyen arka uçlar tek parça döndürür"""
+        yield self.generate(prompt)
+
+    def generate_json(self, prompt: str) -> str:
+        """Yanıtı JSON olarak iste; JSON kipi olmayan arka uçlarda şemayı yalnızca prompt belirler"""
+        return self.generate(prompt)
+
+
+class GeminiBackend(LLMBackend):
+    """
+    google.generativeai üzerinden Gemini.
+    SDK'nın yüklenmesi ve modelin oluşturulması ilk `generate` çağrısına kadar ertelenir;
+    böylece önbellekten dönen ya da hiç model çağırmayan çalıştırmalar bu maliyeti ödemez.
+    """
+
+    name = 'gemini'
+
+    def __init__(self, api_key: str, model_name: str):
+        super().__init__(model_name)
+        self.api_key = api_key
+        self._model = None
+        self._model_lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    import google.generativeai as genai
+
+                    genai.configure(api_key=self.api_key)
+                    self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+
+    def generate(self, prompt: str) -> str:
+        return self.model.generate_content(prompt).text
+
+    def generate_json(self, prompt: str) -> str:
+        # JSON kipinde model geçerli JSON dışında metin (kod çiti, açıklama) üretmez
+        return self.model.generate_content(
+            prompt, generation_config={'response_mime_type': 'application/json'}
+        ).text
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        for chunk in self.model.generate_content(prompt, stream=True):
+            # Güvenlik filtresi ya da boş parçalarda .text ValueError fırlatır
+            try:
+                text = chunk.text
+            except ValueError:
+                continue
+            if text:
+                yield text
+
+
+class FakeBackendError(Exception):
+    """Sahte arka ucun ürettiği geçici hata (HTTP 429 gibi davranır)"""
+
+    code = 429
+
+
+class FakeBackend(LLMBackend):
+    """
+    Ağ gerektirmeyen, deterministik çıktılı sahte model.
+    Çıktı yalnızca prompt'a bağlıdır; gecikme ve hatalar tohumlu rastgele üreteçten gelir.
+    """
+
+    name = 'fake'
+    FIRST_CHUNK_SHARE = 0.2  # Akışta gecikmenin ilk parçadan önce geçen kısmı
+    STREAM_CHUNK_CHARS = 64
+
+    def __init__(self, model_name: str = 'fake-model', latency_mean: float = 0.5,
+                 latency_jitter: float = 0.2, latency_distribution: str = 'lognormal',
+                 error_rate: float = 0.0, output_chars: int = 1500, seed: int = 0):
+        super().__init__(model_name)
+        self.latency_mean = latency_mean
+        self.latency_jitter = latency_jitter
+        self.latency_distribution = latency_distribution
+        self.error_rate = error_rate
+        self.output_chars = output_chars
+        self.latencies: List[float] = []
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _sample_latency(self) -> float:
+        with self._lock:
+            if self.latency_mean <= 0:
+                return 0.0
+            if self.latency_distribution == 'fixed':
+                return self.latency_mean
+            if self.latency_distribution == 'uniform':
+                return max(0.0, self._rng.uniform(self.latency_mean - self.latency_jitter,
+                                                  self.latency_mean + self.latency_jitter))
+            # Lognormal: ortalaması latency_mean, yayılımı latency_jitter olan sağa çarpık dağılım
+            sigma = min(2.0, self.latency_jitter / self.latency_mean)
+            return self._rng.lognormvariate(0, sigma) * self.latency_mean * math.exp(-sigma * sigma / 2)
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            return self._rng.random() < self.error_rate
+
+    def render(self, prompt: str) -> str:
+        """Prompt'a karşılık gelen deterministik yanıt metni"""
+        digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        entities = sorted(set(CASHTAG_RE.findall(prompt)) | set(HASHTAG_RE.findall(prompt)))[:10]
+        mentioned = ', '.join(entities) or '-'
+        filler = f"Sahte analiz {digest[:12]}. Bahsedilenler: {mentioned}. "
+
+        def section(titles: List[str]) -> str:
+            per_section = max(1, self.output_chars // (len(titles) * len(filler)))
+            return '\n\n'.join(f"{n}. {title}\n{filler * per_section}" for n, title in enumerate(titles, 1))
+
+        turkish = section(['GENEL ÖZET', 'AIRDROP BİLGİLERİ', 'PROJE VE TOKEN BİLGİLERİ',
+                           'ÖNEMLİ DUYURULAR', 'SONUÇ'])
+        english = section(['GENERAL SUMMARY', 'AIRDROP INFORMATION', 'PROJECT AND TOKEN INFO',
+                           'IMPORTANT ANNOUNCEMENTS', 'CONCLUSION'])
+        if '[[TURKCE]]' in prompt:
+            return f"[[TURKCE]]\n{turkish}\n[[ENGLISH]]\n{english}"
+        if 'Türkçe' in prompt:
+            return turkish
+        return english
+
+    def render_json(self, prompt: str) -> str:
+        """Yapılandırılmış mod için deterministik JSON yanıt; tweet'lerdeki cashtag'lerden üretilir"""
+        digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        tweets = prompt.rsplit('Tweet data:', 1)[-1]
+        symbols = sorted({tag.upper() for tag in CASHTAG_RE.findall(tweets)})[:10]
+        hashtags = sorted(set(HASHTAG_RE.findall(tweets)))[:5]
+
+        def text(turkish: str, english: str):
+            if '"tr":' in prompt:
+                return {'tr': turkish, 'en': english}
+            return turkish if 'Türkçe' in prompt else english
+
+        def requirements(symbol: str) -> list:
+            # Koşullar sembole bağlıdır; böylece parçalar birleşirken tekrarlar elenir
+            seed = int(hashlib.sha256(symbol.encode('utf-8')).hexdigest()[:8], 16)
+            pool = [('Cüzdan bağla', 'Connect wallet'), ('Testnet görevlerini tamamla', 'Complete testnet quests'),
+                    ('Discord rolü al', 'Get the Discord role'), ('Token stake et', 'Stake tokens')]
+            return [text(*pool[(seed + k) % len(pool)]) for k in range(2)]
+
+        data = {
+            'summary': text(f"Sahte özet {digest[:12]}.", f"Fake summary {digest[:12]}."),
+            'projects': [
+                {'name': symbol[1:].title(), 'token': symbol,
+                 'description': text(f"{symbol} hakkında sahte açıklama.", f"Fake description of {symbol}.")}
+                for symbol in symbols
+            ],
+            'tokens': [{'symbol': symbol, 'project': symbol[1:].title(), 'note': None} for symbol in symbols],
+            'airdrops': [
+                {'project': symbol[1:].title(), 'token': symbol, 'date': f"2024-06-{10 + n:02d}",
+                 'requirements': requirements(symbol), 'details': None}
+                for n, symbol in enumerate(symbols[::2])
+            ],
+            'announcements': [
+                {'project': None, 'date': None, 'text': text(f"{tag} gündemde.", f"{tag} is trending.")}
+                for tag in hashtags
+            ],
+            'sentiment': {'score': round(int(digest[12:14], 16) / 127.5 - 1, 2), 'label': 'neutral'},
+            'conclusion': text(f"Sahte sonuç {digest[:12]}.", f"Fake conclusion {digest[:12]}."),
+        }
+        return json.dumps(data, ensure_ascii=False)
+
+    def _respond(self, render) -> str:
+        latency = self._sample_latency()
+        time.sleep(latency)
+        with self._lock:
+            self.calls += 1
+            self.latencies.append(latency)
+        if self._should_fail():
+            raise FakeBackendError("429 Resource has been exhausted (fake backend)")
+        return render()
+
+    def generate(self, prompt: str) -> str:
+        return self._respond(lambda: self.render(prompt))
+
+    def generate_json(self, prompt: str) -> str:
+        return self._respond(lambda: self.render_json(prompt))
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        """Gecikmenin bir kısmını ilk parçaya, kalanını parçalar arasına yayarak akıt"""
+        latency = self._sample_latency()
+        with self._lock:
+            self.calls += 1
+            self.latencies.append(latency)
+        time.sleep(latency * self.FIRST_CHUNK_SHARE)
+        if self._should_fail():
+            raise FakeBackendError("429 Resource has been exhausted (fake backend)")
+        text = self.render(prompt)
+        pieces = [text[i:i + self.STREAM_CHUNK_CHARS] for i in range(0, len(text), self.STREAM_CHUNK_CHARS)]
+        for piece in pieces:
+            yield piece
+            time.sleep(latency * (1 - self.FIRST_CHUNK_SHARE) / len(pieces))
+
+
+class HTTPBackend(LLMBackend):
+    """Yerel sahte model sunucusuna (serve_fake_backend) bağlanan istemci"""
+
+    name = 'http'
+
+    def __init__(self, url: str, model_name: str = 'fake-http', timeout: float = 120):
+        super().__init__(model_name)
+        self.url = url.rstrip('/') + '/generate'
+        self.timeout = timeout
+
+    def generate(self, prompt: str) -> str:
+        return self._post({'prompt': prompt})
+
+    def generate_json(self, prompt: str) -> str:
+        return self._post({'prompt': prompt, 'json': True})
+
+    def _post(self, payload: dict) -> str:
+        import urllib.request
+
+        body = json.dumps(payload).encode('utf-8')
+        request = urllib.request.Request(self.url, data=body, headers={'Content-Type': 'application/json'})
+        # HTTPError.code (429/5xx) hız sınırlayıcıdaki yeniden deneme mantığına olduğu gibi gider
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read().decode('utf-8'))['text']
+
+
+def serve_fake_backend(host: str = '127.0.0.1', port: int = 8765, **fake_options) -> 'ThreadingHTTPServer':
+    """FakeBackend'i HTTP üzerinden sunan sunucuyu oluştur (serve_forever çağrılmalı)"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    backend = FakeBackend(**fake_options)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length).decode('utf-8'))
+            prompt = request.get('prompt', '')
+            generate = backend.generate_json if request.get('json') else backend.generate
+            try:
+                payload, status = {'text': generate(prompt)}, 200
+            except FakeBackendError as e:
+                payload, status = {'error': str(e)}, 429
+            data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.backend = backend
+    return server
+
+
+def create_backend(name: str, config, api_key: Optional[str] = None) -> LLMBackend:
+    """Yapılandırmaya göre arka ucu oluştur"""
+    if name == 'gemini':
+        return GeminiBackend(api_key or config.GEMINI_API_KEY, config.GEMINI_MODEL)
+    if name == 'fake':
+        return FakeBackend(
+            latency_mean=config.FAKE_LATENCY_MEAN,
+            latency_jitter=config.FAKE_LATENCY_JITTER,
+            error_rate=config.FAKE_ERROR_RATE,
+            output_chars=config.FAKE_OUTPUT_CHARS,
+        )
+    if name == 'http':
+        return HTTPBackend(config.FAKE_BACKEND_URL)
+    raise ValueError(f"Bilinmeyen model arka ucu: {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Yük testleri için sahte Gemini sunucusu')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.5, help='Ortalama gecikme (saniye)')
+    parser.add_argument('--jitter', type=float, default=0.2, help='Gecikme yayılımı (saniye)')
+    parser.add_argument('--distribution', choices=['lognormal', 'uniform', 'fixed'], default='lognormal')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='429 döndürme olasılığı')
+    parser.add_argument('--output-chars', type=int, default=1500, help='Yaklaşık yanıt uzunluğu')
+    args = parser.parse_args()
+
+    server = serve_fake_backend(
+        args.host, args.port,
+        latency_mean=args.latency, latency_jitter=args.jitter,
+        latency_distribution=args.distribution, error_rate=args.error_rate,
+        output_chars=args.output_chars,
+    )
+    print(f"🧪 Sahte model sunucusu: http://{args.host}:{args.port}/generate")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
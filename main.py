@@ -5,10 +5,103 @@ Gemini API kullanarak tweet verilerini analiz eden program
 """
 
 import argparse
+import glob
 import sys
 import os
 from pathlib import Path
-from analyzer import TweetAnalyzer
+
+# analyzer, config (dotenv) ve model arka uçları yalnızca gerçek bir analizde içe aktarılır;
+# --help ve hatalı argümanlar cron/betik çağrılarında hızlı döner
+
+INPUT_EXTENSIONS = ('.json', '.jsonl')
+
+def expand_inputs(paths):
+    """Dosya, dizin ve glob argümanlarını sıralı, tekrarsız dosya listesine çevir"""
+    files, missing = [], []
+    for path in paths:
+        if os.path.isdir(path):
+            matches = sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.lower().endswith(INPUT_EXTENSIONS)
+            )
+        elif glob.has_magic(path):
+            matches = sorted(glob.glob(path, recursive=True))
+        elif os.path.exists(path):
+            matches = [path]
+        else:
+            matches = []
+        if not matches:
+            missing.append(path)
+        for match in matches:
+            if os.path.isfile(match) and match not in files:
+                files.append(match)
+    return files, missing
+
+def write_metrics(analyzer, args):
+    """İstenen metrik dosyalarını yaz"""
+    if args.metrics_out:
+        analyzer.telemetry.write_json(args.metrics_out)
+        print(f"📏 Metrikler kaydedildi: {args.metrics_out}")
+    if args.metrics_prom:
+        analyzer.telemetry.write_prometheus(args.metrics_prom)
+        print(f"📏 Prometheus metrikleri kaydedildi: {args.metrics_prom}")
+
+def ingest_files(json_files, store_dir):
+    """Dosyaları yerel depoya ekle ve sayıları yazdır"""
+    from tweet_store import TweetStore
+    
+    store = TweetStore(store_dir)
+    try:
+        for json_file in json_files:
+            result = store.ingest_file(json_file)
+            msg = f"🗄️ {json_file}: {result['added']} yeni, {result['duplicates']} tekrar"
+            if result['skipped']:
+                msg += f", {result['skipped']} geçersiz kayıt"
+            print(msg)
+        stats = store.stats()
+        print(f"🗄️ Depo ({store_dir}): {stats['tweets']} tweet, {len(stats['partitions'])} bölüm, "
+              f"{stats['bytes'] / 1024:.0f} KB")
+    finally:
+        store.close()
+
+def show_runs(args, results_db):
+    """Sonuç veritabanındaki geçmiş çalıştırmaları listele, ara ya da birini göster"""
+    from datetime import datetime
+    from results_store import ResultsStore
+    
+    if not os.path.exists(results_db):
+        print(f"🗃️ Sonuç veritabanı henüz yok: {results_db}")
+        return
+    store = ResultsStore(results_db)
+    try:
+        if args.show_run is not None:
+            run = store.get_run(args.show_run)
+            if run is None:
+                print(f"❌ Hata: Çalıştırma bulunamadı: #{args.show_run}")
+                sys.exit(1)
+            created = datetime.fromtimestamp(run['created_at']).strftime('%Y-%m-%d %H:%M:%S')
+            print(f"🗃️ Çalıştırma #{run['id']} — {run['source']} ({created})")
+            print(f"   {run['tweet_count']} tweet · {run['language']} · {run['model']} · {len(run['results']['chunks'])} parça")
+            if run['mentions']:
+                print("   Geçenler: " + ', '.join(f"{entity} ({count})" for entity, count in list(run['mentions'].items())[:15]))
+            for key, title in (('turkish', 'TÜRKÇE ANALİZ'), ('english', 'ENGLISH ANALYSIS')):
+                if key in run['results']:
+                    print(f"\n{title}\n{'=' * 50}\n{run['results'][key]}")
+            return
+        
+        if args.search_runs:
+            runs = store.search(args.search_runs, limit=args.list_runs or 20)
+        else:
+            runs = store.list_runs(limit=args.list_runs)
+        if not runs:
+            print("🗃️ Eşleşen çalıştırma yok")
+        for run in runs:
+            created = datetime.fromtimestamp(run['created_at']).strftime('%Y-%m-%d %H:%M')
+            print(f"#{run['id']:<5} {created}  {run['source']}  {run['tweet_count']} tweet  {run['language']}  {run['model']}")
+            if run.get('snippet'):
+                print(f"       {' '.join(run['snippet'].split())}")
+    finally:
+        store.close()
 
 def main():
     parser = argparse.ArgumentParser(
@@ -20,12 +113,28 @@ def main():
   python main.py data.json --language turkish          # Sadece Türkçe
   python main.py data.json --language english          # Sadece İngilizce
   python main.py data.json --max-tweets 100            # Maksimum tweet sayısı
+  python main.py data.json --concurrency 8             # 8 paralel istek
+  python main.py data.json --no-cache                  # Önbelleği atla
+  python main.py data.jsonl --watch --interval 300     # Yeni tweet'leri 5 dakikada bir analiz et
+  python main.py data.json --backend fake              # API'siz, sahte modelle deneme
+  python main.py data.json --metrics-out metrics.json  # Aşama süreleri ve çağrı metrikleri
+  python main.py data.json --structured                # Parça başına JSON, yerel birleştirme
+  python main.py data.json --dry-run                   # API'siz plan: istek, token ve süre tahmini
+  python main.py data.json --entity '$ZRO,#layerzero'  # Yalnızca bu varlıkların geçtiği tweet'ler
+  python main.py dumps/                                # Dizindeki tüm .json/.jsonl dosyaları
+  python main.py "dumps/2024-06-*.jsonl" other.json   # Glob ve birden çok dosya, tek havuzda
+  python main.py dumps/ --ingest                       # Dosyaları yerel depoya ekle (tekrarlar atlanır)
+  python main.py --since 6h --match '$ZRO'             # Depodan son 6 saatte $ZRO geçenleri analiz et
+  python main.py --list-runs                           # Son analizleri listele
+  python main.py --search-runs '$ZRO testnet'          # Geçmiş analizlerde ara
+  python main.py --show-run 12                         # Bir analizi göster
         """
     )
     
     parser.add_argument(
         'json_file',
-        help='Analiz edilecek JSON dosyasının yolu'
+        nargs='*',
+        help='Analiz edilecek JSON/JSONL dosyaları, dizinler veya glob desenleri'
     )
     
     parser.add_argument(
@@ -42,44 +151,318 @@ def main():
         help='Maksimum analiz edilecek tweet sayısı (varsayılan: 50)'
     )
     
+    parser.add_argument(
+        '--rpm',
+        type=int,
+        default=None,
+        help='Dakikalık Gemini istek sınırı (varsayılan: GEMINI_RPM veya 15)'
+    )
+    
+    parser.add_argument(
+        '--tpm',
+        type=int,
+        default=None,
+        help='Dakikalık girdi token sınırı (varsayılan: GEMINI_TPM veya 1000000)'
+    )
+    
+    parser.add_argument(
+        '--backend',
+        choices=['gemini', 'fake', 'http'],
+        default=None,
+        help='Model arka ucu: gemini, fake (ağsız sahte model) veya http (yerel sahte sunucu); varsayılan: LLM_BACKEND veya gemini'
+    )
+    
     parser.add_argument(
         '--no-save',
         action='store_true',
-        help='Sonuçları dosyaya kaydetme'
+        help='Sonuçları kaydetme (sonuç veritabanı ve dosyalar)'
     )
     
     parser.add_argument(
         '--chunk-size', '-c',
         type=int,
-        default=10,
-        help='Tweet parça boyutu (varsayılan: 10)'
+        default=None,
+        help='Sabit tweet parça boyutu; verilirse token bütçesi yerine kullanılır'
+    )
+    
+    parser.add_argument(
+        '--chunk-tokens',
+        type=int,
+        default=4000,
+        help='Parça başına token bütçesi (varsayılan: 4000)'
+    )
+    
+    parser.add_argument(
+        '--concurrency', '-j',
+        type=int,
+        default=4,
+        help='Aynı anda yapılacak en fazla Gemini isteği (varsayılan: 4)'
+    )
+    
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Yalnızca son çalıştırmadan sonra eklenen tweet\'leri analiz et'
+    )
+    
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Dosyayı izle ve yeni tweet geldikçe artımlı analiz yap'
+    )
+    
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=60,
+        help='--watch modunda kontrol aralığı, saniye (varsayılan: 60)'
+    )
+    
+    parser.add_argument(
+        '--no-stream',
+        action='store_true',
+        help='Son birleştirmeyi canlı akış yerine tek seferde al'
+    )
+    
+    parser.add_argument(
+        '--no-dedup',
+        action='store_true',
+        help='Yakın kopya tweet elemeyi kapat'
+    )
+    
+    parser.add_argument(
+        '--prompt-format',
+        choices=['compact', 'verbose'],
+        default=None,
+        help='Tweet\'lerin prompt biçimi: compact (tablo, az token) veya verbose (tweet başına etiketli şablon)'
+    )
+    
+    parser.add_argument(
+        '--no-rank',
+        action='store_true',
+        help='Sınır aşılınca alaka sıralaması yerine ilk N tweet\'i al'
+    )
+    
+    parser.add_argument(
+        '--structured',
+        action='store_true',
+        help='Parçalardan JSON iste ve birleştirmeyi model çağrısı olmadan yerelde yap (JSON çıktısı da kaydedilir)'
+    )
+    
+    parser.add_argument(
+        '--entity',
+        action='append',
+        metavar='ENTITY',
+        help="Yalnızca bu varlıklardan birinin geçtiği tweet'leri analiz et: '$ZRO', '#layerzero', '@handle' "
+             "ya da proje adı (tekrarlanabilir, virgülle ayrılabilir)"
+    )
+    
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Model çağrısı yapmadan planı göster: parça, istek ve token sayıları, önbellek ve tahmini süre'
+    )
+    
+    parser.add_argument(
+        '--metrics-out',
+        metavar='PATH',
+        help='Aşama süreleri ve model çağrısı metriklerini JSON olarak yaz'
+    )
+    
+    parser.add_argument(
+        '--metrics-prom',
+        metavar='PATH',
+        help='Aynı metrikleri Prometheus metin biçiminde yaz'
+    )
+    
+    parser.add_argument(
+        '--ingest',
+        action='store_true',
+        help='Girdi dosyalarını yerel tweet deposuna ekle; --since/--match yoksa analiz yapmadan çık'
+    )
+    
+    parser.add_argument(
+        '--since',
+        metavar='WHEN',
+        help='Depodan bu zamandan sonraki tweet\'leri analiz et: 30m, 6h, 2d, 1w veya ISO zaman'
+    )
+    
+    parser.add_argument(
+        '--match',
+        metavar='TEXT',
+        help='Depodan metninde bu terimlerin hepsi geçen tweet\'leri analiz et (örn. \'$ZRO airdrop\')'
+    )
+    
+    parser.add_argument(
+        '--store-dir',
+        default=None,
+        help='Yerel tweet deposu dizini (varsayılan: STORE_DIR veya store)'
+    )
+    
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Aynı kaynak aynı ayarlarla daha önce analiz edilmiş olsa da yeniden analiz et'
+    )
+    
+    parser.add_argument(
+        '--no-export-text',
+        action='store_true',
+        help='Sonuçları yalnızca sonuç veritabanına yaz; her dil için .txt dosyası yazma'
+    )
+    
+    parser.add_argument(
+        '--list-runs',
+        nargs='?',
+        type=int,
+        const=20,
+        metavar='N',
+        help='Sonuç veritabanındaki son N çalıştırmayı listele (varsayılan: 20)'
+    )
+    
+    parser.add_argument(
+        '--search-runs',
+        metavar='QUERY',
+        help='Geçmiş analizlerde ara: $TOKEN/#etiket birebir, diğer kelimeler tam metin'
+    )
+    
+    parser.add_argument(
+        '--show-run',
+        type=int,
+        metavar='ID',
+        help='Bir çalıştırmanın sonuçlarını göster'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Gemini yanıt önbelleğini kullanma'
+    )
+    
+    parser.add_argument(
+        '--cache-dir',
+        default='.cache',
+        help='Yanıt önbelleği dizini (varsayılan: .cache)'
     )
     
     args = parser.parse_args()
+    store_query = bool(args.since or args.match)
     
-    # Dosya kontrolü
-    if not os.path.exists(args.json_file):
-        print(f"❌ Hata: Dosya bulunamadı: {args.json_file}")
-        sys.exit(1)
+    # Geçmiş sorguları model ve girdi dosyası gerektirmez
+    if args.list_runs is not None or args.search_runs or args.show_run is not None:
+        from config import Config
+        show_runs(args, Config.RESULTS_DB)
+        return
+    
+    # Dosya kontrolü (izleme modunda dosya sonradan oluşabilir)
+    if not args.json_file:
+        if not store_query:
+            parser.error('en az bir dosya ya da --since/--match ile depo seçimi gerekli')
+        json_files = []
+    elif store_query and not args.ingest:
+        parser.error('--since/--match depodan seçer; dosyaları birlikte vermek için --ingest kullanın')
+    elif args.watch:
+        if len(args.json_file) != 1:
+            print("❌ Hata: --watch tek bir dosyayla kullanılabilir")
+            sys.exit(1)
+        json_files = args.json_file
+    else:
+        json_files, missing = expand_inputs(args.json_file)
+        if missing:
+            print(f"❌ Hata: Dosya bulunamadı: {', '.join(missing)}")
+            sys.exit(1)
+    
+    # .env burada yüklenir
+    from config import Config
+    
+    args.backend = args.backend or Config.LLM_BACKEND
+    store_dir = args.store_dir or Config.STORE_DIR
     
-    # API anahtarı kontrolü
-    if not os.getenv('GEMINI_API_KEY'):
+    if args.since:
+        from tweet_store import parse_since
+        try:
+            parse_since(args.since)
+        except ValueError as e:
+            print(f"❌ Hata: {e}")
+            sys.exit(1)
+    
+    # Depoya ekleme model gerektirmez; API anahtarı kontrolünden önce yapılır
+    if args.ingest:
+        ingest_files(json_files, store_dir)
+        if not store_query:
+            return
+        json_files = []
+    
+    # API anahtarı kontrolü (sahte arka uçlar ve kuru çalıştırma anahtar gerektirmez)
+    if args.backend == 'gemini' and not args.dry_run and not os.getenv('GEMINI_API_KEY'):
         print("❌ Hata: GEMINI_API_KEY çevre değişkeni bulunamadı!")
         print("Lütfen .env dosyasını oluşturun ve API anahtarınızı ekleyin:")
         print("GEMINI_API_KEY=your_api_key_here")
         sys.exit(1)
     
+    from analyzer import TweetAnalyzer
+    from llm_backends import create_backend
+    
+    analyzer = None
     try:
         # Analyzer'ı başlat
-        analyzer = TweetAnalyzer()
+        backend = None
+        if args.backend != 'gemini' or args.dry_run:
+            # Gemini SDK'sı ilk çağrıda yüklenir; kuru çalıştırmada hiç yüklenmez
+            backend = create_backend(args.backend, Config())
+        analyzer = TweetAnalyzer(backend=backend)
         
         # Ayarları güncelle
         analyzer.config.MAX_TWEETS_PER_ANALYSIS = args.max_tweets
-        analyzer.config.CHUNK_SIZE = args.chunk_size
+        analyzer.config.CHUNK_TOKEN_BUDGET = args.chunk_tokens
+        if args.chunk_size:
+            analyzer.config.CHUNKING_MODE = 'count'
+            analyzer.config.CHUNK_SIZE = args.chunk_size
+        analyzer.config.MAX_CONCURRENT_REQUESTS = args.concurrency
+        if args.rpm is not None:
+            analyzer.config.RATE_LIMIT_RPM = args.rpm
+        if args.tpm is not None:
+            analyzer.config.RATE_LIMIT_TPM = args.tpm
         analyzer.config.SAVE_RESULTS = not args.no_save
+        analyzer.config.REUSE_PREVIOUS_RUNS = not args.force
+        if args.no_export_text:
+            analyzer.config.EXPORT_TEXT_FILES = False
+        analyzer.config.DEDUP_ENABLED = not args.no_dedup
+        analyzer.config.RANKING_ENABLED = not args.no_rank
+        if args.prompt_format:
+            analyzer.config.PROMPT_FORMAT = args.prompt_format
+        if args.structured:
+            analyzer.config.STRUCTURED_OUTPUT = True
+        if args.entity:
+            analyzer.config.ENTITY_FILTER = args.entity
+        analyzer.config.STREAM_OUTPUT = not args.no_stream
+        analyzer.config.CACHE_ENABLED = not args.no_cache
+        analyzer.config.CACHE_DIR = args.cache_dir
         
         # Analizi başlat
-        analyzer.analyze_file(args.json_file, args.language)
+        if store_query:
+            from tweet_store import TweetStore
+            
+            store = TweetStore(store_dir)
+            try:
+                if args.dry_run:
+                    analyzer.plan_store(store, args.language, args.since, args.match)
+                else:
+                    analyzer.analyze_store(store, args.language, args.since, args.match)
+            finally:
+                store.close()
+        elif args.dry_run:
+            for json_file in json_files:
+                analyzer.plan_file(json_file, args.language)
+        elif args.watch:
+            analyzer.watch_file(json_files[0], args.language, args.interval)
+        elif args.incremental:
+            for json_file in json_files:
+                analyzer.analyze_incremental(json_file, args.language)
+        elif len(json_files) > 1:
+            analyzer.analyze_batch(json_files, args.language)
+        else:
+            analyzer.analyze_file(json_files[0], args.language)
         
     except KeyboardInterrupt:
         print("\n⚠️ Analiz kullanıcı tarafından durduruldu.")
@@ -87,6 +470,9 @@ def main():
     except Exception as e:
         print(f"❌ Beklenmeyen hata: {str(e)}")
         sys.exit(1)
+    finally:
+        if analyzer:
+            write_metrics(analyzer, args)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
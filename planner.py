@@ -0,0 +1,182 @@
+"""
+Ön planlama (dry run).
+Analizin yapacağı tüm parça prompt'ları yerelde oluşturulur ve token'ları sayılır; parça sayısı,
+birleştirme ağacının derinliği, dil başına istek sayısı, önbellekten dönecek çağrılar ve
+eşzamanlılık ile hız sınırları altında tahmini süre hesaplanır. Hiç model çağrısı yapılmaz.
+
+Birleştirme prompt'ları parça yanıtlarına bağlıdır: girdilerinin tümü önbellekte olan
+birleştirmeler gerçek metinle kurulur ve önbellekte aranır, diğerleri PLAN_OUTPUT_TOKENS
+tahminiyle boyutlandırılır. Süre, çağrılar gerçek zamanlayıcının token kovalarıyla sanal bir
+saat üzerinde sıraya konarak bulunur; parça aşaması ve her birleştirme seviyesi bir öncekinin
+bitmesini bekler.
+"""
+
+import heapq
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from llm_backends import GeminiBackend
+from rate_limiter import TokenBucket
+from tokens import estimate_tokens
+
+# (prompt token'ı, yanıt token'ı, önbellekte mi)
+Call = Tuple[int, int, bool]
+
+TASK_NAMES = {
+    'turkish': 'Türkçe',
+    'english': 'İngilizce',
+    'both': 'Türkçe + İngilizce',
+    'structured': 'Yapılandırılmış (JSON)',
+}
+
+
+def simulate(phases: List[List[Call]], latency, concurrency: int,
+             requests_per_minute: float, tokens_per_minute: float) -> Tuple[float, float]:
+    """
+    Önbellekte olmayan çağrıları `concurrency` işçiye ve dakikalık sınırlara göre sanal saatte
+    çalıştır; toplam süreyi ve hız sınırında beklenen süreyi döndür.
+    """
+    request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+    token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+    for bucket in (request_bucket, token_bucket):
+        if bucket:
+            bucket.updated = 0.0
+
+    clock = throttled = 0.0
+    for phase in phases:
+        calls = [call for call in phase if not call[2]]
+        if not calls:
+            continue
+        # Hız sınırı beklemesi istek slotu tutulurken yapılır; işçi o süre boyunca meşgul kalır
+        workers = [clock] * min(max(1, concurrency), len(calls))
+        end = clock
+        for prompt_tokens, output_tokens, _ in calls:
+            start = heapq.heappop(workers)
+            wait = 0.0
+            if request_bucket:
+                wait = max(wait, request_bucket.reserve(1, now=start))
+            if token_bucket and prompt_tokens:
+                wait = max(wait, token_bucket.reserve(prompt_tokens, now=start))
+            throttled += wait
+            finish = start + wait + latency(output_tokens)
+            heapq.heappush(workers, finish)
+            end = max(end, finish)
+        clock = end
+    return clock, throttled
+
+
+def _merge_levels(analyzer, cache, task: str, outputs: List[Any], output_tokens: int) -> List[List[Call]]:
+    """
+    Birleştirme ağacını seviye seviye kur. `outputs` önbellekteki parça yanıtları (yoksa None);
+    girdileri bilinen birleştirmelerin prompt'u birebir kurulup önbellekte aranır.
+    """
+    fan_in = max(2, analyzer.config.COMBINE_FAN_IN)
+    model_name = analyzer.model.model_name
+    overhead = estimate_tokens(analyzer.merge_prompt([], task))
+    # Birleştirmenin girdileri bir önceki seviyenin yanıtlarıdır
+    input_tokens = output_tokens
+
+    levels = []
+    level = list(outputs)
+    while len(level) > 1:
+        calls, next_level = [], []
+        for i in range(0, len(level), fan_in):
+            group = level[i:i + fan_in]
+            if len(group) == 1:
+                next_level.append(group[0])
+                continue
+            response = None
+            if all(output is not None for output in group):
+                prompt = analyzer.merge_prompt(group, task)
+                prompt_tokens = estimate_tokens(prompt)
+                response = cache.peek(model_name, prompt) if cache else None
+                if response is not None and task == 'both':
+                    response = analyzer.split_bilingual_response(response)
+            else:
+                prompt_tokens = overhead + len(group) * input_tokens
+            calls.append((prompt_tokens, output_tokens, response is not None))
+            next_level.append(response)
+        levels.append(calls)
+        level = next_level
+    return levels
+
+
+def build_plan(analyzer, tweets: List[Dict[str, Any]], language: str = 'both',
+               source_hash: Optional[str] = None) -> Dict[str, Any]:
+    """Analizin model çağrısı yapmadan çıkarılan planı: parçalar, çağrılar, token'lar ve süre"""
+    config = analyzer.config
+    cache = analyzer.get_cache()
+    model_name = analyzer.model.model_name
+
+    started = time.perf_counter()
+    chunks = analyzer.prepare_chunks(tweets) if tweets else []
+    formatted = [analyzer.format_tweets_for_analysis(chunk) for chunk in chunks]
+    tasks = analyzer.chunk_tasks(language)
+
+    rows, phases = [], [[]]
+    for task in tasks:
+        # Tek dilli yanıtın iki katı: iki dilli parça ya da her metni iki dilde olan JSON
+        output_tokens = config.PLAN_OUTPUT_TOKENS * (
+            2 if task == 'both' or (task == 'structured' and language == 'both') else 1)
+        chunk_calls, outputs = [], []
+        for text in formatted:
+            prompt = analyzer.chunk_prompt(text, task, language)
+            response = cache.peek(model_name, prompt) if cache else None
+            if response is not None and task == 'both':
+                response = analyzer.split_bilingual_response(response)
+            chunk_calls.append((estimate_tokens(prompt), output_tokens, response is not None))
+            outputs.append(response)
+        # Yapılandırılmış modda birleştirme yereldir
+        levels = [] if task == 'structured' else _merge_levels(analyzer, cache, task, outputs, output_tokens)
+
+        phases[0].extend(chunk_calls)
+        for depth, calls in enumerate(levels, 1):
+            if len(phases) <= depth:
+                phases.append([])
+            phases[depth].extend(calls)
+        calls = chunk_calls + [call for level in levels for call in level]
+        rows.append({
+            'task': task,
+            'chunk_calls': len(chunk_calls),
+            'merge_calls': [len(level) for level in levels],
+            'depth': len(levels),
+            'calls': len(calls),
+            'cached': sum(1 for call in calls if call[2]),
+            'prompt_tokens': sum(call[0] for call in calls),
+            'chunk_prompt_tokens': [call[0] for call in chunk_calls],
+        })
+    prep_seconds = time.perf_counter() - started
+
+    if isinstance(analyzer.model, GeminiBackend):
+        latency = lambda output_tokens: (config.PLAN_CALL_BASE_SECONDS
+                                         + output_tokens / config.PLAN_OUTPUT_TOKENS_PER_SECOND)
+    else:
+        # Sahte arka uçlar yanıt boyundan bağımsız, ortalama gecikmeyle yanıt verir
+        latency = lambda output_tokens: config.FAKE_LATENCY_MEAN
+    wall_seconds, throttle_seconds = simulate(
+        phases, latency, config.MAX_CONCURRENT_REQUESTS, config.RATE_LIMIT_RPM, config.RATE_LIMIT_TPM
+    )
+
+    previous = analyzer.find_previous_run(source_hash, language) if source_hash else None
+    calls = sum(row['calls'] for row in rows)
+    cached = sum(row['cached'] for row in rows)
+    return {
+        'model': model_name,
+        'language': language,
+        'tweets': len(tweets),
+        'selected': sum(len(chunk) for chunk in chunks),
+        'chunks': len(chunks),
+        'tasks': rows,
+        'calls': calls,
+        'cached': cached,
+        'api_calls': calls - cached,
+        'prompt_tokens': sum(row['prompt_tokens'] for row in rows),
+        'api_prompt_tokens': sum(call[0] for phase in phases for call in phase if not call[2]),
+        'concurrency': config.MAX_CONCURRENT_REQUESTS,
+        'rpm': config.RATE_LIMIT_RPM,
+        'tpm': config.RATE_LIMIT_TPM,
+        'prep_seconds': prep_seconds,
+        'throttle_seconds': throttle_seconds,
+        'wall_seconds': prep_seconds + wall_seconds,
+        'previous_run': previous['id'] if previous else None,
+    }
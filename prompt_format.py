@@ -0,0 +1,105 @@
+"""
+Token tasarruflu tweet biçimi.
+Ayrıntılı şablon her tweet için "Kullanıcı:/Zaman:/Metin:" etiketlerini, tam ISO zamanı ve
+`---` ayraçlarını tekrarlar. Kompakt biçimde sütun başlığı bir kez yazılır; her tweet tek
+satırdır, tekrar eden kullanıcılar kısa takma adlarla, zamanlar parçadaki en yeni tweet'e
+göre göreli olarak verilir. Metinlerde URL'ler alan adına, emoji dizileri tek emojiye,
+hashtag duvarları ilk birkaç etikete indirilir ve boşluklar sadeleştirilir.
+"""
+
+import re
+import textwrap
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from incremental import parse_time
+
+MAX_HASHTAGS = 3
+UNKNOWN_AGE = '?'
+# Bağlantı kısaltıcıların alan adı bilgi taşımaz
+SHORTENERS = {'t.co', 'bit.ly', 'tinyurl.com', 'ow.ly', 'buff.ly'}
+
+URL_RE = re.compile(r'https?://(?:www\.)?([^/\s]+)\S*')
+EMOJI = '[\U0001F000-\U0001FAFF\u2600-\u27BF\u2B00-\u2BFF]'
+# Emoji dizisi: ilk emoji kalır; ardından gelen emojiler, ten rengi, ZWJ ve varyasyon seçiciler atılır
+EMOJI_RUN_RE = re.compile(f'({EMOJI})(?:[\\ufe0f\\u200d\\U0001F3FB-\\U0001F3FF]|\\s*{EMOJI})*')
+HASHTAG_WALL_RE = re.compile(r'(?:#\w+\s*){%d,}' % (MAX_HASHTAGS + 1))
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _link(match: re.Match) -> str:
+    domain = match.group(1).lower()
+    return '<link>' if domain in SHORTENERS else f'<{domain}>'
+
+
+def _hashtag_wall(match: re.Match) -> str:
+    tags = match.group(0).split()
+    return ' '.join(tags[:MAX_HASHTAGS]) + f' +{len(tags) - MAX_HASHTAGS}# '
+
+
+def compact_text(text: str) -> str:
+    """Tweet metnini anlamını koruyarak kısalt"""
+    text = URL_RE.sub(_link, text)
+    text = EMOJI_RUN_RE.sub(r'\1', text)
+    text = HASHTAG_WALL_RE.sub(_hashtag_wall, text)
+    # Sütun ayracı metinde geçerse satır yapısı bozulmasın
+    return WHITESPACE_RE.sub(' ', text).replace('|', '/').strip()
+
+
+def relative_age(seconds: Optional[float]) -> str:
+    """Saniye cinsinden yaşı kısa gösterime çevir: 45m, 6h, 3d"""
+    if seconds is None:
+        return UNKNOWN_AGE
+    minutes = max(0, int(seconds // 60))
+    if minutes < 60:
+        return f'{minutes}m'
+    if minutes < 48 * 60:
+        return f'{minutes // 60}h'
+    return f'{minutes // (24 * 60)}d'
+
+
+def compact_row(index: int, user: str, age: str, tweet: Dict[str, Any]) -> str:
+    row = f"{index}|{user}|{age}|{compact_text(tweet.get('text') or '')}"
+    if tweet.get('duplicate_count', 1) > 1:
+        row += f" ×{tweet['duplicate_count']}"
+    return row
+
+
+def compact_header(newest: Optional[float]) -> str:
+    """Sütunları ve göreli zamanın referansını açıklayan tek başlık satırı"""
+    if newest is None:
+        reference = 'unknown'
+    else:
+        reference = 'before ' + datetime.fromtimestamp(newest, tz=timezone.utc).strftime('%Y-%m-%d %H:%M UTC')
+    return f'n|user|age|text (age: {reference}; ×N: N similar tweets)'
+
+
+def format_compact(tweets: List[Dict[str, Any]]) -> str:
+    """Tweet'leri başlığı bir kez yazılan tablo biçiminde formatla"""
+    moments = [parse_time(tweet.get('timestamp')) for tweet in tweets]
+    known = [moment for moment in moments if moment is not None]
+    newest = max(known) if known else None
+
+    # Yalnızca birden çok tweet'i olan kullanıcılar takma ad alır; tek seferlikte ad daha kısa
+    counts: Dict[str, int] = {}
+    for tweet in tweets:
+        name = tweet.get('username') or 'Bilinmeyen'
+        counts[name] = counts.get(name, 0) + 1
+    aliases = {
+        name: f'u{i}'
+        for i, name in enumerate((name for name, count in counts.items() if count > 1), 1)
+    }
+
+    lines = [compact_header(newest)]
+    if aliases:
+        lines.append('users: ' + ' '.join(f'{alias}={name}' for name, alias in aliases.items()))
+    for i, (tweet, moment) in enumerate(zip(tweets, moments), 1):
+        name = tweet.get('username') or 'Bilinmeyen'
+        age = relative_age(newest - moment if moment is not None and newest is not None else None)
+        lines.append(compact_row(i, aliases.get(name, name), age, tweet))
+    return '\n'.join(lines)
+
+
+def compact_template(template: str) -> str:
+    """Prompt şablonundaki satır başı girintisini kaldır"""
+    return textwrap.dedent(template).strip()
@@ -0,0 +1,223 @@
+"""
+Alaka puanına göre tweet seçimi.
+Tweet sayısı sınırı aştığında ilk N tweet yerine en bilgilendirici olanlar gönderilir. Puan;
+cashtag/hashtag ve airdrop anahtar kelimeleri, tarih/APY/dolar gibi sayısal sinyaller, tekrar
+sayısı ve yenilikten oluşur. Aynı kullanıcının her ek tweet'i azalan ağırlıkla sayılır.
+
+Metinler tek bir bayt dizisinde birleştirilir. Tek karakterle başlayan sinyaller ($, #, %,
+tarih ayraçları) numpy maskeleriyle, anahtar kelimeler 2 baytlık önek tablosuyla bulunur;
+eşleşme ofsetleri tweet'lere `searchsorted` ile dağıtılır. Böylece milyonlarca tweet Python
+döngüsü olmadan puanlanır.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+SEPARATOR = b'\0'
+DEFAULT_HALF_LIFE_HOURS = 24.0
+DEFAULT_USER_DECAY = 0.5
+SHORT_TEXT_CHARS = 40
+
+KEYWORDS = (
+    'airdrop', 'testnet', 'mainnet', 'snapshot', 'claim', 'whitelist', 'presale', 'tge',
+    'listing', 'launch', 'staking', 'stake', 'points', 'mint', 'bridge', 'farming', 'quest',
+    'eligible', 'deadline', 'unlock', 'vesting', 'ödül', 'çekiliş', 'listeleme', 'kazan', 'quests',
+)
+APY_WORDS = ('apy', 'apr')
+CURRENCY_WORDS = ('usd', 'dolar', 'dollar')  # usdt/usdc 'usd' ile sayılır
+
+WORD_LISTS = {'keyword': KEYWORDS, 'apy': APY_WORDS, 'amount': CURRENCY_WORDS}
+# Kelimeler kelime başında eşleşir ve ek alabilir (claimed, airdrops, ödülü, usdt); bunlar ise
+# yalnızca tam kelime olarak sayılır (april, question, together eşleşmesin)
+WHOLE_WORDS = frozenset({'tge', 'apy', 'apr', 'quest', 'quests'})
+BLOCK_BYTES = 1 << 24  # Önek kodları bu büyüklükte bloklarla hesaplanır (bellek sınırı)
+
+# Aynı türden birden çok eşleşmenin katkısı `cap` ile sınırlanır (spam etiket listeleri öne çıkmasın)
+WEIGHTS = {
+    'cashtag': (1.5, 3),
+    'hashtag': (0.5, 3),
+    'keyword': (2.0, 3),
+    'date': (1.0, 2),
+    'apy': (1.5, 2),
+    'amount': (1.5, 2),
+}
+DUPLICATE_WEIGHT = 0.5
+RECENCY_WEIGHT = 2.0
+SHORT_TEXT_PENALTY = 1.0
+
+
+def _shift(mask: np.ndarray, offset: int) -> np.ndarray:
+    """mask[i + offset] değerini i konumuna taşı (taşan uçlar False)"""
+    shifted = np.zeros_like(mask)
+    if offset > 0:
+        shifted[:-offset] = mask[offset:]
+    else:
+        shifted[-offset:] = mask[:offset]
+    return shifted
+
+
+def find_words(data: np.ndarray, word_lists: Dict[str, tuple], word: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Her listedeki kelimelerin başladığı konumlar.
+    Adaylar 2 baytlık önek tablosuyla tek geçişte bulunur, kalan baytlar yalnızca adaylarda
+    karşılaştırılır; `data` en uzun kelimeden bir bayt fazla sıfırla doldurulmuş olmalıdır. `word` kelime
+    karakteri maskesidir: eşleşme kelime ortasında başlayamaz (disclaimer içinde claim yok),
+    WHOLE_WORDS kelimeden sonra da kelime karakteri gelemez. Bir listede bir kelime diğerinin
+    önekiyse (usd/usdt) aynı konum iki kez sayılır, listeler buna göre seçilir.
+    """
+    table = np.zeros(1 << 16, dtype=bool)
+    encoded = {name: [word.encode('utf-8') for word in words] for name, words in word_lists.items()}
+    for words in encoded.values():
+        for encoded_word in words:
+            table[encoded_word[0] | encoded_word[1] << 8] = True
+
+    candidates = []
+    for start in range(0, len(data) - 1, BLOCK_BYTES):
+        block = data[start:start + BLOCK_BYTES + 1]
+        codes = block[:-1].astype(np.uint16) | (block[1:].astype(np.uint16) << np.uint16(8))
+        candidates.append(np.flatnonzero(table[codes]) + start)
+    candidates = np.concatenate(candidates) if candidates else np.zeros(0, dtype=np.int64)
+    candidates = candidates[(candidates == 0) | ~word[candidates - 1]]
+    first, second = data[candidates], data[candidates + 1]
+
+    found = {}
+    for name, words in encoded.items():
+        matches = []
+        for text, encoded_word in zip(word_lists[name], words):
+            positions = candidates[(first == encoded_word[0]) & (second == encoded_word[1])]
+            for k in range(2, len(encoded_word)):
+                positions = positions[data[positions + k] == encoded_word[k]]
+            if text in WHOLE_WORDS:
+                positions = positions[~word[positions + len(encoded_word)]]
+            matches.append(positions)
+        found[name] = np.concatenate(matches)
+    return found
+
+
+def count_matches(texts: List[str]) -> Dict[str, np.ndarray]:
+    """Her sinyal için tweet başına eşleşme sayısı"""
+    # Baytlarda .lower() yalnızca ASCII'yi küçültür; ÖDÜL/ÇEKİLİŞ için metin önce casefold edilir.
+    # 'İ' casefold'da birleşik nokta bırakır, Türkçe küçük 'i'ye çevrilir.
+    encoded = [text.replace('İ', 'i').casefold().encode('utf-8') for text in texts]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    # Her metnin ayraç dahil bitiş ofseti; eşleşme hangi aralıkta başlıyorsa o tweet'e aittir
+    ends = np.cumsum(lengths + 1)
+    longest = max(len(word.encode('utf-8')) for words in WORD_LISTS.values() for word in words)
+    corpus = SEPARATOR.join(encoded) + SEPARATOR * (longest + 1)
+    data = np.frombuffer(corpus, dtype=np.uint8)
+
+    digit = (data >= ord('0')) & (data <= ord('9'))
+    letter = (data >= ord('a')) & (data <= ord('z'))
+    word = digit | letter | (data == ord('_'))
+    # İki baytlık UTF-8 karakterler (ç, ğ, ö, ş, ü, é...) harf sayılır; emoji ve simgeler sayılmaz
+    latin_lead = (data >= 0xC2) & (data <= 0xDF)
+    text_word = word | latin_lead | _shift(latin_lead, -1)
+    dollar = data == ord('$')
+    separator = (data == ord('.')) | (data == ord('/')) | (data == ord('-'))
+    # 12.06.2024 ve 2024-06-01 gibi üç sayılı tarihler; 1.5 gibi ondalıklar sayılmaz
+    number_separator = separator & _shift(digit, -1) & _shift(digit, 1)
+
+    masks = {
+        'cashtag': dollar & _shift(letter, 1) & ~_shift(word, -1),
+        'hashtag': (data == ord('#')) & _shift(word, 1),
+        'date': number_separator & (_shift(number_separator, 2) | _shift(number_separator, 3)),
+        'apy': (data == ord('%')) & _shift(digit, -1),
+        'amount': dollar & (_shift(digit, 1) | ((_shift(data, 1) == ord(' ')) & _shift(digit, 2))),
+    }
+    positions = {name: np.flatnonzero(mask) for name, mask in masks.items()}
+    for name, found in find_words(data, WORD_LISTS, text_word).items():
+        positions[name] = np.concatenate((positions[name], found)) if name in positions else found
+
+    counts = {
+        name: np.bincount(np.searchsorted(ends, found, side='right'), minlength=len(texts))[:len(texts)]
+        for name, found in positions.items()
+    }
+    counts['chars'] = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    return counts
+
+
+def timestamp_seconds(timestamps: List[Optional[str]]) -> np.ndarray:
+    """
+    Zamanların Unix saniyesi (okunamayanlar NaN).
+    Saniye hassasiyeti yeterli olduğundan UTC ISO zamanlarının (scraper 'Z' yazar) ilk 19 karakteri
+    numpy ile okunur. Saat dilimi farkı (+03:00) taşıyan ya da numpy'ın okuyamadığı biçimler varsa
+    tamamı pandas'ın ISO 8601 ayrıştırıcısıyla UTC'ye çevrilir.
+    """
+    try:
+        values = [value or 'NaT' for value in timestamps]
+        # Kesirli saniyeden sonra kalan kısım saat dilimidir
+        if not {value[19:].lstrip('.0123456789') for value in values} <= {'', 'Z'}:
+            raise ValueError("saat dilimi farkı")
+        moments = np.array([value[:19] for value in values], dtype='datetime64[s]')
+        seconds = moments.astype(np.float64)
+        seconds[np.isnat(moments)] = np.nan
+    except (TypeError, ValueError):
+        import pandas as pd  # pandas yalnızca gerektiğinde yüklenir
+
+        parsed = pd.to_datetime(pd.Series(timestamps, dtype=object), utc=True, errors='coerce', format='ISO8601')
+        seconds = (parsed - pd.Timestamp(0, tz='UTC')).dt.total_seconds().to_numpy(dtype=np.float64)
+    return seconds
+
+
+def recency_scores(timestamps: List[Optional[str]], half_life_hours: float) -> np.ndarray:
+    """En yeni tweet'e göre yarı ömürle azalan 0-1 arası yenilik puanı (zamanı olmayanlar 0)"""
+    seconds = timestamp_seconds(timestamps)
+    valid = ~np.isnan(seconds)
+    scores = np.zeros(len(seconds))
+    if valid.any():
+        age_hours = (seconds[valid].max() - seconds[valid]) / 3600
+        scores[valid] = np.exp2(-age_hours / half_life_hours)
+    return scores
+
+
+def score_tweets(tweets: List[Dict[str, Any]],
+                 half_life_hours: float = DEFAULT_HALF_LIFE_HOURS) -> np.ndarray:
+    """Her tweet için alaka puanı"""
+    if not tweets:
+        return np.zeros(0)
+
+    counts = count_matches([tweet.get('text') or '' for tweet in tweets])
+    scores = np.zeros(len(tweets))
+    for name, (weight, cap) in WEIGHTS.items():
+        scores += weight * np.minimum(counts[name], cap)
+    scores -= SHORT_TEXT_PENALTY * (counts['chars'] < SHORT_TEXT_CHARS)
+
+    # Yakın kopya elemesinden gelen tekrar sayısı, konunun ne kadar yayıldığını gösterir
+    duplicates = np.fromiter((tweet.get('duplicate_count', 1) for tweet in tweets), dtype=np.float64, count=len(tweets))
+    scores += DUPLICATE_WEIGHT * np.log2(np.maximum(duplicates, 1))
+
+    scores += RECENCY_WEIGHT * recency_scores([tweet.get('timestamp') for tweet in tweets], half_life_hours)
+    return scores
+
+
+def diversify(scores: np.ndarray, users: List[Optional[str]], decay: float = DEFAULT_USER_DECAY) -> np.ndarray:
+    """Kullanıcının k. en iyi tweet'inin puanını decay**k ile çarp"""
+    _, codes = np.unique(np.array(users, dtype=object).astype(str), return_inverse=True)
+    # Kullanıcıya, sonra azalan puana göre sırala; grup içi sıra = konum - grubun başlangıcı
+    order = np.lexsort((-scores, codes))
+    sorted_codes = codes[order]
+    group_start = np.r_[0, np.flatnonzero(np.diff(sorted_codes)) + 1]
+    ranks = np.empty(len(scores), dtype=np.int64)
+    ranks[order] = np.arange(len(scores)) - np.repeat(group_start, np.diff(np.r_[group_start, len(scores)]))
+    # Negatif puanlar da kullanıcı sırasıyla düşmeli
+    shifted = scores - scores.min() + 1 if len(scores) else scores
+    return shifted * np.power(decay, ranks)
+
+
+def select_top_tweets(tweets: List[Dict[str, Any]], limit: int,
+                      half_life_hours: float = DEFAULT_HALF_LIFE_HOURS,
+                      user_decay: float = DEFAULT_USER_DECAY) -> List[Dict[str, Any]]:
+    """
+    En yüksek puanlı `limit` tweet'i seç.
+    Seçilenler kaynak sıralarını korur; böylece parçalar zaman akışını bozmaz.
+    """
+    if limit <= 0:
+        return []
+    if len(tweets) <= limit:
+        return list(tweets)
+
+    scores = score_tweets(tweets, half_life_hours)
+    adjusted = diversify(scores, [tweet.get('username') for tweet in tweets], user_decay)
+    top = np.argpartition(-adjusted, limit - 1)[:limit]
+    return [tweets[i] for i in np.sort(top)]
@@ -0,0 +1,132 @@
+"""
+Gemini istekleri için istemci tarafı hız sınırlayıcı.
+Dakikalık istek (RPM) ve token (TPM) kovaları ile geçici hatalarda (429, 5xx, zaman aşımı)
+jitter'lı üstel geri çekilmeyle yeniden deneme yapar.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+TRANSIENT_MARKERS = ('429', 'resource exhausted', 'resource_exhausted', 'rate limit',
+                     'unavailable', 'deadline', 'timed out', 'timeout', 'temporarily')
+# Günlük kota dolduğunda da 429 döner; beklemek gün bitmeden işe yaramaz, hemen hata verilir
+DAILY_QUOTA_MARKERS = ('per day', 'perday', 'daily')
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Hata yeniden denemeye değer mi (dakikalık sınır, sunucu hatası, zaman aşımı; günlük kota değil)"""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    message = str(error).lower()
+    if any(marker in message for marker in DAILY_QUOTA_MARKERS):
+        return False
+    code = getattr(error, 'code', None)
+    if callable(code):
+        try:
+            code = code()
+        except Exception:
+            code = None
+    code = getattr(code, 'value', code)  # grpc.StatusCode gibi enum'lar
+    if isinstance(code, tuple):
+        code = code[0]
+    if isinstance(code, int) and code in TRANSIENT_STATUS_CODES:
+        return True
+    return any(marker in message for marker in TRANSIENT_MARKERS)
+
+
+class TokenBucket:
+    """Dakikalık hızla dolan, rezervasyon tabanlı token kovası"""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float, now: Optional[float] = None) -> float:
+        """
+        `amount` kadar token ayır ve kullanılabilir olana kadar beklenmesi gereken süreyi döndür.
+        `now` verilirse gerçek saat yerine o an kullanılır (planlayıcının sanal zamanı).
+        """
+        with self._lock:
+            now = time.monotonic() if now is None else now
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Eksiye düşmek, sıradaki çağıranların da adil biçimde beklemesini sağlar
+            self.tokens -= amount
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class RequestScheduler:
+    """Tüm Gemini çağrılarının geçtiği ortak zamanlayıcı"""
+
+    def __init__(self, requests_per_minute: float = 15, tokens_per_minute: float = 1_000_000,
+                 max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0):
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.throttle_seconds = 0.0
+        self.failures = 0
+
+    def _throttle(self, tokens: int):
+        wait = 0.0
+        if self.request_bucket:
+            wait = max(wait, self.request_bucket.reserve(1))
+        if self.token_bucket and tokens:
+            wait = max(wait, self.token_bucket.reserve(tokens))
+        if wait > 0:
+            with self._lock:
+                self.throttled += 1
+                self.throttle_seconds += wait
+            time.sleep(wait)
+
+    def _backoff_delay(self, attempt: int, error: Exception) -> float:
+        # Sunucu Retry-After bildirdiyse ona uy, yoksa tam jitter'lı üstel geri çekilme
+        retry_after = getattr(error, 'retry_after', None)
+        if isinstance(retry_after, (int, float)) and retry_after > 0:
+            return min(self.max_delay, float(retry_after))
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def call(self, func: Callable[[], Any], tokens: int = 0) -> Tuple[Any, int]:
+        """`func`'ı hız sınırları içinde çalıştır; (sonuç, yeniden deneme sayısı) döndür"""
+        attempt = 0
+        while True:
+            self._throttle(tokens)
+            with self._lock:
+                self.requests += 1
+            try:
+                return func(), attempt
+            except Exception as e:
+                if attempt >= self.max_retries or not is_transient_error(e):
+                    with self._lock:
+                        self.failures += 1
+                    raise
+                delay = self._backoff_delay(attempt, e)
+                with self._lock:
+                    self.retries += 1
+                attempt += 1
+                time.sleep(delay)
+
+    def stats(self) -> Dict[str, float]:
+        """İstek, yeniden deneme ve kısıtlama sayaçları"""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'retries': self.retries,
+                'throttled': self.throttled,
+                'throttle_seconds': round(self.throttle_seconds, 3),
+                'failures': self.failures,
+            }
@@ -0,0 +1,145 @@
+"""
+Gemini yanıtları için diskte kalıcı, içerik adresli önbellek.
+Anahtar: model adı + prompt'un SHA-256 özeti. Boyut ve TTL sınırlı LRU tahliyesi yapar.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+class ResponseCache:
+    """SQLite tabanlı, boyut/TTL sınırlı LRU yanıt önbelleği"""
+
+    def __init__(self, cache_dir: str, max_bytes: int = 100 * 1024 * 1024,
+                 ttl_seconds: Optional[float] = 7 * 24 * 3600):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, 'responses.sqlite')
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)')
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, prompt: str) -> str:
+        """Model adı ve prompt'tan önbellek anahtarı üret"""
+        digest = hashlib.sha256()
+        digest.update(model.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(prompt.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, model: str, prompt: str) -> Optional[str]:
+        """Önbellekteki yanıtı döndür, yoksa veya süresi dolduysa None"""
+        key = self.make_key(model, prompt)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT response, created_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                self._delete(key)
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE responses SET last_access = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def peek(self, model: str, prompt: str) -> Optional[str]:
+        """Sayaçları ve erişim zamanını değiştirmeden yanıtı döndür (ön planlama için)"""
+        key = self.make_key(model, prompt)
+        with self._lock:
+            row = self._conn.execute('SELECT response, created_at FROM responses WHERE key = ?', (key,)).fetchone()
+        if row is None or (self.ttl_seconds and time.time() - row[1] > self.ttl_seconds):
+            return None
+        return row[0]
+
+    def set(self, model: str, prompt: str, response: str):
+        """Yanıtı önbelleğe yaz ve gerekirse eski kayıtları tahliye et"""
+        key = self.make_key(model, prompt)
+        size = len(response.encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, model, response, size, created_at, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, model, response, size, now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _delete(self, key: str):
+        self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+        self.evictions += 1
+
+    def _used_bytes(self) -> int:
+        # Aynı dizini başka süreçler de kullanabilir; toplam her seferinde tablodan okunur
+        return self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def _evict(self, now: float):
+        """Süresi dolanları, ardından boyut sınırı aşılıyorsa en eski erişilenleri sil"""
+        if self.ttl_seconds:
+            expired = self._conn.execute(
+                'SELECT key FROM responses WHERE created_at < ?', (now - self.ttl_seconds,)
+            ).fetchall()
+            for (key,) in expired:
+                self._delete(key)
+
+        if not self.max_bytes:
+            return
+        # Yazma işlemi içinde okunur; başka süreçlerin eklediği kayıtlar da sayılır
+        excess = self._used_bytes() - self.max_bytes
+        if excess > 0:
+            rows = self._conn.execute('SELECT key, size FROM responses ORDER BY last_access ASC')
+            victims = []
+            for key, size in rows:
+                if excess <= 0:
+                    break
+                victims.append(key)
+                excess -= size
+            for key in victims:
+                self._delete(key)
+
+    def stats(self) -> Dict[str, float]:
+        """İsabet/ıskalama sayaçları ve doluluk bilgisi"""
+        with self._lock:
+            entries, used_bytes = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses'
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': used_bytes,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,245 @@
+"""
+Analiz sonuçları veritabanı.
+Her çalıştırma; kaynak, kaynak özeti (dosya içeriğinin SHA-256'sı ya da tweet kimliklerinin
+özeti), sonucu etkileyen ayarlar, parça çıktıları ve nihai analizlerle tek bir SQLite
+dosyasına (`results/results.sqlite`) yazılır. Zaman ve analizlerde geçen cashtag/hashtag'ler
+indekslidir, metinler FTS5 ile aranır. Aynı kaynak aynı ayarlarla yeniden verildiğinde önceki
+çalıştırma bulunur ve analiz tekrarlanmaz.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+from incremental import tweet_id
+from tweet_store import TERM_RE, fts_query
+
+HASH_BLOCK_BYTES = 1 << 20
+MENTION_RE = re.compile(r'(?<![\w$#])([$#])([A-Za-z][A-Za-z0-9_]{1,29})')
+TERM_SPLIT_RE = re.compile(r'[\s,]+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    source TEXT NOT NULL,
+    source_hash TEXT,
+    config_hash TEXT NOT NULL,
+    config TEXT NOT NULL,
+    language TEXT NOT NULL,
+    model TEXT,
+    tweet_count INTEGER,
+    turkish TEXT,
+    english TEXT,
+    structured TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_created ON runs (created_at);
+CREATE INDEX IF NOT EXISTS runs_source ON runs (source_hash, config_hash);
+CREATE TABLE IF NOT EXISTS chunks (
+    run_id INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    language TEXT,
+    output TEXT NOT NULL,
+    PRIMARY KEY (run_id, n)
+);
+CREATE TABLE IF NOT EXISTS mentions (
+    run_id INTEGER NOT NULL,
+    entity TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (run_id, entity)
+);
+CREATE INDEX IF NOT EXISTS mentions_entity ON mentions (entity);
+CREATE VIRTUAL TABLE IF NOT EXISTS runs_fts USING fts5 (
+    source, turkish, english, content='runs', content_rowid='id', tokenize='unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS runs_fts_insert AFTER INSERT ON runs BEGIN
+    INSERT INTO runs_fts (rowid, source, turkish, english) VALUES (new.id, new.source, new.turkish, new.english);
+END;
+"""
+
+RUN_COLUMNS = 'r.id, r.created_at, r.source, r.source_hash, r.language, r.model, r.tweet_count'
+
+
+def file_digest(path: str) -> str:
+    """Dosya içeriğinin SHA-256 özeti (Streamlit yüklemesinin özetiyle aynı)"""
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_BYTES), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def tweets_digest(tweets: Iterable[Dict[str, Any]]) -> str:
+    """Dosyası olmayan seçimler (depo sorgusu) için tweet kimliklerinin sıralı özeti"""
+    hasher = hashlib.sha256()
+    for tweet in tweets:
+        hasher.update(tweet_id(tweet).encode('ascii'))
+    return hasher.hexdigest()
+
+
+def config_digest(config: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def normalize_entity(value: str) -> str:
+    """Cashtag'ler büyük ('$ZRO'), hashtag ve kullanıcı adları küçük harfle ('#layerzero', '@layerzero_labs') saklanır"""
+    value = value.strip()
+    if value.startswith('$'):
+        return value.upper()
+    if value.startswith(('#', '@')):
+        return value.lower()
+    return value
+
+
+def parse_entity_terms(values: Iterable[str]) -> List[str]:
+    """Virgül ya da boşlukla ayrılmış varlık listelerini tekrarsız, normalize terimlere çevir"""
+    terms = []
+    for value in values:
+        for term in TERM_SPLIT_RE.split(value or ''):
+            term = normalize_entity(term)
+            if term and term not in terms:
+                terms.append(term)
+    return terms
+
+
+def extract_mentions(texts: Iterable[str]) -> Counter:
+    """Metinlerde geçen cashtag ve hashtag sayıları"""
+    counts = Counter()
+    for text in texts:
+        for prefix, name in MENTION_RE.findall(text or ''):
+            counts[normalize_entity(prefix + name)] += 1
+    return counts
+
+
+def _chunk_text(output: Any) -> str:
+    return output if isinstance(output, str) else json.dumps(output, ensure_ascii=False)
+
+
+class ResultsStore:
+    """Çalıştırma geçmişi: meta veri, ayarlar, parça çıktıları, nihai analizler ve FTS indeksi"""
+
+    def __init__(self, path: str = 'results/results.sqlite'):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def add_run(self, source: str, results: Dict[str, Any], config: Dict[str, Any],
+                source_hash: Optional[str] = None, tweet_count: int = 0) -> int:
+        """Çalıştırmayı, parça çıktılarını ve geçen varlıkları yaz; çalıştırma kimliğini döndür"""
+        structured = results.get('structured')
+        chunks = results.get('chunks') or []
+        texts = [results.get('turkish'), results.get('english')]
+        texts += [_chunk_text(chunk['output']) for chunk in chunks]
+        mentions = extract_mentions(texts)
+        if structured:
+            # Yapılandırılmış sonuçta token'lar metinde geçmese de bilinir
+            for project in structured['projects']:
+                if project['token']:
+                    mentions[normalize_entity(project['token'])] += project['mentions']
+
+        with self._lock, self._conn:
+            run_id = self._conn.execute(
+                'INSERT INTO runs (created_at, source, source_hash, config_hash, config, language, model, '
+                'tweet_count, turkish, english, structured) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (time.time(), source, source_hash, config_digest(config), json.dumps(config, sort_keys=True),
+                 config.get('language', ''), config.get('model'), tweet_count,
+                 results.get('turkish'), results.get('english'),
+                 json.dumps(structured, ensure_ascii=False) if structured else None),
+            ).lastrowid
+            self._conn.executemany(
+                'INSERT INTO chunks (run_id, n, language, output) VALUES (?, ?, ?, ?)',
+                [(run_id, n, chunk.get('language'), _chunk_text(chunk['output'])) for n, chunk in enumerate(chunks)],
+            )
+            self._conn.executemany(
+                'INSERT INTO mentions (run_id, entity, count) VALUES (?, ?, ?)',
+                [(run_id, entity, count) for entity, count in mentions.items()],
+            )
+        return run_id
+
+    def find_run(self, source_hash: str, config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Aynı kaynak ve ayarlarla yapılmış en son çalıştırma (sonuçlarıyla)"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT id FROM runs WHERE source_hash = ? AND config_hash = ? ORDER BY id DESC LIMIT 1',
+                (source_hash, config_digest(config)),
+            ).fetchone()
+        return self.get_run(row['id']) if row else None
+
+    def get_run(self, run_id: int) -> Optional[Dict[str, Any]]:
+        """Çalıştırmanın meta verisi, ayarları, nihai analizleri ve parça çıktıları"""
+        with self._lock:
+            row = self._conn.execute('SELECT * FROM runs WHERE id = ?', (run_id,)).fetchone()
+            if row is None:
+                return None
+            chunks = self._conn.execute(
+                'SELECT language, output FROM chunks WHERE run_id = ? ORDER BY n', (run_id,)
+            ).fetchall()
+            mentions = self._conn.execute(
+                'SELECT entity, count FROM mentions WHERE run_id = ? ORDER BY count DESC, entity', (run_id,)
+            ).fetchall()
+
+        results = {key: row[key] for key in ('turkish', 'english') if row[key] is not None}
+        if row['structured']:
+            results['structured'] = json.loads(row['structured'])
+        results['chunks'] = [{'language': chunk['language'], 'output': chunk['output']} for chunk in chunks]
+        return {
+            'id': row['id'],
+            'created_at': row['created_at'],
+            'source': row['source'],
+            'source_hash': row['source_hash'],
+            'language': row['language'],
+            'model': row['model'],
+            'tweet_count': row['tweet_count'],
+            'config': json.loads(row['config']),
+            'mentions': {mention['entity']: mention['count'] for mention in mentions},
+            'results': results,
+        }
+
+    def list_runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """En yeni çalıştırmaların meta verisi"""
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT {RUN_COLUMNS} FROM runs r ORDER BY r.created_at DESC LIMIT ?', (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Geçmiş çalıştırmaları ara, en yenisi önce.
+        '$ZRO' ve '#layerzero' gibi terimler varlık indeksinden birebir, diğer kelimeler
+        kaynak adı ve analiz metinlerinde tam metin olarak aranır.
+        """
+        entities = [normalize_entity(term) for term in TERM_RE.findall(query) if term[0] in '$#']
+        words = ' '.join(term for term in TERM_RE.findall(query) if term[0] not in '$#@')
+        conditions, params = [], []
+        join, snippet = '', 'NULL'
+        if fts_query(words):
+            join = 'JOIN runs_fts f ON f.rowid = r.id'
+            conditions.append('runs_fts MATCH ?')
+            params.append(fts_query(words))
+            snippet = "snippet(runs_fts, -1, '[', ']', '…', 12)"
+        for entity in entities:
+            conditions.append('EXISTS (SELECT 1 FROM mentions m WHERE m.run_id = r.id AND m.entity = ?)')
+            params.append(entity)
+        if not conditions:
+            return []
+
+        sql = (f"SELECT {RUN_COLUMNS}, {snippet} AS snippet FROM runs r {join} "
+               f"WHERE {' AND '.join(conditions)} ORDER BY r.created_at DESC LIMIT ?")
+        with self._lock:
+            rows = self._conn.execute(sql, (*params, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
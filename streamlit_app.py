@@ -1,4 +1,5 @@
 import streamlit as st
+import hashlib
 import json
 import pandas as pd
 import plotly.express as px
@@ -8,7 +9,17 @@ import tempfile
 import zipfile
 from io import BytesIO
 from analyzer import TweetAnalyzer
+from jobs import CANCELLED, DONE, FAILED, JobManager
+from llm_backends import create_backend
+from planner import TASK_NAMES, build_plan
+from rate_limiter import RequestScheduler
+from response_cache import ResponseCache
+from results_store import ResultsStore, tweets_digest
+from tweet_loader import LoadStats, iter_tweets
+from tweet_stats import build_tweet_columns, create_tweet_dataframe, create_tweet_stats
+from tweet_store import TweetStore, describe_selection, parse_since
 from config import Config
+from entities import index_tweets
 
 # Page config
 st.set_page_config(
@@ -112,72 +123,466 @@ def init_session_state():
         st.session_state.analysis_results = None
     if 'tweet_data' not in st.session_state:
         st.session_state.tweet_data = None
+    if 'analysis_metrics' not in st.session_state:
+        st.session_state.analysis_metrics = None
+    if 'tweet_digest' not in st.session_state:
+        st.session_state.tweet_digest = None
+    if 'upload_digests' not in st.session_state:
+        st.session_state.upload_digests = {}
+    if 'job_id' not in st.session_state:
+        st.session_state.job_id = None
+    if 'polling_job' not in st.session_state:
+        st.session_state.polling_job = None
+
+@st.cache_resource(show_spinner=False)
+def get_shared_resources(api_key):
+    """Process-wide model backend, rate-limit scheduler and response cache shared by all sessions"""
+    config = Config()
+    backend = create_backend(config.LLM_BACKEND, config, api_key=api_key)
+    scheduler = RequestScheduler(
+        requests_per_minute=config.RATE_LIMIT_RPM,
+        tokens_per_minute=config.RATE_LIMIT_TPM,
+        max_retries=config.MAX_RETRIES,
+        base_delay=config.RETRY_BASE_DELAY,
+        max_delay=config.RETRY_MAX_DELAY,
+    )
+    cache = ResponseCache(
+        config.CACHE_DIR,
+        max_bytes=config.CACHE_MAX_BYTES,
+        ttl_seconds=config.CACHE_TTL_SECONDS,
+    ) if config.CACHE_ENABLED else None
+    return backend, scheduler, cache
+
+@st.cache_resource(show_spinner=False)
+def get_results_store():
+    """Process-wide handle on the results database shared with the CLI"""
+    return ResultsStore(Config.RESULTS_DB)
+
+def show_run_history():
+    """Search earlier runs in the results database and load one into the results tab"""
+    store = get_results_store()
+    with st.expander("🗃️ Geçmiş Analizler", expanded=False):
+        query = st.text_input("Ara", placeholder="$ZRO testnet", key="run_query").strip()
+        runs = store.search(query) if query else store.list_runs(limit=20)
+        if not runs:
+            st.caption("Eşleşen analiz yok")
+            return
+        labels = {
+            run['id']: f"#{run['id']} · {datetime.fromtimestamp(run['created_at']).strftime('%Y-%m-%d %H:%M')} · "
+                       f"{os.path.basename(run['source'])} · {run['tweet_count']} tweet · {run['language']}"
+            for run in runs
+        }
+        run_id = st.selectbox("Analiz", list(labels), format_func=labels.get, key="run_choice")
+        snippet = next((run.get('snippet') for run in runs if run['id'] == run_id), None)
+        if snippet:
+            st.caption(snippet)
+        if st.button("📂 Sonucu Yükle", key="load_run"):
+            run = store.get_run(run_id)
+            st.session_state.job_id = None
+            st.session_state.analysis_results = run['results']
+            st.session_state.analysis_metrics = None
+
+def get_api_key():
+    """Gemini API key from Streamlit secrets or the environment"""
+    return st.secrets.get("GEMINI_API_KEY") or os.getenv("GEMINI_API_KEY")
+
+def api_key_required():
+    """Only the Gemini backend needs an API key; fake and http backends run without one"""
+    return Config.LLM_BACKEND == 'gemini'
 
 def setup_analyzer():
-    """Setup the tweet analyzer"""
-    api_key = st.secrets.get("GEMINI_API_KEY") or os.getenv("GEMINI_API_KEY")
+    """Setup a per-run tweet analyzer on top of the shared model resources"""
+    api_key = get_api_key()
     
-    if not api_key:
+    if api_key_required() and not api_key:
         st.error("⚠️ GEMINI_API_KEY bulunamadı! Lütfen yöneticiye başvurun.")
         return None
     
-    # Set environment variable for the analyzer
-    os.environ["GEMINI_API_KEY"] = api_key
-    
     try:
-        analyzer = TweetAnalyzer()
-        return analyzer
+        backend, scheduler, cache = get_shared_resources(api_key)
+        return TweetAnalyzer(backend=backend, scheduler=scheduler, cache=cache, results_store=get_results_store())
     except Exception as e:
         st.error(f"❌ Analyzer başlatılamadı: {str(e)}")
         return None
 
-def load_tweets_from_json(file_content):
-    """Load tweets from JSON file content"""
+def configure_analyzer(analyzer, settings):
+    """Apply the sidebar settings to a per-run analyzer"""
+    analyzer.config.MAX_TWEETS_PER_ANALYSIS = settings['max_tweets']
+    if settings['chunk_tokens']:
+        analyzer.config.CHUNKING_MODE = 'tokens'
+        analyzer.config.CHUNK_TOKEN_BUDGET = settings['chunk_tokens']
+    else:
+        analyzer.config.CHUNKING_MODE = 'count'
+        analyzer.config.CHUNK_SIZE = settings['chunk_size']
+    analyzer.config.STRUCTURED_OUTPUT = settings['structured']
+    analyzer.config.REUSE_PREVIOUS_RUNS = settings['reuse_runs']
+    analyzer.config.ENTITY_FILTER = settings['entities']
+    # Streamed text is rendered in the page, not in the server terminal
+    analyzer.config.STREAM_OUTPUT = False
+    # Runs are kept only when the user opts in, and then in the results database only; no text files on the server
+    analyzer.config.SAVE_RESULTS = settings['save_runs']
+    analyzer.config.EXPORT_TEXT_FILES = False
+
+def show_plan_preview(analyzer, tweets, language, source_hash):
+    """Requests, tokens, cache hits and projected time of an analysis, without calling the model"""
+    plan = build_plan(analyzer, tweets, language, source_hash)
+    col1, col2 = st.columns(2)
+    col1.metric("Model isteği", plan['api_calls'], help=f"{plan['cached']} çağrı önbellekten dönecek")
+    col2.metric("Tahmini süre", f"~{plan['wall_seconds']:.0f} sn",
+                help=f"Hız sınırı beklemesi ~{plan['throttle_seconds']:.0f} sn, {plan['concurrency']} eşzamanlı istek")
+    st.caption(
+        f"{plan['selected']} tweet · {plan['chunks']} parça · ~{plan['api_prompt_tokens']:,} girdi token'ı "
+        f"(yerel hazırlık {plan['prep_seconds']:.2f} sn)"
+    )
+    st.dataframe(pd.DataFrame([
+        {
+            'Görev': TASK_NAMES[row['task']],
+            'Parça': row['chunk_calls'],
+            'Birleştirme': " + ".join(map(str, row['merge_calls'])) or ("yerel" if row['task'] == 'structured' else "-"),
+            'Derinlik': row['depth'],
+            'Önbellekte': f"{row['cached']}/{row['calls']}",
+        }
+        for row in plan['tasks']
+    ]), hide_index=True, use_container_width=True)
+    if plan['previous_run']:
+        st.info(f"♻️ Aynı ayarlarla önceki analiz var (#{plan['previous_run']}); model çağrısı yapılmayacak")
+
+def uploaded_file_digest(uploaded_file):
+    """Content hash of an upload, computed once per uploaded file"""
+    digests = st.session_state.upload_digests
+    if uploaded_file.file_id not in digests:
+        hasher = hashlib.sha256()
+        uploaded_file.seek(0)
+        for block in iter(lambda: uploaded_file.read(1024 * 1024), b''):
+            hasher.update(block)
+        digests[uploaded_file.file_id] = hasher.hexdigest()
+    return digests[uploaded_file.file_id]
+
+@st.cache_resource(max_entries=Config.UI_CACHE_MAX_ENTRIES, ttl=Config.UI_CACHE_TTL_SECONDS, show_spinner="📂 Dosya okunuyor...")
+def parse_uploaded_tweets(digest, _uploaded_file):
+    """Parse an upload once per content hash (the file object itself is not hashed)"""
+    _uploaded_file.seek(0)
+    stats = LoadStats()
+    tweets = list(iter_tweets(_uploaded_file, stats))
+    return tweets, stats
+
+@st.cache_resource(max_entries=Config.UI_CACHE_MAX_ENTRIES, ttl=Config.UI_CACHE_TTL_SECONDS, show_spinner=False)
+def get_tweet_columns(digest, _tweets):
+    """Columnar view of an upload, built once per content hash"""
+    return build_tweet_columns(_tweets)
+
+@st.cache_resource(max_entries=Config.UI_CACHE_MAX_ENTRIES, ttl=Config.UI_CACHE_TTL_SECONDS, show_spinner=False)
+def get_tweet_dataframe(digest, _tweets):
+    """Tweet table for an upload, built once per content hash"""
+    return create_tweet_dataframe(_tweets, columns=get_tweet_columns(digest, _tweets))
+
+@st.cache_resource(max_entries=Config.UI_CACHE_MAX_ENTRIES, ttl=Config.UI_CACHE_TTL_SECONDS, show_spinner=False)
+def get_tweet_stats(digest, _tweets):
+    """Tweet statistics for an upload, computed once per content hash"""
+    return create_tweet_stats(_tweets, columns=get_tweet_columns(digest, _tweets))
+
+@st.cache_resource(max_entries=Config.UI_CACHE_MAX_ENTRIES, ttl=Config.UI_CACHE_TTL_SECONDS, show_spinner="🏷️ Varlıklar indeksleniyor...")
+def get_entity_index(digest, _tweets):
+    """Cashtag/hashtag/mention inverted index of the loaded tweets, built once per content hash"""
+    return index_tweets(_tweets)
+
+def entity_options(entity_index):
+    """Most mentioned entities with their mention counts, for filter widgets"""
+    top = entity_index.top(Config.UI_ENTITY_OPTIONS)
+    return dict(zip(top['entity'], top['mentions']))
+
+def show_entity_charts(entity_index):
+    """Top entities by mentions and their first/last-seen span"""
+    kind = st.radio("Tür", list(ENTITY_KINDS), horizontal=True, format_func=ENTITY_KINDS.get, key="entity_kind")
+    top = entity_index.top(Config.UI_ENTITY_TOP, None if kind == 'all' else kind)
+    if top.empty:
+        st.caption("Bu türde varlık yok")
+        return
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        fig_entities = px.bar(
+            top.iloc[::-1], x='mentions', y='entity', color='kind', orientation='h',
+            title=f"En Çok Geçen {len(top)} Varlık"
+        )
+        fig_entities.update_layout(xaxis_title="Geçiş", yaxis_title=None, legend_title=None)
+        st.plotly_chart(fig_entities, use_container_width=True)
+    with col2:
+        dated = top.dropna(subset=['first_seen'])
+        if not dated.empty:
+            fig_span = px.timeline(
+                dated.iloc[::-1], x_start='first_seen', x_end='last_seen', y='entity', color='kind',
+                title="İlk ve Son Görülme"
+            )
+            fig_span.update_layout(yaxis_title=None, legend_title=None)
+            st.plotly_chart(fig_span, use_container_width=True)
+    st.dataframe(top.rename(columns=ENTITY_COLUMNS), hide_index=True, use_container_width=True)
+
+def load_tweets_from_json(uploaded_file):
+    """Load tweets from an uploaded JSON array or JSON Lines file, reusing earlier parses of the same content"""
     try:
-        tweets = json.loads(file_content)
+        digest = uploaded_file_digest(uploaded_file)
+        tweets, stats = parse_uploaded_tweets(digest, uploaded_file)
+        if stats.skipped:
+            st.warning(f"⚠️ {stats.skipped} geçersiz kayıt atlandı ({stats.errors[0]})")
+        st.session_state.tweet_digest = digest
         return tweets
     except json.JSONDecodeError as e:
         st.error(f"❌ JSON dosyası geçersiz: {str(e)}")
         return None
+    except ValueError as e:
+        st.error(f"❌ {str(e)}")
+        return None
+
+
+ENTITY_KINDS = {
+    'all': "Tümü",
+    'cashtag': "💲 Cashtag",
+    'hashtag': "#️⃣ Hashtag",
+    'mention': "👤 Bahsetme",
+}
+ENTITY_COLUMNS = {
+    'entity': "Varlık",
+    'kind': "Tür",
+    'mentions': "Geçiş",
+    'tweets': "Tweet",
+    'first_seen': "İlk Görülme",
+    'last_seen': "Son Görülme",
+}
+
+STORE_SOURCE = "🗄️ Yerel depo"
+STORE_WINDOWS = {
+    "Son 1 saat": "1h",
+    "Son 6 saat": "6h",
+    "Son 24 saat": "24h",
+    "Son 7 gün": "7d",
+    "Tümü": None,
+}
 
-def create_tweet_dataframe(tweets):
-    """Create a pandas DataFrame from tweets"""
+@st.cache_resource(show_spinner=False)
+def get_tweet_store():
+    """Process-wide handle on the local tweet store filled by `main.py --ingest`"""
+    return TweetStore(Config.STORE_DIR)
+
+@st.cache_resource(max_entries=Config.UI_CACHE_MAX_ENTRIES, ttl=Config.UI_CACHE_TTL_SECONDS, show_spinner="🗄️ Depo sorgulanıyor...")
+def query_tweet_store(since_ts, match, version):
+    """Store selection, re-queried only when the window, the match or the store contents change"""
+    return get_tweet_store().query(since=since_ts, match=match or None)
+
+def select_store_tweets():
+    """Pick tweets from the local store by time window and text match"""
+    store = get_tweet_store()
+    if not store.partitions():
+        st.info("🗄️ Yerel depo boş. Önce `python main.py <dosyalar> --ingest` ile tweet ekleyin.")
+        return None, None
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        window = st.selectbox("Zaman aralığı", list(STORE_WINDOWS), index=1)
+    with col2:
+        match = st.text_input("Metinde geçen", placeholder="$ZRO airdrop").strip()
+    
+    since = STORE_WINDOWS[window]
+    # Relative windows are rounded to the minute so reruns within a minute hit the cache
+    since_ts = int(parse_since(since) // 60 * 60) if since else None
+    version = store.version()
+    tweets = query_tweet_store(since_ts, match, version)
+    label = describe_selection(since, match)
     if not tweets:
-        return None
+        st.warning("⚠️ Depoda bu seçime uyan tweet yok")
+        return None, label
+    st.session_state.tweet_digest = f"{label}:{since_ts}:{version}"
+    return tweets, label
+
+def show_metrics_panel(telemetry):
+    """Render per-stage timings and model call metrics in a collapsible panel"""
+    summary = telemetry.summary()
+    with st.expander("⏱️ Performans Metrikleri", expanded=False):
+        if summary['stages']:
+            st.markdown("**Aşama süreleri**")
+            st.dataframe(
+                pd.DataFrame([
+                    {'Aşama': name, 'Çalışma': stage['count'], 'Süre (sn)': round(stage['seconds'], 3)}
+                    for name, stage in summary['stages'].items()
+                ]),
+                use_container_width=True
+            )
+        if summary['calls']:
+            st.markdown("**Model çağrıları**")
+            st.dataframe(
+                pd.DataFrame([
+                    {
+                        'Tür': kind,
+                        'Çağrı': stats['calls'],
+                        'Önbellek': stats['cached'],
+                        'Yeniden Deneme': stats['retries'],
+                        'Hata': stats['errors'],
+                        'Prompt Token': stats['prompt_tokens'],
+                        'Yanıt Karakter': stats['response_chars'],
+                        'p50 (sn)': stats['latency_p50'],
+                        'p95 (sn)': stats['latency_p95'],
+                    }
+                    for kind, stats in summary['calls'].items()
+                ]),
+                use_container_width=True
+            )
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                "📥 Metrikler (JSON)",
+                data=json.dumps(telemetry.to_dict(), indent=2, ensure_ascii=False),
+                file_name="metrics.json",
+                mime="application/json",
+                use_container_width=True
+            )
+        with col2:
+            st.download_button(
+                "📥 Metrikler (Prometheus)",
+                data=telemetry.to_prometheus(),
+                file_name="metrics.prom",
+                mime="text/plain",
+                use_container_width=True
+            )
+
+def chunk_preview(result):
+    """Readable text of one finished chunk (plain, bilingual or structured JSON result)"""
+    if not isinstance(result, dict):
+        return result
+    if 'error' in result:
+        return f"⚠️ {result['error']}"
+    if 'projects' in result:
+        names = [project['token'] or project['name'] for project in result['projects']]
+        return "Projeler: " + (', '.join(names) or '-')
+    return result.get('turkish', '')
+
+def show_structured_results(structured):
+    """Tables of the locally merged JSON result and a JSON download"""
+    st.subheader("🗂️ Yapılandırılmış Veri")
+    airdrops = [{
+        'Proje': airdrop['project'],
+        'Token': airdrop['token'] or '',
+        'Tarih': ', '.join(airdrop['dates']),
+        'Koşullar': '; '.join(text['tr'] for text in airdrop['requirements']),
+        'Geçme': airdrop['mentions'],
+    } for airdrop in structured['airdrops']]
+    projects = [{
+        'Proje': project['name'],
+        'Token': project['token'] or '',
+        'Açıklama': ' '.join(text['tr'] for text in project['descriptions']),
+        'Geçme': project['mentions'],
+    } for project in structured['projects']]
     
-    df_data = []
-    for tweet in tweets:
-        df_data.append({
-            'Kullanıcı': tweet.get('username', 'Bilinmeyen'),
-            'Tweet': tweet.get('text', '')[:100] + '...' if len(tweet.get('text', '')) > 100 else tweet.get('text', ''),
-            'Tarih': tweet.get('timestamp', 'Bilinmeyen'),
-            'Karakter Sayısı': len(tweet.get('text', ''))
-        })
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**🎁 Airdrop'lar**")
+        if airdrops:
+            st.dataframe(pd.DataFrame(airdrops), use_container_width=True, hide_index=True)
+        else:
+            st.caption("Airdrop bulunamadı")
+    with col2:
+        st.markdown("**🪙 Projeler ve Token'lar**")
+        if projects:
+            st.dataframe(pd.DataFrame(projects), use_container_width=True, hide_index=True)
+        else:
+            st.caption("Proje bulunamadı")
     
-    return pd.DataFrame(df_data)
+    st.download_button(
+        label="📥 JSON Olarak İndir",
+        data=json.dumps(structured, ensure_ascii=False, indent=2),
+        file_name=f"crypto_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+        mime="application/json",
+    )
 
-def create_tweet_stats(tweets):
-    """Create statistics and visualizations from tweets"""
-    if not tweets:
-        return None
+def render_partial_results(placeholder, partial):
+    """Render the analysis text received so far"""
+    with placeholder.container():
+        if partial.get('turkish'):
+            st.subheader("🇹🇷 Türkçe Analiz")
+            st.markdown(partial['turkish'])
+        if partial.get('english'):
+            st.subheader("🇺🇸 English Analysis")
+            st.markdown(partial['english'])
+
+@st.cache_resource(show_spinner=False)
+def get_job_manager():
+    """Process-wide background job runner shared by all sessions"""
+    return JobManager(Config.JOB_WORKERS, Config.JOBS_DIR, Config.JOB_HISTORY_LIMIT, Config.JOB_SAVE_SECONDS)
+
+JOB_STATUS_LABELS = {
+    'queued': '🕒 Sırada',
+    'running': '🔄 Çalışıyor',
+    'done': '✅ Tamamlandı',
+    'failed': '❌ Hata',
+    'cancelled': '⛔ İptal edildi',
+    'interrupted': '⚠️ Yarıda kaldı',
+}
+
+def show_job_selector(manager):
+    """Let the user re-attach to a recent job (e.g. after a page reload)"""
+    jobs = manager.list_jobs()[:10]
+    if not jobs:
+        return
+    labels = {
+        job.id: f"#{job.id} · {JOB_STATUS_LABELS[job.status]} · {job.created_at.replace('T', ' ')} · {job.label}"
+        for job in jobs
+    }
+    options = [None] + list(labels)
+    current = st.session_state.job_id
+    selected = st.selectbox(
+        "🗂️ Son Analiz İşleri",
+        options,
+        index=options.index(current) if current in options else 0,
+        format_func=lambda job_id: labels.get(job_id, "—"),
+    )
+    if selected != current:
+        st.session_state.job_id = selected
+        st.session_state.analysis_results = None
+        st.session_state.analysis_metrics = None
+
+def show_job_status(manager, job_id):
+    """Status, per-chunk progress and live output of a background job (polled as a fragment)"""
+    job = manager.get(job_id)
+    if job is None:
+        return
+    snapshot = job.to_dict()
     
-    # Basic stats
-    total_tweets = len(tweets)
-    unique_users = len(set(tweet.get('username', '') for tweet in tweets))
+    st.markdown(f"**İş #{job.id}** — {JOB_STATUS_LABELS[snapshot['status']]} · {snapshot['tweet_count']} tweet")
+    if snapshot['total_chunks']:
+        st.progress(
+            snapshot['completed_chunks'] / snapshot['total_chunks'],
+            text=f"{snapshot['completed_chunks']}/{snapshot['total_chunks']} parça analiz edildi"
+        )
     
-    # Character count distribution
-    char_counts = [len(tweet.get('text', '')) for tweet in tweets]
+    if not job.finished:
+        if st.button("⛔ Analizi İptal Et", key=f"cancel_{job.id}"):
+            manager.cancel(job.id)
+        if snapshot['partial']:
+            render_partial_results(st.empty(), snapshot['partial'])
+        elif snapshot['chunk_results']:
+            with st.expander(f"🧩 Tamamlanan parçalar ({len(snapshot['chunk_results'])})", expanded=False):
+                for n, chunk in enumerate(snapshot['chunk_results'], 1):
+                    result = chunk['result']
+                    st.markdown(f"**Parça {n}**")
+                    st.markdown(chunk_preview(result))
+        return
     
-    # User distribution
-    users = [tweet.get('username', 'Bilinmeyen') for tweet in tweets]
-    user_counts = pd.Series(users).value_counts()
+    if snapshot['status'] == DONE and st.session_state.analysis_results is None:
+        st.session_state.analysis_results = snapshot['results']
+        st.session_state.analysis_metrics = job.telemetry
+    # The job finished while this fragment was polling: rerun the page once to stop polling
+    if st.session_state.polling_job == job.id:
+        st.session_state.polling_job = None
+        st.rerun()
     
-    return {
-        'total_tweets': total_tweets,
-        'unique_users': unique_users,
-        'char_counts': char_counts,
-        'user_counts': user_counts
-    }
+    if snapshot['status'] == DONE:
+        if snapshot['error']:
+            st.warning(f"⚠️ {snapshot['error']}")
+    elif snapshot['status'] == FAILED:
+        st.error(f"❌ Analiz hatası: {snapshot['error']}")
+    elif snapshot['status'] == CANCELLED:
+        st.warning("⛔ Analiz iptal edildi.")
+    else:
+        st.warning("⚠️ Analiz sunucu yeniden başladığı için yarıda kaldı. Lütfen tekrar başlatın.")
 
 def create_download_file(results, filename, tweet_count):
     """Create downloadable file with results"""
@@ -243,12 +648,43 @@ def main():
         # Analysis options
         st.subheader("🔧 Analiz Seçenekleri")
         max_tweets = st.slider("Maksimum Tweet Sayısı", 10, 200, 50)
-        chunk_size = st.slider("İşlem Parça Boyutu", 5, 20, 10)
+        pack_by_tokens = st.checkbox("Token bütçesine göre parçala", value=True)
+        if pack_by_tokens:
+            chunk_tokens = st.slider("Parça Token Bütçesi", 1000, 16000, 4000, step=500)
+        else:
+            chunk_size = st.slider("İşlem Parça Boyutu", 5, 20, 10)
+        structured_output = st.checkbox(
+            "Yapılandırılmış çıktı (JSON)",
+            value=False,
+            help="Her parça JSON döndürür; parçalar model çağrısı olmadan yerelde birleştirilir"
+        )
+        reuse_runs = st.checkbox(
+            "♻️ Önceki sonuçları kullan",
+            value=True,
+            help="Aynı veri aynı ayarlarla daha önce analiz edildiyse sonucu veritabanından getirir"
+        )
+        save_runs = st.checkbox(
+            "🗃️ Sonucu veritabanına kaydet",
+            value=Config.UI_SAVE_RESULTS,
+            help="Analizi '🗃️ Geçmiş Analizler' içinde aranabilir ve yeniden kullanılabilir kılar"
+        )
+        settings = {
+            'max_tweets': max_tweets,
+            'chunk_tokens': chunk_tokens if pack_by_tokens else None,
+            'chunk_size': None if pack_by_tokens else chunk_size,
+            'structured': structured_output,
+            'reuse_runs': reuse_runs,
+            'save_runs': save_runs,
+            'entities': [],
+        }
         
         # API Key status
         st.subheader("🔑 API Durumu")
-        api_key = st.secrets.get("GEMINI_API_KEY") or os.getenv("GEMINI_API_KEY")
-        if api_key:
+        api_key = get_api_key()
+        backend_ready = bool(api_key) or not api_key_required()
+        if not api_key_required():
+            st.info(f"ℹ️ '{Config.LLM_BACKEND}' arka ucu API anahtarı gerektirmez")
+        elif api_key:
             st.success("✅ API anahtarı mevcut")
         else:
             st.error("❌ API anahtarı bulunamadı")
@@ -270,7 +706,7 @@ def main():
             """, unsafe_allow_html=True)
             st.markdown("**⚡ İpuçları:**")
             st.markdown("• Dosya boyutu maksimum 200MB olmalı")
-            st.markdown("• JSON formatında geçerli bir dizi olmalı")
+            st.markdown("• JSON dizisi veya JSON Lines (satır başına bir tweet) olmalı")
             st.markdown("• Her tweet objesi 'text' alanı içermeli")
     
     # Main content
@@ -279,40 +715,74 @@ def main():
     with tab1:
         st.header("📁 JSON Dosya Yükleme")
         
-        # Upload section with custom styling
-        st.markdown("""
-        <div class="upload-section">
-            <h3>📤 Dosya Yükleme Alanı</h3>
-            <p>Kripto tweet JSON dosyanızı buraya sürükleyin veya dosya seçin</p>
-        </div>
-        """, unsafe_allow_html=True)
+        # Data source: a fresh upload or a selection from the local tweet store
+        use_store = st.radio("Veri kaynağı", ["📤 Dosya yükle", STORE_SOURCE], horizontal=True) == STORE_SOURCE
         
-        # File upload
-        uploaded_file = st.file_uploader(
-            "JSON dosyanızı seçin",
-            type=['json'],
-            help="X scraper'ınızdan elde ettiğiniz JSON dosyasını yükleyin",
-            label_visibility="collapsed"
-        )
+        uploaded_file = None
+        if not use_store:
+            # Upload section with custom styling
+            st.markdown("""
+            <div class="upload-section">
+                <h3>📤 Dosya Yükleme Alanı</h3>
+                <p>Kripto tweet JSON dosyanızı buraya sürükleyin veya dosya seçin</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            # File upload
+            uploaded_file = st.file_uploader(
+                "JSON dosyanızı seçin",
+                type=['json', 'jsonl'],
+                help="X scraper'ınızdan elde ettiğiniz JSON dosyasını yükleyin",
+                label_visibility="collapsed"
+            )
         
-        if uploaded_file is not None:
+        if use_store or uploaded_file is not None:
             # Load tweets
-            file_content = uploaded_file.read().decode('utf-8')
-            tweets = load_tweets_from_json(file_content)
+            if use_store:
+                tweets, source_label = select_store_tweets()
+            else:
+                tweets, source_label = load_tweets_from_json(uploaded_file), uploaded_file.name
             
             if tweets:
                 st.session_state.tweet_data = tweets
                 st.success(f"✅ {len(tweets)} tweet başarıyla yüklendi!")
                 
+                # Restrict the prompts to tweets about the selected projects
+                entity_index = get_entity_index(st.session_state.tweet_digest, tweets)
+                counts = entity_options(entity_index)
+                settings['entities'] = st.multiselect(
+                    "🏷️ Varlık filtresi",
+                    options=list(counts),
+                    format_func=lambda entity: f"{entity} ({counts[entity]})",
+                    help="Seçilirse yalnızca bu cashtag/hashtag/kullanıcılardan en az birinin geçtiği tweet'ler analiz edilir",
+                    key="analysis_entities"
+                )
+                if settings['entities']:
+                    st.caption(f"🏷️ {len(entity_index.match(settings['entities']))} / {len(tweets)} tweet seçilen varlıklardan birini içeriyor")
+                
                 # Show sample tweets
                 if st.checkbox("📋 Örnek Tweet'leri Göster"):
                     df = create_tweet_dataframe(tweets[:5])
                     if df is not None:
                         st.dataframe(df, use_container_width=True)
                 
+                source_hash = tweets_digest(tweets) if use_store else st.session_state.tweet_digest
+                
+                # Dry-run plan for the loaded tweets under the current settings
+                with st.sidebar:
+                    st.subheader("🧪 Plan")
+                    if st.checkbox("Analiz planını göster", help="Prompt'lar yerelde oluşturulur; model çağrısı yapılmaz"):
+                        if not backend_ready:
+                            st.caption("API anahtarı olmadan plan çıkarılamaz")
+                        else:
+                            analyzer = setup_analyzer()
+                            if analyzer:
+                                configure_analyzer(analyzer, settings)
+                                show_plan_preview(analyzer, tweets, language, source_hash)
+                
                 # Analysis button
                 if st.button("🔍 Analizi Başlat", type="primary", use_container_width=True):
-                    if not api_key:
+                    if not backend_ready:
                         st.error("⚠️ API anahtarı bulunamadı!")
                         return
                     
@@ -322,29 +792,35 @@ def main():
                         return
                     
                     # Configure analyzer
-                    analyzer.config.MAX_TWEETS_PER_ANALYSIS = max_tweets
-                    analyzer.config.CHUNK_SIZE = chunk_size
-                    # Don't save results in streamlit mode
+                    configure_analyzer(analyzer, settings)
                     
-                    # Run analysis
-                    with st.spinner("🔄 Analiz yapılıyor... Bu işlem birkaç dakika sürebilir."):
-                        try:
-                            results = analyzer.analyze_tweets(tweets, language)
-                            
-                            if 'error' not in results:
-                                st.session_state.analysis_results = results
-                                st.success("🎉 Analiz başarıyla tamamlandı!")
-                                st.balloons()
-                                # Auto-switch to results tab
-                                st.rerun()
-                            else:
-                                st.error(f"❌ Analiz hatası: {results['error']}")
-                                
-                        except Exception as e:
-                            st.error(f"❌ Beklenmeyen hata: {str(e)}")
+                    # Run analysis in the background so reruns and tab switches don't abort it
+                    previous = analyzer.find_previous_run(source_hash, language)
+                    if previous:
+                        st.session_state.job_id = None
+                        st.session_state.analysis_results = previous['results']
+                        st.session_state.analysis_metrics = None
+                        st.success(f"♻️ Bu veri aynı ayarlarla daha önce analiz edildi (#{previous['id']}). Sonuç '📊 Analiz Sonuçları' sekmesinde.")
+                    else:
+                        job_id = get_job_manager().submit(analyzer, tweets, language, label=source_label, source_hash=source_hash)
+                        st.session_state.job_id = job_id
+                        st.session_state.analysis_results = None
+                        st.session_state.analysis_metrics = None
+                        st.info(f"⏳ Analiz işi başlatıldı (#{job_id}). İlerlemeyi '📊 Analiz Sonuçları' sekmesinden izleyebilirsiniz.")
     
     with tab2:
         st.header("📊 Analiz Sonuçları")
+        show_run_history()
+        
+        # Background job status (polls while the job is running)
+        manager = get_job_manager()
+        show_job_selector(manager)
+        if st.session_state.job_id:
+            job = manager.get(st.session_state.job_id)
+            if job:
+                poll = None if job.finished else Config.JOB_POLL_SECONDS
+                st.session_state.polling_job = None if job.finished else job.id
+                st.fragment(show_job_status, run_every=poll)(manager, job.id)
         
         if st.session_state.analysis_results:
             results = st.session_state.analysis_results
@@ -361,6 +837,14 @@ def main():
                 with st.expander("Show Details", expanded=True):
                     st.markdown(results['english'])
             
+            # Locally merged JSON result (structured mode)
+            if 'structured' in results:
+                show_structured_results(results['structured'])
+            
+            # Performance metrics
+            if st.session_state.analysis_metrics:
+                show_metrics_panel(st.session_state.analysis_metrics)
+            
             # Download results
             st.subheader("💾 Sonuçları İndir")
             
@@ -379,14 +863,15 @@ def main():
                     use_container_width=True
                 )
         else:
-            st.info("📝 Analiz sonucu bulunmuyor. Lütfen önce bir dosya yükleyip analiz yapın.")
+            if not st.session_state.job_id:
+                st.info("📝 Analiz sonucu bulunmuyor. Lütfen önce bir dosya yükleyip analiz yapın.")
     
     with tab3:
         st.header("📈 Tweet İstatistikleri")
         
         if st.session_state.tweet_data:
             tweets = st.session_state.tweet_data
-            stats = create_tweet_stats(tweets)
+            stats = get_tweet_stats(st.session_state.tweet_digest, tweets)
             
             if stats:
                 # Basic stats with custom styling
@@ -405,13 +890,12 @@ def main():
                 
                 with col3:
                     st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-                    avg_chars = sum(stats['char_counts']) / len(stats['char_counts'])
-                    st.metric("📝 Ortalama Karakter", f"{avg_chars:.0f}")
+                    st.metric("📝 Ortalama Karakter", f"{stats['avg_chars']:.0f}")
                     st.markdown('</div>', unsafe_allow_html=True)
                 
                 with col4:
                     st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-                    st.metric("📏 Maksimum Karakter", max(stats['char_counts']))
+                    st.metric("📏 Maksimum Karakter", stats['max_chars'])
                     st.markdown('</div>', unsafe_allow_html=True)
                 
                 # Charts
@@ -419,13 +903,15 @@ def main():
                 
                 with col1:
                     st.subheader("📊 Karakter Sayısı Dağılımı")
-                    if 'char_counts' in stats:
-                        fig_chars = px.histogram(
-                            x=stats['char_counts'],
-                            nbins=20,
+                    if 'char_histogram' in stats:
+                        # Kutular sunucuda hesaplandı; grafiğe yalnızca kutu sayıları gönderilir
+                        histogram = stats['char_histogram']
+                        fig_chars = px.bar(
+                            x=(histogram['start'] + histogram['end']) / 2,
+                            y=histogram['count'],
                             title="Tweet Karakter Sayısı Dağılımı"
                         )
-                        fig_chars.update_layout(xaxis_title="Karakter Sayısı", yaxis_title="Tweet Sayısı")
+                        fig_chars.update_layout(xaxis_title="Karakter Sayısı", yaxis_title="Tweet Sayısı", bargap=0)
                         st.plotly_chart(fig_chars, use_container_width=True)
                 
                 with col2:
@@ -434,15 +920,32 @@ def main():
                         fig_users = px.pie(
                             values=stats['user_counts'].values,
                             names=stats['user_counts'].index,
-                            title="Tweet'lerin Kullanıcılara Göre Dağılımı"
+                            title="Tweet'lerin Kullanıcılara Göre Dağılımı (ilk 10 + Diğer)"
                         )
                         st.plotly_chart(fig_users, use_container_width=True)
                 
+                # Cashtags, hashtags and mentions
+                st.subheader("🏷️ Varlıklar")
+                entity_index = get_entity_index(st.session_state.tweet_digest, tweets)
+                if len(entity_index):
+                    show_entity_charts(entity_index)
+                else:
+                    st.caption("Tweet'lerde cashtag, hashtag ya da kullanıcı bahsetmesi yok")
+                
                 # Detailed table
                 st.subheader("📋 Detaylı Tweet Tablosu")
-                df = create_tweet_dataframe(tweets)
+                df = get_tweet_dataframe(st.session_state.tweet_digest, tweets)
                 if df is not None:
-                    st.dataframe(df, use_container_width=True)
+                    counts = entity_options(entity_index)
+                    table_entities = st.multiselect(
+                        "🏷️ Varlığa göre süz", options=list(counts),
+                        format_func=lambda entity: f"{entity} ({counts[entity]})", key="table_entities"
+                    )
+                    if table_entities:
+                        df = df.iloc[entity_index.match(table_entities)]
+                    st.dataframe(df.head(Config.UI_TABLE_MAX_ROWS), use_container_width=True)
+                    if len(df) > Config.UI_TABLE_MAX_ROWS:
+                        st.caption(f"İlk {Config.UI_TABLE_MAX_ROWS} / {len(df)} tweet gösteriliyor")
                 
         else:
             st.info("📊 İstatistik göstermek için tweet verisi gerekli. Lütfen bir dosya yükleyin.")
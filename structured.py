@@ -0,0 +1,287 @@
+"""
+Yapılandırılmış (JSON) analiz çıktısı.
+Bu modda her parça, analiz prompt'larındaki beş bölüme karşılık gelen alanlarla (özet,
+projeler, token'lar, airdrop'lar, duyurular, duyarlılık, sonuç) JSON döndürür. Parçalar
+modele yeniden gönderilmeden burada anahtara göre birleştirilir, tekrarlar elenir ve
+sonuç mevcut metin çıktılarıyla aynı bölüm başlıklarıyla yazılır. Birleşik JSON ayrıca
+saklanır; böylece sonuçlar proje ya da token'a göre sorgulanabilir.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+LANGUAGES = ('tr', 'en')
+MAX_SUMMARY_ITEMS = 6
+MAX_DESCRIPTIONS = 2
+SENTIMENT_THRESHOLD = 0.2
+
+# Prompt'taki TEXT alanlarının dili; iki dilli modda her metin {"tr", "en"} nesnesidir
+LANGUAGE_RULES = {
+    'both': 'Every TEXT value is an object {"tr": "<Türkçe>", "en": "<English>"} with the same content in both languages.',
+    'turkish': 'Every TEXT value is a plain string written in Türkçe.',
+    'english': 'Every TEXT value is a plain string written in English.',
+}
+
+SECTION_TITLES = {
+    'tr': ('GENEL ÖZET', 'AIRDROP BİLGİLERİ', 'PROJE VE TOKEN BİLGİLERİ', 'ÖNEMLİ DUYURULAR', 'SONUÇ'),
+    'en': ('GENERAL SUMMARY', 'AIRDROP INFORMATION', 'PROJECT AND TOKEN INFO', 'IMPORTANT ANNOUNCEMENTS', 'CONCLUSION'),
+}
+LABELS = {
+    'tr': {'none': 'Bilgi yok', 'date': 'Tarih', 'requirements': 'Koşullar', 'mentions': 'kez geçti',
+           'sentiment': 'Genel duyarlılık', 'positive': 'olumlu', 'negative': 'olumsuz', 'neutral': 'nötr'},
+    'en': {'none': 'None reported', 'date': 'Date', 'requirements': 'Requirements', 'mentions': 'mentions',
+           'sentiment': 'Overall sentiment', 'positive': 'positive', 'negative': 'negative', 'neutral': 'neutral'},
+}
+
+FENCE_RE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$', re.IGNORECASE)
+KEY_RE = re.compile(r'[\W_]+')
+
+
+def parse_structured(text: str) -> Dict[str, Any]:
+    """Model yanıtındaki JSON nesnesini oku (kod çiti ya da önsöz varsa atlanır)"""
+    text = FENCE_RE.sub('', text)
+    start, end = text.find('{'), text.rfind('}')
+    if start < 0 or end < start:
+        raise ValueError("Yanıtta JSON nesnesi yok")
+    data = json.loads(text[start:end + 1])
+    if not isinstance(data, dict):
+        raise ValueError("JSON yanıtı bir nesne değil")
+    return data
+
+
+def _key(value: Optional[str]) -> str:
+    """Birleştirme anahtarı: küçük harf, noktalama ve boşluksuz"""
+    return KEY_RE.sub('', (value or '').lower())
+
+
+def _symbol(value: Any) -> Optional[str]:
+    """Token sembolünü '$ABC' biçimine getir"""
+    if not isinstance(value, str) or not value.strip():
+        return None
+    return '$' + value.strip().lstrip('$').upper()
+
+
+def _text(value: Any) -> Dict[str, str]:
+    """TEXT alanını {'tr', 'en'} biçimine getir; düz metin her iki dile de yazılır"""
+    if isinstance(value, dict):
+        texts = {lang: str(value.get(lang) or '').strip() for lang in LANGUAGES}
+        # Model dillerden birini boş bırakırsa diğeri kullanılır
+        fallback = texts['tr'] or texts['en']
+        return {lang: texts[lang] or fallback for lang in LANGUAGES}
+    text = str(value or '').strip()
+    return {lang: text for lang in LANGUAGES}
+
+
+def _items(value: Any) -> List[Dict[str, Any]]:
+    return [item for item in value if isinstance(item, dict)] if isinstance(value, list) else []
+
+
+def _texts(value: Any) -> List[Dict[str, str]]:
+    values = value if isinstance(value, list) else [value]
+    return [text for text in map(_text, values) if text['tr']]
+
+
+def normalize_chunk(data: Dict[str, Any], tweet_count: int = 1) -> Dict[str, Any]:
+    """Tek parçanın JSON'unu eksik ve hatalı alanlara dayanıklı ortak biçime getir"""
+    sentiment = data.get('sentiment')
+    score = sentiment.get('score') if isinstance(sentiment, dict) else sentiment
+    try:
+        score = max(-1.0, min(1.0, float(score)))
+    except (TypeError, ValueError):
+        score = None
+
+    return {
+        'tweets': tweet_count,
+        'summary': _texts(data.get('summary')),
+        'projects': [
+            {'name': str(item.get('name') or '').strip(), 'token': _symbol(item.get('token')),
+             'descriptions': _texts(item.get('description'))}
+            for item in _items(data.get('projects')) if item.get('name') or item.get('token')
+        ],
+        'tokens': [
+            {'symbol': _symbol(item.get('symbol')), 'project': str(item.get('project') or '').strip(),
+             'notes': _texts(item.get('note'))}
+            for item in _items(data.get('tokens')) if _symbol(item.get('symbol'))
+        ],
+        'airdrops': [
+            {'project': str(item.get('project') or '').strip(), 'token': _symbol(item.get('token')),
+             'dates': [str(item['date']).strip()] if item.get('date') else [],
+             'requirements': _texts(item.get('requirements') or []),
+             'details': _texts(item.get('details'))}
+            for item in _items(data.get('airdrops')) if item.get('project') or item.get('token')
+        ],
+        'announcements': [
+            {'project': str(item.get('project') or '').strip(), 'date': str(item.get('date') or '').strip(),
+             'text': _text(item.get('text'))}
+            for item in _items(data.get('announcements')) if _text(item.get('text'))['tr']
+        ],
+        'sentiment': score,
+        'conclusion': _texts(data.get('conclusion')),
+    }
+
+
+def _extend_unique(target: List[Dict[str, str]], texts: List[Dict[str, str]], limit: Optional[int] = None):
+    """Metinleri (Türkçe ya da İngilizce karşılığı aynı olanları atlayarak) ekle"""
+    seen = {_key(text[lang]) for text in target for lang in LANGUAGES}
+    for text in texts:
+        if limit is not None and len(target) >= limit:
+            return
+        if not any(_key(text[lang]) in seen for lang in LANGUAGES):
+            target.append(text)
+            seen.update(_key(text[lang]) for lang in LANGUAGES)
+
+
+def merge_structured(chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Parça JSON'larını tek sonuçta birleştir.
+    Projeler ad ya da token'la, token'lar sembolle, airdrop'lar token ya da proje adıyla eşlenir;
+    koşullar ve açıklamalar birleştirilirken tekrarlar atılır. Duyarlılık, parçaların tweet
+    sayısıyla ağırlıklı ortalamasıdır. Daha önce birleştirilmiş sonuçlar da parça gibi
+    verilebilir (artımlı mod); geçme sayıları toplanır.
+    """
+    merged = {'chunks': len(chunks), 'tweets': 0, 'summary': [], 'projects': [], 'tokens': [],
+              'airdrops': [], 'announcements': [], 'sentiment': None, 'conclusion': []}
+    projects: Dict[str, Dict[str, Any]] = {}
+    tokens: Dict[str, Dict[str, Any]] = {}
+    airdrops: Dict[str, Dict[str, Any]] = {}
+    announcements = set()
+    weighted = weight = 0.0
+
+    for chunk in chunks:
+        merged['chunks'] += chunk.get('chunks', 1) - 1
+        merged['tweets'] += chunk['tweets']
+        _extend_unique(merged['summary'], chunk['summary'], MAX_SUMMARY_ITEMS)
+        _extend_unique(merged['conclusion'], chunk['conclusion'], MAX_SUMMARY_ITEMS)
+        if chunk['sentiment'] is not None:
+            weighted += chunk['sentiment'] * chunk['tweets']
+            weight += chunk['tweets']
+
+        for item in chunk['projects']:
+            keys = [key for key in (_key(item['token']), _key(item['name'])) if key]
+            entry = next((projects[key] for key in keys if key in projects), None)
+            if entry is None:
+                entry = {'name': item['name'] or item['token'], 'token': item['token'],
+                         'descriptions': [], 'mentions': 0}
+                merged['projects'].append(entry)
+            entry['mentions'] += item.get('mentions', 1)
+            entry['token'] = entry['token'] or item['token']
+            _extend_unique(entry['descriptions'], item['descriptions'], MAX_DESCRIPTIONS)
+            # Aynı proje bir parçada adıyla, diğerinde token'ıyla gelebilir; ikisi de anahtar olur
+            for key in keys:
+                projects[key] = entry
+
+        for item in chunk['tokens']:
+            entry = tokens.get(item['symbol'])
+            if entry is None:
+                entry = tokens[item['symbol']] = {'symbol': item['symbol'], 'project': item['project'],
+                                                  'notes': [], 'mentions': 0}
+                merged['tokens'].append(entry)
+            entry['mentions'] += item.get('mentions', 1)
+            entry['project'] = entry['project'] or item['project']
+            _extend_unique(entry['notes'], item['notes'], MAX_DESCRIPTIONS)
+
+        for item in chunk['airdrops']:
+            keys = [key for key in (_key(item['token']), _key(item['project'])) if key]
+            entry = next((airdrops[key] for key in keys if key in airdrops), None)
+            if entry is None:
+                entry = {'project': item['project'] or item['token'], 'token': item['token'],
+                         'dates': [], 'requirements': [], 'details': [], 'mentions': 0}
+                merged['airdrops'].append(entry)
+            entry['mentions'] += item.get('mentions', 1)
+            entry['token'] = entry['token'] or item['token']
+            entry['dates'].extend(date for date in item['dates'] if date not in entry['dates'])
+            _extend_unique(entry['requirements'], item['requirements'])
+            _extend_unique(entry['details'], item['details'], MAX_DESCRIPTIONS)
+            for key in keys:
+                airdrops[key] = entry
+
+        for item in chunk['announcements']:
+            key = _key(item['text']['en']) or _key(item['text']['tr'])
+            if key not in announcements:
+                announcements.add(key)
+                merged['announcements'].append(item)
+
+    merged['projects'].sort(key=lambda entry: -entry['mentions'])
+    merged['tokens'].sort(key=lambda entry: -entry['mentions'])
+    merged['airdrops'].sort(key=lambda entry: -entry['mentions'])
+    if weight:
+        merged['sentiment'] = round(weighted / weight, 3)
+    return merged
+
+
+def sentiment_label(score: Optional[float], lang: str) -> str:
+    labels = LABELS[lang]
+    if score is None:
+        return labels['none']
+    if score >= SENTIMENT_THRESHOLD:
+        name = 'positive'
+    elif score <= -SENTIMENT_THRESHOLD:
+        name = 'negative'
+    else:
+        name = 'neutral'
+    return f"{labels[name]} ({score:+.2f})"
+
+
+def _title(name: str, token: Optional[str]) -> str:
+    if token and _key(token) != _key(name):
+        return f"{name} ({token})"
+    return name or token or ''
+
+
+def render_markdown(merged: Dict[str, Any], lang: str) -> str:
+    """Birleşik sonucu analiz prompt'larındaki beş bölümle metne dök ('tr' ya da 'en')"""
+    labels = LABELS[lang]
+
+    def bullets(lines: List[str]) -> str:
+        return '\n'.join(f"- {line}" for line in lines) if lines else f"- {labels['none']}"
+
+    def mentions(entry: Dict[str, Any]) -> str:
+        return f" _({entry['mentions']} {labels['mentions']})_" if entry['mentions'] > 1 else ''
+
+    airdrops = []
+    for entry in merged['airdrops']:
+        line = f"**{_title(entry['project'], entry['token'])}**{mentions(entry)}"
+        if entry['dates']:
+            line += f" — {labels['date']}: {', '.join(entry['dates'])}"
+        if entry['requirements']:
+            line += f"\n  {labels['requirements']}: " + '; '.join(text[lang] for text in entry['requirements'])
+        for text in entry['details']:
+            line += f"\n  {text[lang]}"
+        airdrops.append(line)
+
+    projects = []
+    for entry in merged['projects']:
+        description = ' '.join(text[lang] for text in entry['descriptions'])
+        projects.append(f"**{_title(entry['name'], entry['token'])}**{mentions(entry)}"
+                        + (f": {description}" if description else ''))
+    # Bir projeye bağlanmış token'lar proje satırında zaten görünür
+    listed = {_key(entry['token']) for entry in merged['projects'] if entry['token']}
+    for entry in merged['tokens']:
+        if _key(entry['symbol']) in listed and not entry['notes']:
+            continue
+        note = ' '.join(text[lang] for text in entry['notes'])
+        projects.append(f"**{_title(entry['symbol'], None)}**"
+                        + (f" ({entry['project']})" if entry['project'] else '')
+                        + mentions(entry) + (f": {note}" if note else ''))
+
+    announcements = []
+    for item in merged['announcements']:
+        prefix = f"[{item['project']}] " if item['project'] else ''
+        suffix = f" ({item['date']})" if item['date'] else ''
+        announcements.append(f"{prefix}{item['text'][lang]}{suffix}")
+
+    conclusion = f"{labels['sentiment']}: {sentiment_label(merged['sentiment'], lang)}"
+    if merged['conclusion']:
+        conclusion += '\n' + bullets([text[lang] for text in merged['conclusion']])
+
+    bodies = (
+        bullets([text[lang] for text in merged['summary']]),
+        bullets(airdrops),
+        bullets(projects),
+        bullets(announcements),
+        conclusion,
+    )
+    return '\n\n'.join(
+        f"{n}. {title}\n{body}" for n, (title, body) in enumerate(zip(SECTION_TITLES[lang], bodies), 1)
+    )
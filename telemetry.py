@@ -0,0 +1,175 @@
+"""
+Analiz çalıştırmaları için aşama süreleri ve model çağrısı telemetrisi.
+Aşamalar `span()` ile, her model çağrısı `record_call()` ile kaydedilir; sonuç JSON ya da
+Prometheus metin biçiminde dışa aktarılabilir.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+METRIC_PREFIX = 'tweet_analyzer'
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+class Telemetry:
+    """İş parçacığı güvenli aşama ve çağrı kayıtçısı"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = datetime.now().isoformat(timespec='seconds')
+            self._origin = time.perf_counter()
+            self.spans: List[Dict[str, Any]] = []
+            self.calls: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Bir aşamanın süresini ölç"""
+        started = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            record = {
+                'name': name,
+                'start': round(started - self._origin, 6),
+                'seconds': round(time.perf_counter() - started, 6),
+                **attributes,
+            }
+            if error:
+                record['error'] = error
+            with self._lock:
+                self.spans.append(record)
+
+    def record_call(self, kind: str, prompt_chars: int, prompt_tokens: int, response_chars: int,
+                    latency: float, retries: int = 0, cached: bool = False, error: Optional[str] = None,
+                    first_token: Optional[float] = None):
+        """Tek bir model çağrısını kaydet (akışlı çağrılarda ilk parçanın gelme süresiyle)"""
+        record = {
+            'kind': kind,
+            'prompt_chars': prompt_chars,
+            'prompt_tokens': prompt_tokens,
+            'response_chars': response_chars,
+            'latency': round(latency, 6),
+            'retries': retries,
+            'cached': cached,
+        }
+        if error:
+            record['error'] = error
+        if first_token is not None:
+            record['first_token'] = round(first_token, 6)
+        with self._lock:
+            self.calls.append(record)
+
+    def summary(self) -> Dict[str, Any]:
+        """Aşama ve çağrı bazında toplulaştırılmış özet"""
+        with self._lock:
+            spans, calls = list(self.spans), list(self.calls)
+
+        stages: Dict[str, Dict[str, float]] = {}
+        for span in spans:
+            stage = stages.setdefault(span['name'], {'count': 0, 'seconds': 0.0})
+            stage['count'] += 1
+            stage['seconds'] = round(stage['seconds'] + span['seconds'], 6)
+
+        kinds: Dict[str, Dict[str, Any]] = {}
+        for kind in sorted({call['kind'] for call in calls}):
+            subset = [call for call in calls if call['kind'] == kind]
+            live = [call['latency'] for call in subset if not call['cached']]
+            first_tokens = [call['first_token'] for call in subset if 'first_token' in call]
+            kinds[kind] = {
+                'calls': len(subset),
+                'cached': sum(call['cached'] for call in subset),
+                'errors': sum(1 for call in subset if call.get('error')),
+                'retries': sum(call['retries'] for call in subset),
+                'prompt_chars': sum(call['prompt_chars'] for call in subset),
+                'prompt_tokens': sum(call['prompt_tokens'] for call in subset),
+                'response_chars': sum(call['response_chars'] for call in subset),
+                'latency_p50': round(_percentile(live, 0.5), 4),
+                'latency_p95': round(_percentile(live, 0.95), 4),
+                'latency_max': round(max(live, default=0.0), 4),
+            }
+            if first_tokens:
+                kinds[kind]['first_token_p50'] = round(_percentile(first_tokens, 0.5), 4)
+                kinds[kind]['first_token_p95'] = round(_percentile(first_tokens, 0.95), 4)
+        return {'stages': stages, 'calls': kinds}
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            spans, calls = list(self.spans), list(self.calls)
+        return {
+            'started_at': self.started_at,
+            'summary': self.summary(),
+            'spans': spans,
+            'calls': calls,
+        }
+
+    def to_prometheus(self) -> str:
+        """Prometheus metin açıklama biçiminde döküm"""
+        summary = self.summary()
+        lines = [
+            f"# HELP {METRIC_PREFIX}_stage_seconds_total Aşamalarda geçen toplam süre",
+            f"# TYPE {METRIC_PREFIX}_stage_seconds_total counter",
+        ]
+        for name, stage in summary['stages'].items():
+            lines.append(f'{METRIC_PREFIX}_stage_seconds_total{{stage="{name}"}} {stage["seconds"]}')
+        lines += [
+            f"# HELP {METRIC_PREFIX}_stage_runs_total Aşamanın çalışma sayısı",
+            f"# TYPE {METRIC_PREFIX}_stage_runs_total counter",
+        ]
+        for name, stage in summary['stages'].items():
+            lines.append(f'{METRIC_PREFIX}_stage_runs_total{{stage="{name}"}} {stage["count"]}')
+
+        counters = [
+            ('llm_calls_total', 'calls', 'Model çağrısı sayısı'),
+            ('llm_cache_hits_total', 'cached', 'Önbellekten dönen çağrılar'),
+            ('llm_errors_total', 'errors', 'Başarısız çağrılar'),
+            ('llm_retries_total', 'retries', 'Yeniden denemeler'),
+            ('llm_prompt_tokens_total', 'prompt_tokens', 'Tahmini prompt token sayısı'),
+            ('llm_prompt_chars_total', 'prompt_chars', 'Prompt karakter sayısı'),
+            ('llm_response_chars_total', 'response_chars', 'Yanıt karakter sayısı'),
+        ]
+        for metric, key, help_text in counters:
+            lines.append(f"# HELP {METRIC_PREFIX}_{metric} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{metric} counter")
+            for kind, stats in summary['calls'].items():
+                lines.append(f'{METRIC_PREFIX}_{metric}{{kind="{kind}"}} {stats[key]}')
+
+        lines.append(f"# HELP {METRIC_PREFIX}_llm_latency_seconds Önbellek dışı çağrı gecikmesi")
+        lines.append(f"# TYPE {METRIC_PREFIX}_llm_latency_seconds summary")
+        for kind, stats in summary['calls'].items():
+            lines.append(f'{METRIC_PREFIX}_llm_latency_seconds{{kind="{kind}",quantile="0.5"}} {stats["latency_p50"]}')
+            lines.append(f'{METRIC_PREFIX}_llm_latency_seconds{{kind="{kind}",quantile="0.95"}} {stats["latency_p95"]}')
+
+        streamed = {kind: stats for kind, stats in summary['calls'].items() if 'first_token_p50' in stats}
+        if streamed:
+            lines.append(f"# HELP {METRIC_PREFIX}_llm_first_token_seconds Akışlı çağrılarda ilk parçaya kadar geçen süre")
+            lines.append(f"# TYPE {METRIC_PREFIX}_llm_first_token_seconds summary")
+            for kind, stats in streamed.items():
+                lines.append(f'{METRIC_PREFIX}_llm_first_token_seconds{{kind="{kind}",quantile="0.5"}} {stats["first_token_p50"]}')
+                lines.append(f'{METRIC_PREFIX}_llm_first_token_seconds{{kind="{kind}",quantile="0.95"}} {stats["first_token_p95"]}')
+        return '\n'.join(lines) + '\n'
+
+    def write_json(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+    def write_prometheus(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+# Modüller depo kökünde düz duruyor
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def analyzer(tmp_path, monkeypatch):
+    """Geçici dizinde çalışan, sessiz ve gecikmesiz sahte modelli analizci"""
+    from rich.console import Console
+
+    from analyzer import TweetAnalyzer
+    from llm_backends import FakeBackend
+
+    monkeypatch.chdir(tmp_path)
+    instance = TweetAnalyzer(backend=FakeBackend(latency_mean=0, latency_jitter=0))
+    instance.console = Console(quiet=True)
+    instance.config.RATE_LIMIT_RPM = 0
+    instance.config.RATE_LIMIT_TPM = 0
+    instance.config.STREAM_OUTPUT = False
+    return instance
@@ -0,0 +1,161 @@
+import threading
+import time
+
+import pytest
+
+from analyzer import AnalysisCancelled
+from llm_backends import FakeBackend
+from tokens import estimate_tokens
+
+
+class RecordingBackend(FakeBackend):
+    """Gönderilen prompt'ları saklayan sahte model"""
+
+    def __init__(self):
+        super().__init__(latency_mean=0, latency_jitter=0)
+        self.prompts = []
+
+    def render(self, prompt):
+        with self._lock:
+            self.prompts.append(prompt)
+        return super().render(prompt)
+
+
+def make_tweets(count):
+    projects = [('LayerZero', 'ZRO'), ('Starknet', 'STRK'), ('Celestia', 'TIA'), ('Jupiter', 'JUP')]
+    return [
+        {'username': f'user_{i}', 'timestamp': f'2025-01-01T{i % 24:02d}:00:00Z',
+         'text': f"{projects[i % 4][0]} ${projects[i % 4][1]} airdrop round {i}: bridge {i * 7} USDT before 12.06.2025 #{projects[i % 4][0]}"}
+        for i in range(count)
+    ]
+
+
+def use_backend(analyzer, backend):
+    analyzer.model = backend
+    analyzer.config.CACHE_ENABLED = False
+    analyzer.config.DEDUP_ENABLED = False
+    analyzer.config.CHUNKING_MODE = 'count'
+    analyzer.config.CHUNK_SIZE = 5
+    analyzer.config.COMBINE_FAN_IN = 2
+    return backend
+
+
+def test_bilingual_merge_gets_both_languages(analyzer):
+    backend = use_backend(analyzer, RecordingBackend())
+    results = analyzer.analyze_tweets(make_tweets(20), 'both')
+
+    merges = [prompt for prompt in backend.prompts if 'Türkçe parçalar / Turkish parts:' in prompt]
+    # 4 parça, 2'li birleştirme: 2 + 1 çağrı
+    assert len(merges) == 3
+    for prompt in merges:
+        turkish, english = prompt.split('İngilizce parçalar / English parts:', 1)
+        assert 'GENEL ÖZET' in turkish and 'GENERAL SUMMARY' not in turkish
+        assert 'GENERAL SUMMARY' in english and 'GENEL ÖZET' not in english
+    assert results['turkish'].startswith('1. GENEL ÖZET')
+    assert results['english'].startswith('1. GENERAL SUMMARY')
+
+
+def test_concurrent_chunks_match_sequential_run(analyzer):
+    tweets = make_tweets(30)
+    use_backend(analyzer, FakeBackend(latency_mean=0.01, latency_jitter=0.01, seed=1))
+    analyzer.config.MAX_CONCURRENT_REQUESTS = 1
+    sequential = analyzer.analyze_tweets(tweets, 'both')
+
+    use_backend(analyzer, FakeBackend(latency_mean=0.01, latency_jitter=0.01, seed=2))
+    analyzer.config.MAX_CONCURRENT_REQUESTS = 4
+    concurrent = analyzer.analyze_tweets(tweets, 'both')
+    assert concurrent == sequential
+
+
+def test_run_concurrently_keeps_input_order(analyzer):
+    analyzer.config.MAX_CONCURRENT_REQUESTS = 4
+    done = []
+    results = analyzer._run_concurrently(lambda n: time.sleep(0.01 * (5 - n)) or n * n, list(range(5)),
+                                         on_done=lambda i, result: done.append(i))
+    assert results == [0, 1, 4, 9, 16]
+    assert sorted(done) == list(range(5))
+
+
+def test_progress_callback_and_cancel(analyzer):
+    use_backend(analyzer, FakeBackend(latency_mean=0, latency_jitter=0))
+    calls = []
+    analyzer.analyze_tweets(make_tweets(20), 'turkish',
+                            progress_callback=lambda done, total, lang, result: calls.append((done, total, lang)))
+    assert [done for done, _, _ in calls] == [1, 2, 3, 4]
+    assert {(total, lang) for _, total, lang in calls} == {(4, 'turkish')}
+
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(AnalysisCancelled):
+        analyzer.analyze_tweets(make_tweets(20), 'turkish', cancel_event=cancel)
+
+
+@pytest.mark.parametrize('prompt_format', ['compact', 'verbose'])
+def test_pack_tweets_fills_budget_in_order(analyzer, prompt_format):
+    analyzer.config.PROMPT_FORMAT = prompt_format
+    tweets = make_tweets(60)
+    budget = 400
+    chunks = analyzer.pack_tweets(tweets, budget)
+
+    assert [tweet for chunk in chunks for tweet in chunk] == tweets
+    assert len(chunks) > 1
+    assert max(estimate_tokens(analyzer.format_tweets_for_analysis(chunk)) for chunk in chunks) <= budget
+
+    def planned(chunk):
+        return analyzer.prompt_overhead() + sum(analyzer.tweet_cost(i, tweet) + 1 for i, tweet in enumerate(chunk, 1))
+
+    # Parçalar açgözlü dolar: bir sonraki parçanın ilk tweet'i öncekine sığmıyordu
+    for chunk, following in zip(chunks, chunks[1:]):
+        assert planned(chunk) <= budget < planned(chunk + following[:1])
+
+
+def test_oversized_tweet_gets_its_own_chunk(analyzer):
+    tweets = make_tweets(3)
+    tweets[1] = {**tweets[1], 'text': 'airdrop ' * 400}
+    chunks = analyzer.pack_tweets(tweets, 200)
+    assert [len(chunk) for chunk in chunks] == [1, 1, 1]
+
+
+def test_count_mode_uses_fixed_chunk_size(analyzer):
+    analyzer.config.CHUNKING_MODE = 'count'
+    analyzer.config.CHUNK_SIZE = 7
+    analyzer.config.DEDUP_ENABLED = False
+    assert [len(chunk) for chunk in analyzer.prepare_chunks(make_tweets(20))] == [7, 7, 6]
+
+
+def test_tree_merge_respects_fan_in(analyzer):
+    backend = use_backend(analyzer, RecordingBackend())
+    analyzer.config.COMBINE_FAN_IN = 3
+    result = analyzer.combine_analyses([f"Parça {i} $ZRO" for i in range(10)], 'english')
+
+    merges = backend.prompts
+    # 10 -> 4 (3 çağrı, tek kalan grup çağrısız geçer) -> 2 (1 çağrı) -> 1 (1 çağrı)
+    assert len(merges) == 5
+    # İlk seviye yalnızca parçaları görür; tek kalan son parça köke kadar olduğu gibi taşınır
+    first_level = [prompt for prompt in merges if 'GENERAL SUMMARY' not in prompt]
+    assert [sum(f"Parça {i} " in prompt for i in range(10)) for prompt in first_level] == [3, 3, 3]
+    assert 'Parça 9 ' in merges[-1] and 'Parça 9 ' not in ''.join(first_level)
+    assert result.startswith('1. GENERAL SUMMARY')
+
+
+def test_single_analysis_needs_no_merge(analyzer):
+    backend = use_backend(analyzer, RecordingBackend())
+    assert analyzer.combine_analyses(['tek parça'], 'turkish') == 'tek parça'
+    assert backend.prompts == []
+
+
+@pytest.mark.parametrize('count', [5, 20])
+def test_stream_partials_build_up_to_final_result(analyzer, count):
+    use_backend(analyzer, FakeBackend(latency_mean=0, latency_jitter=0))
+    expected = analyzer.analyze_tweets(make_tweets(count), 'both')
+
+    analyzer.config.STREAM_OUTPUT = True
+    snapshots = []
+    results = analyzer.analyze_tweets(make_tweets(count), 'both', on_partial=snapshots.append)
+    assert results == expected
+    assert len(snapshots) > 1
+    # Her anlık görüntü, son metnin bir önekidir
+    for snapshot in snapshots:
+        for lang, text in snapshot.items():
+            assert results[lang].startswith(text.rstrip())
+    assert snapshots[-1] == {'turkish': results['turkish'], 'english': results['english']}
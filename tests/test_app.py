@@ -0,0 +1,70 @@
+import io
+import json
+
+import pytest
+
+streamlit = pytest.importorskip('streamlit')
+app = pytest.importorskip('app')
+
+
+class Upload(io.BytesIO):
+    """Streamlit UploadedFile yerine geçen bellek içi dosya"""
+
+    def __init__(self, data, file_id):
+        super().__init__(data)
+        self.file_id = file_id
+
+
+@pytest.fixture
+def upload_session():
+    app.st.session_state.upload_digests = {}
+    app.st.cache_resource.clear()
+    yield
+    app.st.cache_resource.clear()
+
+
+def test_upload_digest_depends_on_content(upload_session):
+    data = json.dumps([{'text': '$ZRO airdrop'}]).encode()
+    first = app.uploaded_file_digest(Upload(data, 'a'))
+    assert app.uploaded_file_digest(Upload(data, 'b')) == first
+    assert app.uploaded_file_digest(Upload(b'[]', 'c')) != first
+    # Aynı yükleme tekrar hashlenmez
+    assert app.uploaded_file_digest(Upload(b'[]', 'a')) == first
+
+
+def test_upload_parsed_once_per_digest(upload_session):
+    upload = Upload(json.dumps([{'text': '$ZRO airdrop'}]).encode(), 'a')
+    digest = app.uploaded_file_digest(upload)
+    tweets, stats = app.parse_uploaded_tweets(digest, upload)
+    assert tweets == [{'text': '$ZRO airdrop'}]
+    # Aynı özet için dosya yeniden okunmaz, önbellekteki nesne döner
+    assert app.parse_uploaded_tweets(digest, Upload(b'bozuk', 'a'))[0] is tweets
+    frame = app.get_tweet_dataframe(digest, tweets)
+    assert app.get_tweet_dataframe(digest, []) is frame
+    assert app.get_tweet_stats(digest, tweets) is app.get_tweet_stats(digest, [])
+    assert app.get_entity_index(digest, tweets) is app.get_entity_index(digest, [])
+
+
+def test_offline_backend_needs_no_api_key(upload_session, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(app, 'get_api_key', lambda: None)
+    monkeypatch.setattr(app.Config, 'LLM_BACKEND', 'fake')
+    assert not app.api_key_required()
+    analyzer = app.setup_analyzer()
+    assert analyzer is not None
+    assert analyzer.model.name == 'fake'
+    # Gemini için anahtar hâlâ zorunlu
+    monkeypatch.setattr(app.Config, 'LLM_BACKEND', 'gemini')
+    assert app.api_key_required()
+    assert app.setup_analyzer() is None
+
+
+def test_runs_saved_only_when_opted_in(analyzer):
+    settings = {'max_tweets': 50, 'chunk_tokens': 4000, 'chunk_size': None, 'structured': False,
+                'reuse_runs': True, 'save_runs': app.Config.UI_SAVE_RESULTS, 'entities': []}
+    app.configure_analyzer(analyzer, settings)
+    assert not analyzer.config.SAVE_RESULTS
+    assert not analyzer.config.EXPORT_TEXT_FILES
+    app.configure_analyzer(analyzer, dict(settings, save_runs=True))
+    assert analyzer.config.SAVE_RESULTS
+    assert not analyzer.config.EXPORT_TEXT_FILES
@@ -0,0 +1,54 @@
+import json
+
+
+def write_json(path, tweets):
+    path.write_text(json.dumps(tweets, ensure_ascii=False), encoding='utf-8')
+    return str(path)
+
+
+TWEETS = [
+    {'username': 'alice', 'text': 'LayerZero $ZRO airdrop snapshot next week #airdrop', 'timestamp': '2025-01-01T10:00:00Z'},
+    {'username': 'bob', 'text': 'Starknet $STRK staking rewards are live, claim before 12.06.2025', 'timestamp': '2025-01-01T11:00:00Z'},
+]
+
+
+def test_batch_reports_corrupt_file_as_error(analyzer, tmp_path):
+    good = write_json(tmp_path / 'good.json', TWEETS)
+    corrupt = tmp_path / 'corrupt.json'
+    corrupt.write_text(json.dumps(TWEETS)[:-20], encoding='utf-8')
+    empty = write_json(tmp_path / 'empty.json', [])
+
+    index = analyzer.analyze_batch([good, str(corrupt), empty], 'turkish')
+    entries = {entry['file']: entry for entry in index['files']}
+
+    assert entries[good]['status'] == 'ok'
+    assert entries[str(corrupt)]['status'] == 'error'
+    assert 'JSON dosyası bozuk' in entries[str(corrupt)]['error']
+    assert entries[empty]['status'] == 'empty'
+    assert entries[empty]['error'] is None
+
+
+def test_batch_reports_missing_file_as_error(analyzer, tmp_path):
+    missing = str(tmp_path / 'missing.json')
+    entry = analyzer.analyze_batch([missing], 'turkish')['files'][0]
+    assert entry['status'] == 'error'
+    assert 'Dosya bulunamadı' in entry['error']
+
+
+def test_expand_inputs_handles_dirs_globs_and_missing(tmp_path):
+    from main import expand_inputs
+
+    folder = tmp_path / 'in'
+    folder.mkdir()
+    b = write_json(folder / 'b.json', TWEETS)
+    a = write_json(folder / 'a.JSONL', TWEETS)
+    (folder / 'notes.txt').write_text('x', encoding='utf-8')
+    nested = folder / 'sub'
+    nested.mkdir()
+    c = write_json(nested / 'c.json', TWEETS)
+    missing = str(tmp_path / 'yok.json')
+
+    files, absent = expand_inputs([str(folder), b, str(tmp_path / '**' / '*.json'), missing, str(tmp_path / '*.csv')])
+    # Dizin yalnızca kendi düzeyindeki girdileri verir; tekrarlar bir kez sayılır
+    assert files == [a, b, c]
+    assert absent == [missing, str(tmp_path / '*.csv')]
@@ -0,0 +1,30 @@
+import pytest
+
+from benchmark import generate_tweets, percentiles, write_tweets
+from tweet_loader import LoadStats, iter_tweets, validate_tweet
+
+
+def test_generated_corpus_is_deterministic_and_valid():
+    tweets = generate_tweets(500, seed=7)
+    assert tweets == generate_tweets(500, seed=7)
+    assert tweets != generate_tweets(500, seed=8)
+    assert all(validate_tweet(tweet) is None for tweet in tweets)
+    # Kopyalar: aynı metin birden çok kez geçer
+    assert len({tweet['text'] for tweet in tweets}) < len(tweets)
+
+
+@pytest.mark.parametrize('name', ['corpus.json', 'corpus.jsonl'])
+def test_written_corpus_loads_back(tmp_path, name):
+    tweets = generate_tweets(200)
+    path = str(tmp_path / name)
+    write_tweets(tweets, path)
+    stats = LoadStats()
+    assert list(iter_tweets(path, stats)) == tweets
+    assert stats.format == name.rsplit('.', 1)[1]
+
+
+def test_percentiles():
+    result = percentiles([float(value) for value in range(1, 101)])
+    assert (result['min'], result['p50'], result['p90'], result['max']) == (1, 51, 90, 100)
+    assert result['mean'] == pytest.approx(50.5)
+    assert percentiles([]) == {}
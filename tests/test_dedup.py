@@ -0,0 +1,52 @@
+from benchmark import generate_tweets
+from dedup import SHINGLE_SIZE, deduplicate_tweets, find_duplicate_groups, normalize_text
+
+
+def shingles(text):
+    text = normalize_text(text).ljust(SHINGLE_SIZE)
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def jaccard(first, second):
+    first, second = shingles(first), shingles(second)
+    return len(first & second) / len(first | second)
+
+
+def test_near_copies_collapse():
+    text = "🚨 HUGE AIRDROP! LayerZero ($ZRO) mainnet coming in March! Bridge txs, 5+ chains #Airdrop"
+    tweets = [{'text': text}, {'text': text + " 🔥"}, {'text': "RT @shill: " + text}]
+    unique, removed = deduplicate_tweets(tweets)
+    assert len(unique) == 1 and len(removed) == 2
+    assert unique[0]['duplicate_count'] == 3
+
+
+def test_templates_with_different_projects_stay_apart():
+    # Metinler eşiğin üstünde benzer; yalnızca proje adı ve token farklı
+    template = ("{name} just announced a new yield farm with 425% APY 🔥 Lock period: 30 days, rewards paid in "
+                "${symbol} every epoch, no minimum deposit, withdrawals open after the lock ends. "
+                "Bridge from Ethereum or Arbitrum to join the campaign early.")
+    texts = [template.format(name='Starknet', symbol='STRK'), template.format(name='Celestia', symbol='TIA')]
+    assert jaccard(*texts) >= 0.8
+    assert find_duplicate_groups(texts) == [0, 1]
+
+
+def test_mentions_must_match():
+    texts = ["Points program is live, farm early and bridge before the snapshot @layerzero_labs",
+             "Points program is live, farm early and bridge before the snapshot @celestiaorg"]
+    assert find_duplicate_groups(texts) == [0, 1]
+
+
+def test_groups_do_not_chain_past_threshold():
+    texts = [tweet['text'] for tweet in generate_tweets(2000)]
+    representatives = find_duplicate_groups(texts, threshold=0.8)
+    assert len(set(representatives)) > 1
+    for i, representative in enumerate(representatives):
+        assert representative <= i
+        if representative != i:
+            assert jaccard(texts[i], texts[representative]) >= 0.8
+
+
+def test_texts_empty_after_normalization_stay_apart():
+    assert find_duplicate_groups(['🚀🚀', 'https://x.co/a', '🔥', 'real text here', '']) == [0, 1, 2, 3, 4]
+    unique, removed = deduplicate_tweets([{'text': '🚀🚀'}, {'text': '🔥'}])
+    assert len(unique) == 2 and removed == []
@@ -0,0 +1,55 @@
+import numpy as np
+
+from entities import build_entity_index, index_tweets
+
+TWEETS = [
+    {'text': 'LayerZero $ZRO airdrop, $zro bridge #LayerZero', 'timestamp': '2024-06-01T10:00:00Z'},
+    {'text': 'mail me at a@b.com, pay 5$ or $$ZRO, a#b, #2024', 'timestamp': '2024-06-01T11:00:00Z'},
+    {'text': '@LayerZero_Labs says $STRK and $ZRO', 'timestamp': 'bozuk'},
+    {'text': 'Starknet #layerzero $STRK', 'timestamp': '2024-06-03T12:00:00Z'},
+]
+
+
+def test_index_counts_mentions_tweets_and_times():
+    index = index_tweets(TWEETS)
+    assert len(index) == 4 and index.size == 4
+    top = index.top()
+    assert list(top['entity']) == ['$ZRO', '#layerzero', '$STRK', '@layerzero_labs']
+    assert list(top['mentions']) == [3, 2, 2, 1]
+    assert list(top['tweets']) == [2, 2, 2, 1]
+    zro = top.iloc[0]
+    # Zamanı okunamayan tweet ilk/son görülmeyi etkilemez
+    assert str(zro['first_seen']) == str(zro['last_seen']) == '2024-06-01 10:00:00+00:00'
+    assert list(index.top(kind='cashtag')['entity']) == ['$ZRO', '$STRK']
+    assert list(index.top(1)['entity']) == ['$ZRO']
+
+
+def test_rows_resolve_and_match():
+    index = index_tweets(TWEETS)
+    assert index.rows('$zro').tolist() == [0, 2]
+    assert index.rows('$TIA').tolist() == []
+    assert '$Zro' in index and '#2024' not in index
+    # İşaretsiz ad cashtag, hashtag ve kullanıcı adı olarak aranır
+    assert index.resolve(['layerzero', '$strk', '$TIA']) == ['#layerzero', '$STRK']
+    assert index.match(['$ZRO, #layerzero']).tolist() == [0, 2, 3]
+    assert index.match(['$TIA']).tolist() == []
+    assert index.select(TWEETS, ['@layerzero_labs']) == [TWEETS[2]]
+
+
+def test_separator_inside_text_and_empty_input():
+    index = build_entity_index(['a\x00$ZRO', '$ZRO'])
+    assert index.rows('$ZRO').tolist() == [0, 1]
+    assert np.isnan(index.first_seen).all()
+    empty = build_entity_index([])
+    assert len(empty) == 0 and empty.match(['$ZRO']).tolist() == []
+
+
+def test_analyzer_filters_by_entities(analyzer):
+    analyzer.config.ENTITY_FILTER = ['$strk']
+    analyzer.config.DEDUP_ENABLED = False
+    assert analyzer.filter_by_entities(TWEETS) == [TWEETS[2], TWEETS[3]]
+    chunks = analyzer.prepare_chunks(TWEETS)
+    assert [tweet for chunk in chunks for tweet in chunk] == [TWEETS[2], TWEETS[3]]
+
+    analyzer.config.ENTITY_FILTER = ['$TIA']
+    assert analyzer.analyze_tweets(TWEETS, 'turkish') == {'error': "Seçilen varlıkların geçtiği tweet bulunamadı"}
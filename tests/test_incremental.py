@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+import incremental
+from incremental import IncrementalState, tweet_id
+
+
+def tweet(text, timestamp=None):
+    return {'username': 'alice', 'text': text, 'timestamp': timestamp}
+
+
+def test_only_new_tweets_pass(tmp_path):
+    state = IncrementalState(str(tmp_path / 'state.json'), lookback_seconds=3600)
+    first = [tweet('a', '2025-01-01T10:00:00Z'), tweet('b', '2025-01-01T12:00:00Z')]
+    state.update(first, {'turkish': 'tr', 'english': 'en', 'other': 'x'})
+    state.save()
+
+    state = IncrementalState(str(tmp_path / 'state.json'), lookback_seconds=3600)
+    assert state.results == {'turkish': 'tr', 'english': 'en'}
+    assert not state.is_new(first[1])
+    # Filigranın geri bakış penceresinden eski tweet görülmüş sayılır
+    assert not state.is_new(tweet('c', '2025-01-01T09:00:00Z'))
+    assert state.is_new(tweet('d', '2025-01-01T11:30:00Z'))
+    # 10:00 tweet'i pencerenin dışında kaldığı için kimliği budandı
+    assert tweet_id(first[0]) not in state.seen
+
+
+def test_untimed_ids_are_capped(tmp_path):
+    state = IncrementalState(str(tmp_path / 'state.json'), max_untimed=3)
+    for cycle in range(4):
+        batch = [tweet(f'untimed {cycle}-{i}') for i in range(2)] + [tweet(f'timed {cycle}', '2025-01-01T10:00:00Z')]
+        state.update(batch, {})
+    untimed = [key for key, moment in state.seen.items() if moment is None]
+    assert len(untimed) == 3
+    # En yeniler kalır
+    assert untimed[-1] == tweet_id(tweet('untimed 3-1'))
+    assert tweet_id(tweet('untimed 0-0')) not in state.seen
+
+
+
+def test_unchanged_json_array_is_not_reread(tmp_path, monkeypatch):
+    source = tmp_path / 'tweets.json'
+    source.write_text(json.dumps([tweet('a', '2025-01-01T10:00:00Z')]), encoding='utf-8')
+    state = IncrementalState(str(tmp_path / 'state.json'))
+    new = state.read_new_tweets(str(source))
+    assert [t['text'] for t in new] == ['a']
+    state.update(new, {})
+    state.save()
+
+    state = IncrementalState(str(tmp_path / 'state.json'))
+    with monkeypatch.context() as patch:
+        patch.setattr(incremental, 'iter_tweets', lambda *args: pytest.fail("değişmeyen dosya yeniden okundu"))
+        assert state.read_new_tweets(str(source)) == []
+
+    source.write_text(json.dumps([tweet('a', '2025-01-01T10:00:00Z'), tweet('b', '2025-01-01T11:00:00Z')]),
+                      encoding='utf-8')
+    assert [t['text'] for t in state.read_new_tweets(str(source))] == ['b']
+
+
+def test_deferred_tweets_are_carried_over(tmp_path):
+    source = tmp_path / 'tweets.jsonl'
+    batch = [tweet(f'tweet {i}', f'2025-01-01T10:0{i}:00Z') for i in range(4)]
+    source.write_text(''.join(json.dumps(t) + '\n' for t in batch), encoding='utf-8')
+    state = IncrementalState(str(tmp_path / 'state.json'))
+    new = state.read_new_tweets(str(source))
+    state.update(new, {}, deferred=new[:2])
+    state.save()
+
+    state = IncrementalState(str(tmp_path / 'state.json'))
+    assert state.total_tweets == 2
+    assert not state.is_new(batch[3])
+    # Ofset ilerlemiş olsa da ertelenenler sonraki döngüde yeniden gelir
+    with open(source, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(tweet('tweet 4', '2025-01-01T10:04:00Z')) + '\n')
+    assert [t['text'] for t in state.read_new_tweets(str(source))] == ['tweet 0', 'tweet 1', 'tweet 4']
+
+
+def test_analyze_incremental_keeps_tweets_over_the_limit(analyzer, tmp_path):
+    analyzer.config.DEDUP_ENABLED = False
+    analyzer.config.MAX_TWEETS_PER_ANALYSIS = 3
+    source = tmp_path / 'tweets.jsonl'
+    batch = [{'username': f'user{i}', 'text': f'$ZRO airdrop {i}', 'timestamp': f'2025-01-01T10:0{i}:00Z'}
+             for i in range(5)]
+    source.write_text(''.join(json.dumps(t) + '\n' for t in batch), encoding='utf-8')
+
+    assert analyzer.analyze_incremental(str(source), 'turkish')
+    state = IncrementalState.for_source(analyzer.config.RESULTS_DIR, str(source))
+    assert (state.total_tweets, len(state.pending)) == (3, 2)
+    assert analyzer.analyze_incremental(str(source), 'turkish')
+    state = IncrementalState.for_source(analyzer.config.RESULTS_DIR, str(source))
+    assert (state.total_tweets, state.pending) == (5, [])
+    assert not analyzer.analyze_incremental(str(source), 'turkish')
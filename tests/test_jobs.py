@@ -0,0 +1,140 @@
+import json
+import threading
+import time
+
+from jobs import CANCELLED, DONE, FAILED, INTERRUPTED, RUNNING, Job, JobManager
+from llm_backends import FakeBackend
+
+
+def wait_for(job, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not job.finished:
+        assert time.monotonic() < deadline, f"iş bitmedi: {job.status}"
+        time.sleep(0.01)
+    return job
+
+
+def make_tweets(count):
+    return [{'username': f'user_{i}', 'text': f"$ZRO airdrop round {i}"} for i in range(count)]
+
+
+class BlockingBackend(FakeBackend):
+    """İlk çağrıda serbest bırakılana kadar bekleyen sahte model"""
+
+    def __init__(self):
+        super().__init__(latency_mean=0, latency_jitter=0)
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def render(self, prompt):
+        self.started.set()
+        self.release.wait(10)
+        return super().render(prompt)
+
+
+def use_chunks(analyzer, size=5):
+    analyzer.config.DEDUP_ENABLED = False
+    analyzer.config.CHUNKING_MODE = 'count'
+    analyzer.config.CHUNK_SIZE = size
+
+
+def test_job_runs_to_completion_and_is_saved(analyzer, tmp_path):
+    use_chunks(analyzer)
+    jobs_dir = str(tmp_path / 'jobs')
+    manager = JobManager(jobs_dir=jobs_dir)
+    job = wait_for(manager.get(manager.submit(analyzer, make_tweets(12), 'turkish', label='a.json')))
+
+    assert job.status == DONE, job.error
+    assert job.results['turkish'] and 'english' not in job.results
+    assert (job.completed_chunks, job.total_chunks) == (3, 3)
+    assert len(job.chunk_results) == 3
+    assert job.metrics is not None
+    assert analyzer.get_results_store().list_runs()[0]['source'] == 'a.json'
+
+    # Yeni süreç aynı iş kimliğiyle sonuca ulaşır; son durum yazımı iş parçacığında biter
+    manager._executor.shutdown(wait=True)
+    reloaded = JobManager(jobs_dir=jobs_dir).get(job.id)
+    assert (reloaded.status, reloaded.results) == (DONE, job.results)
+
+
+def test_failed_analysis_marks_job_failed(analyzer, tmp_path):
+    manager = JobManager(jobs_dir=str(tmp_path / 'jobs'))
+    job = wait_for(manager.get(manager.submit(analyzer, [], 'turkish')))
+    assert job.status == FAILED
+    assert job.error == "Analiz edilecek tweet bulunamadı"
+
+
+def test_cancel_queued_and_running_jobs(analyzer, tmp_path):
+    backend = analyzer.model = BlockingBackend()
+    analyzer.config.CACHE_ENABLED = False
+    analyzer.config.MAX_CONCURRENT_REQUESTS = 1
+    use_chunks(analyzer)
+    manager = JobManager(max_workers=1, jobs_dir=str(tmp_path / 'jobs'))
+    running = manager.get(manager.submit(analyzer, make_tweets(60), 'turkish'))
+    queued = manager.get(manager.submit(analyzer, make_tweets(5), 'turkish'))
+    assert backend.started.wait(10)
+
+    assert manager.cancel(queued.id) and manager.cancel(running.id)
+    backend.release.set()
+    assert wait_for(running).status == CANCELLED
+    assert wait_for(queued).status == CANCELLED
+    assert queued.started_at is None
+    assert not manager.cancel(running.id)
+
+
+def test_unfinished_jobs_are_marked_interrupted_on_load(tmp_path):
+    jobs_dir = tmp_path / 'jobs'
+    jobs_dir.mkdir()
+    job = Job('abc123', 'turkish', 10)
+    job.status = RUNNING
+    (jobs_dir / 'abc123.json').write_text(json.dumps(job.to_dict()), encoding='utf-8')
+    (jobs_dir / 'broken.json').write_text('{', encoding='utf-8')
+
+    manager = JobManager(jobs_dir=str(jobs_dir))
+    assert [job.id for job in manager.list_jobs()] == ['abc123']
+    assert manager.get('abc123').status == INTERRUPTED
+    saved = json.loads((jobs_dir / 'abc123.json').read_text(encoding='utf-8'))
+    assert saved['status'] == INTERRUPTED and saved['finished_at']
+
+
+def test_history_is_pruned_to_limit(analyzer, tmp_path):
+    jobs_dir = tmp_path / 'jobs'
+    ids = []
+    for i in range(4):
+        # Her gönderim yeni bir süreç gibi önceki işleri diskten yükler
+        manager = JobManager(jobs_dir=str(jobs_dir), history_limit=2)
+        job_id = manager.submit(analyzer, [], 'turkish')
+        wait_for(manager.get(job_id))
+        manager._executor.shutdown(wait=True)
+        ids.append(job_id)
+    # Yeni iş dahil en fazla history_limit iş tutulur
+    assert len(manager.list_jobs()) == 2
+    assert manager.get(ids[-1]) is not None
+    assert sorted(path.stem for path in jobs_dir.glob('*.json')) == sorted(job.id for job in manager.list_jobs())
+
+
+def test_progress_saves_are_throttled(analyzer, tmp_path, monkeypatch):
+    use_chunks(analyzer, size=1)
+    manager = JobManager(jobs_dir=str(tmp_path / 'jobs'), save_interval=60)
+    saves = []
+    save = manager._save
+    monkeypatch.setattr(manager, '_save', lambda job: saves.append(job.status) or save(job))
+    job = wait_for(manager.get(manager.submit(analyzer, make_tweets(20), 'turkish')))
+    manager._executor.shutdown(wait=True)
+
+    assert job.status == DONE and job.completed_chunks == 20
+    # Kuyruk, başlangıç ve bitiş; parça başına yazım yok
+    assert saves == ['queued', 'running', 'done']
+    saved = json.loads((tmp_path / 'jobs' / f'{job.id}.json').read_text(encoding='utf-8'))
+    assert len(saved['chunk_results']) == 20
+
+
+def test_save_failure_is_reported_on_the_job(analyzer, tmp_path, monkeypatch):
+    def fail(*args, **kwargs):
+        raise OSError("disk dolu")
+
+    monkeypatch.setattr(analyzer, 'save_results', fail)
+    manager = JobManager(jobs_dir=str(tmp_path / 'jobs'))
+    job = wait_for(manager.get(manager.submit(analyzer, make_tweets(3), 'turkish')))
+    assert job.status == DONE and job.results
+    assert job.error == "Sonuç kaydedilemedi: disk dolu"
@@ -0,0 +1,63 @@
+import json
+import threading
+import urllib.error
+
+import pytest
+
+from config import Config
+from llm_backends import FakeBackend, FakeBackendError, GeminiBackend, HTTPBackend, create_backend, serve_fake_backend
+from rate_limiter import is_transient_error
+
+
+def test_fake_output_depends_only_on_prompt():
+    first = FakeBackend(latency_mean=0, seed=1)
+    second = FakeBackend(latency_mean=0, seed=2)
+    prompt = 'Türkçe analiz: $ZRO ve #LayerZero'
+    assert first.generate(prompt) == second.generate(prompt)
+    assert first.generate(prompt) != first.generate(prompt + ' ')
+    assert '$ZRO' in first.generate(prompt) and first.calls == 4
+
+
+def test_fake_bilingual_and_json_responses():
+    backend = FakeBackend(latency_mean=0)
+    bilingual = backend.generate('[[TURKCE]] ... [[ENGLISH]]')
+    assert bilingual.startswith('[[TURKCE]]\n1. GENEL ÖZET') and '\n[[ENGLISH]]\n1. GENERAL SUMMARY' in bilingual
+    data = json.loads(backend.generate_json('Tweet data:\n$ZRO airdrop, $STRK #points'))
+    assert [project['token'] for project in data['projects']] == ['$STRK', '$ZRO']
+
+
+def test_fake_stream_matches_generate():
+    backend = FakeBackend(latency_mean=0)
+    assert ''.join(backend.generate_stream('prompt')) == backend.generate('prompt')
+
+
+def test_fake_errors_are_transient():
+    backend = FakeBackend(latency_mean=0, error_rate=1.0)
+    with pytest.raises(FakeBackendError) as error:
+        backend.generate('prompt')
+    assert is_transient_error(error.value)
+
+
+def test_http_backend_round_trip():
+    server = serve_fake_backend(port=0, latency_mean=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        client = HTTPBackend(f'http://127.0.0.1:{server.server_address[1]}')
+        assert client.generate('prompt $ZRO') == FakeBackend(latency_mean=0).generate('prompt $ZRO')
+
+        server.backend.error_rate = 1.0
+        with pytest.raises(urllib.error.HTTPError) as error:
+            client.generate('prompt')
+        assert error.value.code == 429 and is_transient_error(error.value)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_create_backend():
+    config = Config()
+    assert isinstance(create_backend('fake', config), FakeBackend)
+    gemini = create_backend('gemini', config, api_key='key')
+    # SDK ilk çağrıya kadar yüklenmez
+    assert isinstance(gemini, GeminiBackend) and gemini._model is None
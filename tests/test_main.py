@@ -0,0 +1,21 @@
+import os
+import subprocess
+import sys
+
+from benchmark import measure_startup
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_help_and_missing_file_skip_heavy_imports():
+    results = measure_startup(repeat=1)
+    assert set(results) == {'help', 'missing_file'}
+    for label, result in results.items():
+        assert result['heavy_imports'] == [], label
+
+
+def test_missing_file_fails_fast(tmp_path):
+    completed = subprocess.run([sys.executable, os.path.join(ROOT, 'main.py'), str(tmp_path / 'yok.json')],
+                               capture_output=True, text=True, cwd=tmp_path)
+    assert completed.returncode != 0
+    assert 'yok.json' in completed.stdout + completed.stderr
@@ -0,0 +1,56 @@
+import pytest
+
+from planner import build_plan, simulate
+
+
+def make_tweets(count):
+    return [{'username': f'user_{i}', 'text': f"LayerZero $ZRO airdrop round {i}: bridge {i * 7} USDT"}
+            for i in range(count)]
+
+
+def test_simulate_concurrency_phases_and_cache():
+    latency = lambda output_tokens: 1.0
+    chunk_phase = [(100, 10, False)] * 4 + [(100, 10, True)] * 3
+    assert simulate([chunk_phase], latency, 2, 0, 0) == (2.0, 0.0)
+    # Her seviye bir öncekinin bitmesini bekler
+    assert simulate([chunk_phase, [(100, 10, False)] * 2], latency, 4, 0, 0) == (2.0, 0.0)
+    assert simulate([[(100, 10, True)]], latency, 4, 0, 0) == (0.0, 0.0)
+
+
+def test_simulate_rate_limits():
+    calls = [(100, 10, False)] * 4
+    # Dakikada 2 istek: ilk ikisi hemen, sonrakiler 30 sn arayla
+    assert simulate([calls], lambda output_tokens: 0.0, 4, 2, 0) == (60.0, 90.0)
+    # Dakikada 200 token: üçüncü çağrı 30 sn, dördüncüsü 60 sn bekler
+    assert simulate([calls], lambda output_tokens: 0.0, 4, 0, 200) == (60.0, 90.0)
+
+
+@pytest.mark.parametrize('language, calls', [('both', 4 + 2 + 1), ('turkish', 4 + 2 + 1), ('english', 4 + 2 + 1)])
+def test_plan_matches_run_and_sees_cache_afterwards(analyzer, language, calls):
+    analyzer.config.DEDUP_ENABLED = False
+    analyzer.config.CHUNKING_MODE = 'count'
+    analyzer.config.CHUNK_SIZE = 5
+    analyzer.config.COMBINE_FAN_IN = 2
+    tweets = make_tweets(20)
+
+    plan = build_plan(analyzer, tweets, language)
+    assert (plan['chunks'], plan['calls'], plan['cached'], plan['api_calls']) == (4, calls, 0, calls)
+    assert plan['tasks'][0]['merge_calls'] == [2, 1]
+
+    analyzer.analyze_tweets(tweets, language)
+    assert analyzer.model.calls == plan['api_calls']
+
+    # Çalıştırmadan sonra parça ve birleştirme yanıtlarının hepsi önbellekte bulunur
+    again = build_plan(analyzer, tweets, language)
+    assert (again['cached'], again['api_calls'], again['api_prompt_tokens']) == (calls, 0, 0)
+    assert again['wall_seconds'] == again['prep_seconds']
+
+
+def test_plan_without_bilingual_mode_has_two_tasks(analyzer):
+    analyzer.config.BILINGUAL_MODE = False
+    analyzer.config.DEDUP_ENABLED = False
+    analyzer.config.CHUNKING_MODE = 'count'
+    analyzer.config.CHUNK_SIZE = 5
+    plan = build_plan(analyzer, make_tweets(5), 'both')
+    assert [row['task'] for row in plan['tasks']] == ['turkish', 'english']
+    assert plan['calls'] == 2 and all(row['depth'] == 0 for row in plan['tasks'])
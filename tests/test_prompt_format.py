@@ -0,0 +1,35 @@
+from prompt_format import compact_template, compact_text, format_compact, relative_age
+
+
+def test_compact_text_shortens_links_emoji_and_hashtags():
+    text = 'Claim   now 🚀🚀🔥 https://t.co/abc https://www.LayerZero.network/claim?x=1 #a #b #c #d #e a|b'
+    assert compact_text(text) == 'Claim now 🚀 <link> <layerzero.network> #a #b #c +2# a/b'
+    assert compact_text('#a #b #c') == '#a #b #c'
+
+
+def test_relative_age():
+    assert relative_age(None) == '?'
+    assert relative_age(-5) == '0m'
+    assert relative_age(45 * 60) == '45m'
+    assert relative_age(47 * 3600) == '47h'
+    assert relative_age(3 * 86400) == '3d'
+
+
+def test_format_compact_aliases_repeat_users_and_uses_relative_ages():
+    tweets = [
+        {'username': 'alice', 'timestamp': '2024-06-01T12:00:00Z', 'text': '$ZRO airdrop'},
+        {'username': 'bob', 'timestamp': '2024-06-01T06:00:00Z', 'text': 'bridge', 'duplicate_count': 3},
+        {'username': 'alice', 'text': 'no time'},
+    ]
+    assert format_compact(tweets).split('\n') == [
+        'n|user|age|text (age: before 2024-06-01 12:00 UTC; ×N: N similar tweets)',
+        'users: u1=alice',
+        '1|u1|0m|$ZRO airdrop',
+        '2|bob|6h|bridge ×3',
+        '3|u1|?|no time',
+    ]
+    assert format_compact([{'text': 'x'}]).split('\n')[0].startswith('n|user|age|text (age: unknown;')
+
+
+def test_compact_template_strips_indent():
+    assert compact_template('\n    a\n      b\n') == 'a\n  b'
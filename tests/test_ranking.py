@@ -0,0 +1,57 @@
+import numpy as np
+
+from ranking import count_matches, select_top_tweets, timestamp_seconds
+
+
+def test_keywords_match_at_word_start():
+    counts = count_matches(['Read the disclaimer first', 'You can claim now', 'Claimed! airdrops are live'])
+    assert counts['keyword'].tolist() == [0, 1, 2]
+
+
+def test_whole_words_do_not_match_inside_words():
+    counts = count_matches(['April together question', 'TGE soon, 20% APY, quests open'])
+    assert counts['keyword'].tolist() == [0, 2]
+    assert counts['apy'].tolist() == [0, 2]
+
+
+def test_turkish_capitals_match():
+    counts = count_matches(['BÜYÜK ÖDÜL ÇEKİLİŞİ BAŞLADI', 'Ödülü kazanmak için listelemeyi bekleyin'])
+    assert counts['keyword'].tolist() == [2, 3]
+
+
+def test_cashtags_hashtags_and_numbers():
+    counts = count_matches(['$ZRO and $ARB up, not $100 or US$5 #airdrop', 'Snapshot 12.06.2025, 1.5 ETH, 400 usdt'])
+    assert counts['cashtag'].tolist() == [2, 0]
+    assert counts['hashtag'].tolist() == [1, 0]
+    assert counts['amount'].tolist() == [2, 1]
+    assert counts['date'].tolist() == [0, 1]
+
+
+def test_timestamp_offsets_are_applied():
+    seconds = timestamp_seconds(['2025-01-01T10:00:00+03:00', '2025-01-01T07:00:00Z', '2025-01-01T07:00:00.250Z'])
+    assert seconds[0] == seconds[1]
+    assert abs(seconds[2] - seconds[1]) < 1
+
+
+def test_unparseable_timestamps_are_nan():
+    seconds = timestamp_seconds(['2025-01-01T07:00:00Z', 'dün akşam', None, ''])
+    assert not np.isnan(seconds[0])
+    assert np.isnan(seconds[1:]).all()
+
+
+def test_select_top_tweets_prefers_signals_and_keeps_order():
+    tweets = [
+        {'username': 'a', 'text': 'gm', 'timestamp': '2025-01-01T00:00:00Z'},
+        {'username': 'b', 'text': '$ZRO airdrop snapshot on 12.06.2025, claim 100 USDT #LayerZero', 'timestamp': '2025-01-01T00:00:00Z'},
+        {'username': 'c', 'text': 'nice weather today, going for a walk in the park', 'timestamp': '2025-01-01T00:00:00Z'},
+        {'username': 'd', 'text': 'Starknet $STRK staking 20% APY, unlock deadline next week', 'timestamp': '2025-01-01T00:00:00Z'},
+    ]
+    assert select_top_tweets(tweets, 2) == [tweets[1], tweets[3]]
+    assert select_top_tweets(tweets, 10) == tweets
+
+
+def test_select_top_tweets_with_no_room():
+    tweets = [{'text': f'$ZRO airdrop {i}'} for i in range(5)]
+    assert select_top_tweets(tweets, 0) == []
+    assert select_top_tweets(tweets, -1) == []
+    assert select_top_tweets([], 3) == []
@@ -0,0 +1,106 @@
+import pytest
+
+from llm_backends import FakeBackend, FakeBackendError
+from rate_limiter import RequestScheduler, TokenBucket, is_transient_error
+
+
+class Flaky:
+    """İlk `failures` çağrıda verilen hatayı fırlatan çağrılabilir"""
+
+    def __init__(self, failures, error):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return 'tamam'
+
+
+def test_bucket_waits_when_empty():
+    bucket = TokenBucket(60)  # saniyede 1
+    bucket.updated = 0.0
+    assert bucket.reserve(60, now=0.0) == 0.0
+    # Kova boş: sıradaki istek 1 sn, ondan sonraki 2 sn bekler
+    assert bucket.reserve(1, now=0.0) == pytest.approx(1.0)
+    assert bucket.reserve(1, now=0.0) == pytest.approx(2.0)
+    # Zaman geçtikçe borç kapanır ama kapasite aşılmaz
+    assert bucket.reserve(1, now=10.0) == 0.0
+    assert bucket.reserve(0, now=1000.0) == 0.0 and bucket.tokens == 60
+
+
+def test_transient_errors():
+    assert is_transient_error(FakeBackendError('429 Resource exhausted'))
+    assert is_transient_error(TimeoutError())
+    assert is_transient_error(RuntimeError('503 Service Unavailable'))
+    assert not is_transient_error(ValueError('API key not valid'))
+
+
+class QuotaError(Exception):
+    code = 429
+
+
+def test_daily_quota_is_not_retried():
+    daily = QuotaError('429 Quota exceeded for metric: generate_content_free_tier_requests, '
+                       'quota_id: GenerateRequestsPerDayPerProjectPerModel-FreeTier')
+    assert not is_transient_error(daily)
+    assert not is_transient_error(RuntimeError('Quota exceeded for requests per day'))
+    # "quota" tek başına geçici sayılmaz; dakikalık 429 ise yeniden denenir
+    assert not is_transient_error(RuntimeError('Project quota not enabled'))
+    assert is_transient_error(QuotaError('Quota exceeded for requests per minute'))
+
+    scheduler = RequestScheduler(requests_per_minute=0, tokens_per_minute=0, base_delay=0)
+    func = Flaky(1, daily)
+    with pytest.raises(QuotaError):
+        scheduler.call(func)
+    assert func.calls == 1
+
+
+def test_scheduler_retries_transient_errors():
+    scheduler = RequestScheduler(requests_per_minute=0, tokens_per_minute=0, base_delay=0)
+    func = Flaky(2, FakeBackendError('429'))
+    assert scheduler.call(func) == ('tamam', 2)
+    assert scheduler.stats()['requests'] == 3 and scheduler.stats()['retries'] == 2
+
+
+def test_scheduler_gives_up():
+    scheduler = RequestScheduler(requests_per_minute=0, tokens_per_minute=0, max_retries=2, base_delay=0)
+    func = Flaky(5, FakeBackendError('429'))
+    with pytest.raises(FakeBackendError):
+        scheduler.call(func)
+    assert func.calls == 3 and scheduler.stats()['failures'] == 1
+
+    permanent = Flaky(1, ValueError('API key not valid'))
+    with pytest.raises(ValueError):
+        scheduler.call(permanent)
+    assert permanent.calls == 1
+
+
+def test_scheduler_throttles_to_token_budget(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr('rate_limiter.time.sleep', sleeps.append)
+    scheduler = RequestScheduler(requests_per_minute=0, tokens_per_minute=600)
+    for _ in range(3):
+        scheduler.call(lambda: None, tokens=300)
+    # 600 token'lık kova iki çağrıyı karşılar; üçüncüsü 300 token (30 sn) bekler
+    assert len(sleeps) == 1 and sleeps[0] == pytest.approx(30, abs=0.5)
+    assert scheduler.stats()['throttled'] == 1
+
+
+def test_analysis_survives_transient_backend_errors(analyzer):
+    backend = FakeBackend(latency_mean=0, latency_jitter=0, error_rate=0.3, seed=3)
+    analyzer.model = backend
+    analyzer.config.CACHE_ENABLED = False
+    analyzer.config.RETRY_BASE_DELAY = 0
+    analyzer.config.MAX_RETRIES = 10
+    analyzer.config.CHUNKING_MODE = 'count'
+    analyzer.config.CHUNK_SIZE = 5
+    analyzer.config.DEDUP_ENABLED = False
+    tweets = [{'username': f'u{i}', 'text': f'$ZRO airdrop snapshot {i}', 'timestamp': '2025-01-01T00:00:00Z'}
+              for i in range(30)]
+
+    results = analyzer.analyze_tweets(tweets, 'both')
+    assert 'Analiz yapılamadı' not in results['turkish'] + results['english']
+    assert analyzer.get_scheduler().stats()['retries'] > 0
@@ -0,0 +1,60 @@
+import time
+
+from response_cache import ResponseCache
+
+
+def test_get_set_and_counters(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    assert cache.get('model', 'prompt') is None
+    cache.set('model', 'prompt', 'yanıt')
+    assert cache.get('model', 'prompt') == 'yanıt'
+    # Model adı anahtarın parçası
+    assert cache.get('other-model', 'prompt') is None
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2
+
+
+def test_peek_leaves_counters_alone(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.set('model', 'prompt', 'yanıt')
+    assert cache.peek('model', 'prompt') == 'yanıt'
+    assert cache.peek('model', 'missing') is None
+    assert cache.hits == cache.misses == 0
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl_seconds=60)
+    cache.set('model', 'prompt', 'yanıt')
+    cache._conn.execute('UPDATE responses SET created_at = ?', (time.time() - 120,))
+    assert cache.peek('model', 'prompt') is None
+    assert cache.get('model', 'prompt') is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_least_recently_used_is_evicted(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=25)
+    cache.set('model', 'a', 'x' * 10)
+    cache.set('model', 'b', 'y' * 10)
+    cache._conn.execute("UPDATE responses SET last_access = last_access - 10 WHERE response = ?", ('y' * 10,))
+    cache.set('model', 'c', 'z' * 10)
+    assert cache.peek('model', 'b') is None
+    assert cache.peek('model', 'a') and cache.peek('model', 'c')
+    assert cache.stats()['bytes'] == 20
+
+
+def test_entries_survive_reopen(tmp_path):
+    ResponseCache(str(tmp_path)).set('model', 'prompt', 'yanıt')
+    reopened = ResponseCache(str(tmp_path))
+    assert reopened.get('model', 'prompt') == 'yanıt'
+    assert reopened.stats()['bytes'] == len('yanıt'.encode('utf-8'))
+
+
+def test_size_limit_counts_other_processes(tmp_path):
+    first = ResponseCache(str(tmp_path), max_bytes=25)
+    second = ResponseCache(str(tmp_path), max_bytes=25)
+    first.set('model', 'a', 'x' * 10)
+    second.set('model', 'b', 'y' * 10)
+    assert first.stats()['bytes'] == 20
+    # İlk bağlantı diğerinin yazdığı kaydı da hesaba katar
+    first.set('model', 'c', 'z' * 10)
+    assert second.stats()['bytes'] <= 25
+    assert first.stats()['entries'] == 2
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from results_store import (ResultsStore, extract_mentions, file_digest, normalize_entity, parse_entity_terms,
+                           tweets_digest)
+
+CONFIG = {'language': 'both', 'model': 'fake-model', 'chunk_size': 50}
+RESULTS = {
+    'turkish': 'LayerZero $ZRO airdrop takvimi açıklandı #LayerZero',
+    'english': 'LayerZero $zro airdrop schedule announced',
+    'chunks': [{'language': 'turkish', 'output': 'Starknet $STRK staking'}],
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultsStore(str(tmp_path / 'results' / 'results.sqlite'))
+    yield store
+    store.close()
+
+
+def test_entity_helpers():
+    assert normalize_entity(' $zro ') == '$ZRO'
+    assert normalize_entity('#LayerZero') == '#layerzero'
+    assert normalize_entity('@LayerZero_Labs') == '@layerzero_labs'
+    assert parse_entity_terms(['$zro, #Airdrop', '$ZRO  @Foo', None]) == ['$ZRO', '#airdrop', '@foo']
+    # Tutarlar ve kelime içindeki işaretler varlık sayılmaz
+    assert extract_mentions(['$ZRO $zro 5$ a$BC $100 #x #LayerZero']) == {'$ZRO': 2, '#layerzero': 1}
+
+
+def test_digests(tmp_path):
+    path = tmp_path / 'tweets.json'
+    path.write_bytes(b'[]')
+    assert file_digest(str(path)) == '4f53cda18c2baa0c0354bb5f9a3ecbe5ed12ab4d8e11ba873c2f11161202b945'
+    tweets = [{'username': 'a', 'text': 'x'}, {'username': 'b', 'text': 'y'}]
+    assert tweets_digest(tweets) == tweets_digest([dict(tweet) for tweet in tweets])
+    assert tweets_digest(tweets) != tweets_digest(tweets[::-1])
+
+
+def test_add_find_and_get_run(store):
+    run_id = store.add_run('tweets.json', RESULTS, CONFIG, source_hash='abc', tweet_count=12)
+    run = store.get_run(run_id)
+    assert (run['source'], run['source_hash'], run['tweet_count'], run['model']) == ('tweets.json', 'abc', 12, 'fake-model')
+    assert run['results'] == RESULTS
+    assert run['mentions'] == {'$ZRO': 2, '#layerzero': 1, '$STRK': 1}
+
+    assert store.find_run('abc', dict(CONFIG))['id'] == run_id
+    assert store.find_run('abc', {**CONFIG, 'chunk_size': 10}) is None
+    assert store.find_run('other', CONFIG) is None
+    assert store.get_run(run_id + 1) is None
+
+
+def test_search_by_entity_and_text(store):
+    first = store.add_run('a.json', RESULTS, CONFIG)
+    second = store.add_run('b.json', {'turkish': 'Celestia $TIA modüler ağ'}, CONFIG)
+    ids = lambda query: [row['id'] for row in store.search(query)]
+
+    assert ids('$zro') == [first]
+    assert ids('$STRK') == [first]
+    assert ids('modüler') == [second]
+    assert ids('airdrop $TIA') == []
+    assert '[airdrop]' in store.search('airdrop')[0]['snippet']
+    assert ids('') == []
+
+
+def test_same_file_is_not_analyzed_twice(analyzer, tmp_path):
+    analyzer.config.REUSE_PREVIOUS_RUNS = True
+    analyzer.config.CACHE_ENABLED = False
+    path = tmp_path / 'tweets.json'
+    path.write_text(json.dumps([{'username': 'a', 'text': 'LayerZero $ZRO airdrop'}]), encoding='utf-8')
+
+    analyzer.analyze_file(str(path), 'turkish')
+    calls = analyzer.model.calls
+    assert calls > 0
+    analyzer.analyze_file(str(path), 'turkish')
+    assert analyzer.model.calls == calls
+    # Farklı ayar yeni çalıştırma demektir
+    analyzer.analyze_file(str(path), 'english')
+    assert analyzer.model.calls > calls
+    assert len(analyzer.get_results_store().list_runs()) == 2
+
+
+def test_text_files_written_unless_disabled(analyzer, tmp_path):
+    results_dir = tmp_path / analyzer.config.RESULTS_DIR
+    saved = analyzer.save_results({'turkish': 'özet', 'english': 'summary'}, 'tweets.json', 1)
+    assert len(saved) == 3
+    assert sorted(path.name[:9] for path in results_dir.glob('*.txt')) == ['analiz_tr', 'analysis_']
+    analyzer.config.EXPORT_TEXT_FILES = False
+    saved = analyzer.save_results({'turkish': 'özet'}, 'other.json', 1)
+    assert saved == [f"{analyzer.config.RESULTS_DB}#2"]
+    assert len(list(results_dir.glob('*.txt'))) == 2
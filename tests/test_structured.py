@@ -0,0 +1,79 @@
+import pytest
+
+from structured import merge_structured, normalize_chunk, parse_structured, render_markdown
+
+
+def chunk(tweets, sentiment, **fields):
+    return normalize_chunk({'sentiment': {'score': sentiment}, **fields}, tweet_count=tweets)
+
+
+def test_parse_structured_skips_fences_and_preamble():
+    assert parse_structured('Here you go:\n```json\n{"summary": ["a"]}\n```') == {'summary': ['a']}
+    with pytest.raises(ValueError):
+        parse_structured('no json here')
+    with pytest.raises(ValueError):
+        parse_structured('[1, 2]')
+
+
+def test_normalize_chunk_tolerates_bad_fields():
+    data = normalize_chunk({
+        'summary': 'tek metin',
+        'projects': [{'name': 'LayerZero', 'token': 'zro'}, 'bozuk', {'description': 'adsız'}],
+        'tokens': [{'symbol': ''}, {'symbol': '$strk', 'note': {'tr': '', 'en': 'staking'}}],
+        'sentiment': 'olumlu',
+        'conclusion': None,
+    }, tweet_count=3)
+    assert data['summary'] == [{'tr': 'tek metin', 'en': 'tek metin'}]
+    assert [(item['name'], item['token']) for item in data['projects']] == [('LayerZero', '$ZRO')]
+    assert data['tokens'] == [{'symbol': '$STRK', 'project': '', 'notes': [{'tr': 'staking', 'en': 'staking'}]}]
+    assert data['sentiment'] is None
+    assert data['conclusion'] == []
+    assert normalize_chunk({'sentiment': 4})['sentiment'] == 1.0
+
+
+def test_merge_joins_by_name_or_token_and_weights_sentiment():
+    first = chunk(1, 1.0, summary=['Airdrop haftası'],
+                  projects=[{'name': 'LayerZero', 'description': 'köprü'}],
+                  airdrops=[{'project': 'LayerZero', 'date': '12.06.2025', 'requirements': ['bridge']}])
+    second = chunk(3, -0.2, summary=['airdrop  haftası!'],
+                   projects=[{'name': 'Layer Zero', 'token': 'ZRO', 'description': 'köprü'}],
+                   airdrops=[{'token': 'ZRO', 'project': 'layerzero', 'date': '12.06.2025',
+                              'requirements': ['bridge', 'stake']}])
+    merged = merge_structured([first, second])
+
+    assert (merged['chunks'], merged['tweets']) == (2, 4)
+    assert len(merged['summary']) == 1
+    assert [(p['name'], p['token'], p['mentions'], len(p['descriptions'])) for p in merged['projects']] == \
+        [('LayerZero', '$ZRO', 2, 1)]
+    airdrop, = merged['airdrops']
+    assert (airdrop['dates'], [r['en'] for r in airdrop['requirements']]) == (['12.06.2025'], ['bridge', 'stake'])
+    assert merged['sentiment'] == pytest.approx((1.0 - 0.6) / 4)
+
+    # Birleşik sonuç yeniden parça olarak verilebilir (artımlı mod)
+    again = merge_structured([merged, chunk(1, None, projects=[{'name': 'LayerZero'}])])
+    assert (again['chunks'], again['tweets'], again['projects'][0]['mentions']) == (3, 5, 3)
+
+
+def test_render_markdown_uses_section_titles_per_language():
+    merged = merge_structured([chunk(2, 0.5, summary=[{'tr': 'Özet', 'en': 'Summary'}],
+                                     projects=[{'name': 'Starknet', 'token': 'STRK'}])])
+    turkish = render_markdown(merged, 'tr')
+    english = render_markdown(merged, 'en')
+    assert turkish.startswith('1. GENEL ÖZET\n- Özet')
+    assert english.startswith('1. GENERAL SUMMARY\n- Summary')
+    assert '**Starknet ($STRK)**' in english
+    assert '2. AIRDROP INFORMATION\n- None reported' in english
+    assert 'Genel duyarlılık: olumlu (+0.50)' in turkish
+
+
+def test_structured_analysis_with_fake_backend(analyzer):
+    analyzer.config.STRUCTURED_OUTPUT = True
+    analyzer.config.DEDUP_ENABLED = False
+    analyzer.config.CHUNKING_MODE = 'count'
+    analyzer.config.CHUNK_SIZE = 2
+    tweets = [{'username': f'u{i}', 'text': f'LayerZero $ZRO airdrop {i}'} for i in range(6)]
+    results = analyzer.analyze_tweets(tweets, 'both')
+    assert results['turkish'].startswith('1. GENEL ÖZET')
+    assert results['english'].startswith('1. GENERAL SUMMARY')
+    # Parçalar modele geri gönderilmeden birleştirilir
+    assert analyzer.model.calls == 3
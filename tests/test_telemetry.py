@@ -0,0 +1,52 @@
+import pytest
+
+from llm_backends import FakeBackend
+from telemetry import Telemetry
+
+
+def test_spans_record_duration_and_errors():
+    telemetry = Telemetry()
+    with telemetry.span('load', file='a.json'):
+        pass
+    with pytest.raises(KeyError):
+        with telemetry.span('load'):
+            raise KeyError('x')
+    first, second = telemetry.spans
+    assert first['file'] == 'a.json' and 'error' not in first
+    assert second['error'] == 'KeyError'
+    assert telemetry.summary()['stages']['load']['count'] == 2
+
+
+def test_call_summary_and_prometheus():
+    telemetry = Telemetry()
+    telemetry.record_call('chunk', 400, 100, 900, latency=0.2, retries=1)
+    telemetry.record_call('chunk', 400, 100, 900, latency=0.0, cached=True)
+    telemetry.record_call('merge', 800, 200, 900, latency=0.4, first_token=0.1)
+    calls = telemetry.summary()['calls']
+    assert calls['chunk']['calls'] == 2 and calls['chunk']['cached'] == 1 and calls['chunk']['retries'] == 1
+    # Önbellekten dönen çağrılar gecikme dağılımına girmez
+    assert calls['chunk']['latency_p50'] == 0.2
+    assert calls['merge']['first_token_p50'] == 0.1
+
+    text = telemetry.to_prometheus()
+    assert 'tweet_analyzer_llm_calls_total{kind="chunk"} 2' in text
+    assert 'tweet_analyzer_llm_first_token_seconds{kind="merge",quantile="0.5"} 0.1' in text
+
+
+def test_analysis_records_stages_and_calls(analyzer, tmp_path):
+    analyzer.model = FakeBackend(latency_mean=0, latency_jitter=0)
+    analyzer.config.CHUNKING_MODE = 'count'
+    analyzer.config.CHUNK_SIZE = 2
+    analyzer.config.DEDUP_ENABLED = False
+    tweets = [{'username': f'u{i}', 'text': f'$ZRO snapshot {i}'} for i in range(4)]
+    analyzer.analyze_tweets(tweets, 'turkish')
+    analyzer.analyze_tweets(tweets, 'turkish')
+
+    summary = analyzer.telemetry.summary()
+    assert {'chunking', 'chunk_analysis', 'combine'} <= set(summary['stages'])
+    # İkinci çalıştırma tamamen önbellekten döner
+    assert (summary['calls']['chunk']['calls'], summary['calls']['chunk']['cached']) == (4, 2)
+    assert (summary['calls']['merge']['calls'], summary['calls']['merge']['cached']) == (2, 1)
+
+    analyzer.telemetry.write_json(str(tmp_path / 'metrics.json'))
+    assert (tmp_path / 'metrics.json').stat().st_size > 0
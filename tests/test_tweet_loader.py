@@ -0,0 +1,85 @@
+import io
+import json
+
+import pytest
+
+import tweet_loader
+from tweet_loader import LoadStats, iter_tweets
+
+
+class CountingStream(io.BytesIO):
+    """Kaç kez okunduğunu sayan bayt akışı"""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+
+def make_tweets(count):
+    return [{'username': f'user_{i}', 'text': f'Tweet {i} 🚀 "$ZRO" airdrop \\u00fc', 'timestamp': '2025-01-01T00:00:00Z'}
+            for i in range(count)]
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    # Elemanlar, dizgeler ve kaçışlar parça sınırlarında bölünsün
+    monkeypatch.setattr(tweet_loader, 'READ_CHUNK_SIZE', 7)
+
+
+def test_json_array_across_chunk_boundaries(small_chunks):
+    tweets = make_tweets(50)
+    data = json.dumps(tweets, ensure_ascii=False, indent=1).encode('utf-8')
+    stats = LoadStats()
+    assert list(iter_tweets(io.BytesIO(data), stats)) == tweets
+    assert stats.format == 'json' and stats.loaded == 50
+
+
+def test_syntax_error_mid_array_raises_without_reading_rest(monkeypatch):
+    monkeypatch.setattr(tweet_loader, 'READ_CHUNK_SIZE', 256)
+    body = json.dumps(make_tweets(2000))
+    # 5. elemanın içinde ':' eksik
+    broken = body.replace('"timestamp": ', '"timestamp" ', 5).replace('"timestamp" ', '"timestamp": ', 4)
+    stream = CountingStream(broken.encode('utf-8'))
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_tweets(stream))
+    assert stream.reads < 10
+
+
+def test_truncated_array_raises():
+    data = json.dumps(make_tweets(3))[:-30].encode('utf-8')
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_tweets(io.BytesIO(data)))
+
+
+def test_small_jsonl_file(tmp_path):
+    path = tmp_path / 'tweets.jsonl'
+    path.write_text(''.join(json.dumps(tweet) + '\n' for tweet in make_tweets(3)), encoding='utf-8')
+    assert list(iter_tweets(str(path))) == make_tweets(3)
+
+
+def test_jsonl_bad_line_is_skipped(small_chunks):
+    lines = [json.dumps(tweet) for tweet in make_tweets(3)]
+    lines.insert(1, '{"text": "yarım kalmış')
+    stats = LoadStats()
+    tweets = list(iter_tweets(io.BytesIO('\n'.join(lines).encode('utf-8')), stats))
+    assert [tweet['username'] for tweet in tweets] == ['user_0', 'user_1', 'user_2']
+    assert stats.format == 'jsonl'
+    assert stats.loaded == 3 and stats.skipped == 1
+    assert stats.errors[0].startswith('Satır 2:')
+
+
+def test_jsonl_without_any_valid_line_raises():
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_tweets(io.BytesIO(b'{"text": \n"a"}\n')))
+
+
+def test_invalid_records_are_counted():
+    data = json.dumps([{'text': 'ok'}, {'username': 'no_text'}, 42, {'text': 'ok', 'timestamp': 5}])
+    stats = LoadStats()
+    assert list(iter_tweets(io.StringIO(data), stats)) == [{'text': 'ok'}]
+    assert stats.loaded == 1 and stats.skipped == 3
+    assert stats.errors[0].startswith('Kayıt 2:')
@@ -0,0 +1,43 @@
+from tweet_stats import (OTHER_USERS, PREVIEW_CHARS, UNKNOWN, build_tweet_columns,
+                         create_tweet_dataframe, create_tweet_stats)
+
+
+def make_tweets():
+    tweets = [{'username': f'user{i % 12}', 'text': 'x' * (i + 1), 'timestamp': '2024-05-01T10:00:00Z'}
+              for i in range(120)]
+    tweets.append({'text': None})
+    return tweets
+
+
+def test_columns_fill_missing_fields():
+    columns = build_tweet_columns(make_tweets())
+    assert len(columns) == 121
+    last = columns.iloc[-1]
+    assert (last['username'], last['text'], last['timestamp'], last['chars']) == (UNKNOWN, '', UNKNOWN, 0)
+    assert build_tweet_columns([]) is None
+
+
+def test_dataframe_truncates_only_long_texts():
+    tweets = make_tweets()
+    frame = create_tweet_dataframe(tweets)
+    assert list(frame.columns) == ['Kullanıcı', 'Tweet', 'Tarih', 'Karakter Sayısı']
+    assert frame['Tweet'][PREVIEW_CHARS - 1] == 'x' * PREVIEW_CHARS
+    assert frame['Tweet'][PREVIEW_CHARS] == 'x' * PREVIEW_CHARS + '...'
+    assert frame['Karakter Sayısı'][PREVIEW_CHARS] == PREVIEW_CHARS + 1
+    # Önceden hesaplanmış sütunlar aynı sonucu verir
+    assert frame.equals(create_tweet_dataframe(tweets, columns=build_tweet_columns(tweets)))
+    assert create_tweet_dataframe([]) is None
+
+
+def test_stats_group_small_users_and_bin_lengths():
+    stats = create_tweet_stats(make_tweets(), top_users=5, bins=10)
+    assert stats['total_tweets'] == 121
+    assert stats['unique_users'] == 13
+    assert stats['max_chars'] == 120
+    assert stats['avg_chars'] == sum(range(1, 121)) / 121
+    assert len(stats['user_counts']) == 6
+    assert stats['user_counts'][OTHER_USERS] == 121 - 5 * 10
+    assert stats['user_counts'].sum() == 121
+    assert stats['char_histogram']['count'].sum() == 121
+    assert len(stats['char_histogram']) == 10
+    assert create_tweet_stats([]) is None
@@ -0,0 +1,72 @@
+import pytest
+
+from incremental import parse_time
+from tweet_store import TweetStore, describe_selection, fts_query, parse_since
+
+
+def make_tweet(username, timestamp, text):
+    return {'username': username, 'timestamp': timestamp, 'text': text}
+
+
+TWEETS = [
+    make_tweet('alice', '2024-05-31T23:00:00Z', 'LayerZero $ZRO airdrop snapshot'),
+    make_tweet('bob', '2024-06-01T10:00:00Z', 'Starknet $STRK staking is live'),
+    make_tweet('carol', '2024-06-02T10:00:00Z', 'ZRO bridge volume keeps climbing'),
+    make_tweet('dave', None, 'undated $ZRO rumour'),
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TweetStore(str(tmp_path / 'store'))
+    yield store
+    store.close()
+
+
+def test_ingest_partitions_by_month_and_skips_duplicates(store):
+    assert store.ingest(TWEETS) == {'added': 4, 'duplicates': 0}
+    assert store.partitions() == ['2024_05', '2024_06', 'undated']
+    version = store.version()
+
+    assert store.ingest(TWEETS + [make_tweet('erin', '2024-06-03T00:00:00Z', 'new')]) == {'added': 1, 'duplicates': 4}
+    assert store.stats()['partitions'] == {'2024_05': 1, '2024_06': 3, 'undated': 1}
+    assert store.version() != version
+
+
+def test_query_by_time_and_match(store):
+    store.ingest(TWEETS)
+    texts = lambda tweets: [tweet['text'] for tweet in tweets]
+
+    since = parse_time('2024-06-01T00:00:00Z')
+    assert texts(store.query(since=since)) == [TWEETS[2]['text'], TWEETS[1]['text']]
+    assert texts(store.query(until=since)) == [TWEETS[0]['text']]
+    # Cashtag birebir aranır; düz "ZRO" geçen tweet $ZRO araması dışında kalır
+    assert texts(store.query(match='$ZRO', since=parse_time('2024-01-01T00:00:00Z'))) == [TWEETS[0]['text']]
+    assert sorted(texts(store.query(match='zro'))) == sorted(texts([TWEETS[0], TWEETS[2], TWEETS[3]]))
+    assert len(store.query(limit=2)) == 2
+
+
+def test_parse_since():
+    now = 1_700_000_000.0
+    assert parse_since('6h', now=now) == now - 6 * 3600
+    assert parse_since('1.5D', now=now) == now - 1.5 * 86400
+    assert parse_since('2024-06-01T12:00:00Z') == parse_time('2024-06-01T12:00:00Z')
+    with pytest.raises(ValueError):
+        parse_since('yesterday')
+
+
+def test_fts_query_and_selection_label():
+    assert fts_query('$ZRO #airdrop bridge') == '"ZRO" "airdrop" "bridge"'
+    assert describe_selection('6h', '$ZRO airdrop') == 'store_6h_ZRO-airdrop'
+    assert describe_selection() == 'store'
+
+
+def test_tagged_terms_match_whole_words_only(store):
+    store.ingest([
+        make_tweet('a', '2024-06-01T10:00:00Z', '$ZROcoin is not zro'),
+        make_tweet('b', '2024-06-01T11:00:00Z', 'buy $zro.'),
+        make_tweet('c', '2024-06-01T12:00:00Z', '#ethereum is not eth'),
+        make_tweet('d', '2024-06-01T13:00:00Z', 'gm #ETH, gm'),
+    ])
+    assert [tweet['text'] for tweet in store.query(match='$ZRO')] == ['buy $zro.']
+    assert [tweet['text'] for tweet in store.query(match='#eth')] == ['gm #ETH, gm']
@@ -0,0 +1,15 @@
+"""
+Yerel token tahmini.
+Gemini'nin count_tokens çağrısı bir API isteği gerektirdiği için parça planlamasında
+UTF-8 bayt uzunluğuna dayalı hızlı bir yaklaşım kullanılır (emoji ve Türkçe karakterler
+birden fazla bayt tuttuğundan karakter sayısından daha isabetlidir).
+"""
+
+BYTES_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Metnin yaklaşık token sayısını döndür"""
+    if not text:
+        return 0
+    return -(-len(text.encode('utf-8')) // BYTES_PER_TOKEN)
@@ -0,0 +1,201 @@
+"""
+Tweet dosyaları için akışlı yükleyici.
+Üst düzey JSON dizisini ya da JSON Lines dosyasını tweet tweet okur; dosyanın tamamı
+belleğe alınmadığı için bellek kullanımı dosya boyutundan bağımsız kalır.
+"""
+
+import codecs
+import json
+from typing import Any, Dict, Iterator, List, Optional
+
+READ_CHUNK_SIZE = 64 * 1024
+WHITESPACE = ' \t\r\n'
+# Sonda yarım kalabilecek en uzun belirteç ('-Infinity', '\\uXXXX' kaçışı) için pay
+TRUNCATION_CHARS = 16
+
+
+class LoadStats:
+    """Yükleme sırasında geçerli ve atlanan kayıtların sayımı"""
+
+    MAX_ERRORS = 10
+
+    def __init__(self):
+        self.loaded = 0
+        self.skipped = 0
+        self.format = None  # 'json' veya 'jsonl'
+        self.errors: List[str] = []
+
+    def add_error(self, message: str):
+        self.skipped += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append(message)
+
+
+def validate_tweet(record: Any) -> Optional[str]:
+    """Tweet kaydını doğrula; geçerliyse None, değilse hata nedenini döndür"""
+    if not isinstance(record, dict):
+        return f"nesne bekleniyordu, {type(record).__name__} bulundu"
+    if not isinstance(record.get('text'), str):
+        return "'text' alanı eksik veya metin değil"
+    for field in ('username', 'timestamp'):
+        value = record.get(field)
+        if value is not None and not isinstance(value, str):
+            return f"'{field}' alanı metin değil"
+    return None
+
+
+def _read_text_chunks(stream) -> Iterator[str]:
+    """Metin ya da bayt akışından UTF-8 metin parçaları üret"""
+    decoder = None
+    while True:
+        chunk = stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        if isinstance(chunk, bytes):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder('utf-8-sig')()
+            chunk = decoder.decode(chunk)
+            if not chunk:
+                continue
+        yield chunk
+    if decoder is not None:
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+
+
+def _truncated(error: json.JSONDecodeError, buf: str) -> bool:
+    """Çözme hatası tamponun sonunda yarım kalmış bir elemandan mı kaynaklanıyor"""
+    # Kapanmamış dizgenin hatası dizginin başını gösterir; diğerleri hatanın olduğu yeri
+    return error.pos >= len(buf) - TRUNCATION_CHARS or error.msg.startswith('Unterminated string')
+
+
+def _iter_json_array(chunks: Iterator[str], buf: str, pos: int) -> Iterator[Any]:
+    """'[' karakterinden sonrasını eleman eleman çöz"""
+    decoder = json.JSONDecoder()
+    expect_value = True
+    first = True
+
+    while True:
+        # Boşlukları atla, gerekirse yeni parça oku
+        while pos < len(buf) and buf[pos] in WHITESPACE:
+            pos += 1
+        if pos >= len(buf):
+            chunk = next(chunks, '')
+            if not chunk:
+                raise json.JSONDecodeError("Beklenmeyen dosya sonu", buf, pos)
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+
+        char = buf[pos]
+        if char == ']' and (first or not expect_value):
+            return
+        if not expect_value:
+            if char != ',':
+                raise json.JSONDecodeError("',' veya ']' bekleniyordu", buf, pos)
+            pos += 1
+            expect_value = True
+            continue
+
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+                break
+            except json.JSONDecodeError as e:
+                # Yalnızca parçanın sonunda yarım kalan eleman için okumaya devam et; ortadaki
+                # sözdizimi hatası dosyanın geri kalanını belleğe almadan hemen yükseltilir
+                if not _truncated(e, buf):
+                    raise
+                chunk = next(chunks, '')
+                if not chunk:
+                    raise
+                buf, pos = buf[pos:] + chunk, 0
+
+        yield value
+        first = False
+        expect_value = False
+        pos = end
+        if pos > READ_CHUNK_SIZE:
+            buf, pos = buf[pos:], 0
+
+
+def _iter_json_lines(chunks: Iterator[str], buf: str, stats: LoadStats) -> Iterator[Any]:
+    """
+    Her satırı ayrı bir JSON nesnesi olarak çöz. Çözülemeyen satırlar atlanıp `stats` üzerinde
+    sayılır; hiçbir satır çözülemezse dosya JSON Lines değildir ve ilk hata yükseltilir.
+    """
+    line_no = 0
+    decoded = False
+    first_error = None
+    pending = buf
+    while True:
+        chunk = next(chunks, None)
+        if chunk is not None:
+            pending += chunk
+            lines = pending.split('\n')
+            pending = lines.pop()
+        else:
+            # İlk okuma dosyanın tamamını almış olabilir; kalan da satırlara bölünür
+            lines = pending.split('\n')
+        for line in lines:
+            line_no += 1
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                error = json.JSONDecodeError(f"Satır {line_no}: {e.msg}", e.doc, e.pos)
+                first_error = first_error or error
+                stats.add_error(error.msg)
+                continue
+            decoded = True
+            yield record
+        if chunk is None:
+            if first_error and not decoded:
+                raise first_error
+            return
+
+
+def iter_tweets(source, stats: Optional[LoadStats] = None) -> Iterator[Dict[str, Any]]:
+    """
+    JSON dizisi veya JSON Lines kaynağından tweet'leri tek tek üret.
+    `source` dosya yolu ya da (metin/bayt) dosya nesnesi olabilir. Geçersiz kayıtlar
+    atlanır ve `stats` üzerinde sayılır.
+    """
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            yield from iter_tweets(f, stats)
+        return
+
+    stats = stats if stats is not None else LoadStats()
+    chunks = _read_text_chunks(source)
+
+    # Biçimi ilk boşluk olmayan karakterden belirle
+    buf, pos = '', 0
+    while True:
+        while pos < len(buf) and buf[pos] in WHITESPACE + '\ufeff':
+            pos += 1
+        if pos < len(buf):
+            break
+        chunk = next(chunks, '')
+        if not chunk:
+            return
+        buf, pos = chunk, 0
+
+    if buf[pos] == '[':
+        stats.format = 'json'
+        records = _iter_json_array(chunks, buf, pos + 1)
+    elif buf[pos] == '{':
+        stats.format = 'jsonl'
+        records = _iter_json_lines(chunks, buf[pos:], stats)
+    else:
+        raise ValueError("Tweet dosyası bir JSON dizisi ya da JSON Lines olmalı")
+
+    for index, record in enumerate(records, 1):
+        error = validate_tweet(record)
+        if error:
+            stats.add_error(f"Kayıt {index}: {error}")
+            continue
+        stats.loaded += 1
+        yield record
@@ -0,0 +1,75 @@
+"""
+Streamlit uygulamalarının ortak tablo ve istatistik yardımcıları.
+Streamlit'ten bağımsız olduğu için benchmark ve komut satırından da içe aktarılabilir.
+
+Tweet listesi bir kez sütunlara çevrilir (`build_tweet_columns`); tablo ve istatistikler
+bu sütunlar üzerinde vektörel olarak hesaplanır.
+"""
+
+import numpy as np
+import pandas as pd
+
+UNKNOWN = 'Bilinmeyen'
+OTHER_USERS = 'Diğer'
+PREVIEW_CHARS = 100
+
+def build_tweet_columns(tweets):
+    """Tweet sözlüklerinden tek geçişte kullanıcı, metin, tarih ve uzunluk sütunları oluştur"""
+    if not tweets:
+        return None
+
+    texts = [tweet.get('text') or '' for tweet in tweets]
+    # dtype=object, pandas'ın milyonlarca satırda string türü çıkarımı yapmasını önler
+    return pd.DataFrame({
+        'username': pd.Series([tweet.get('username') or UNKNOWN for tweet in tweets], dtype=object),
+        'text': pd.Series(texts, dtype=object),
+        'timestamp': pd.Series([tweet.get('timestamp') or UNKNOWN for tweet in tweets], dtype=object),
+        'chars': np.fromiter(map(len, texts), dtype=np.int32, count=len(texts)),
+    })
+
+def create_tweet_dataframe(tweets, columns=None):
+    """Create a pandas DataFrame from tweets"""
+    columns = build_tweet_columns(tweets) if columns is None else columns
+    if columns is None:
+        return None
+
+    # Yalnızca uzun metinler kısaltılır; kısa olanlar olduğu gibi paylaşılır
+    preview = columns['text'].to_numpy().copy()
+    long_texts = columns['chars'].to_numpy() > PREVIEW_CHARS
+    preview[long_texts] = [text[:PREVIEW_CHARS] + '...' for text in preview[long_texts]]
+    return pd.DataFrame({
+        'Kullanıcı': columns['username'],
+        'Tweet': pd.Series(preview, dtype=object),
+        'Tarih': columns['timestamp'],
+        'Karakter Sayısı': columns['chars'],
+    })
+
+def create_tweet_stats(tweets, columns=None, top_users=10, bins=20):
+    """Create statistics and visualizations from tweets"""
+    columns = build_tweet_columns(tweets) if columns is None else columns
+    if columns is None:
+        return None
+
+    # Kullanıcı dağılımı: en çok tweet atan `top_users` kullanıcı, kalanı tek dilimde
+    user_counts = columns['username'].value_counts()
+    unique_users = len(user_counts)
+    if unique_users > top_users:
+        other = user_counts.iloc[top_users:].sum()
+        user_counts = pd.concat([user_counts.iloc[:top_users], pd.Series({OTHER_USERS: other})])
+
+    # Karakter sayısı histogramı sunucu tarafında hesaplanır; grafiğe yalnızca kutular gider
+    chars = columns['chars'].to_numpy()
+    hist_counts, edges = np.histogram(chars, bins=bins)
+
+    return {
+        'total_tweets': len(columns),
+        'unique_users': unique_users,
+        'avg_chars': float(chars.mean()),
+        'max_chars': int(chars.max()),
+        'char_histogram': pd.DataFrame({
+            'start': edges[:-1],
+            'end': edges[1:],
+            'count': hist_counts,
+        }),
+        'user_counts': user_counts
+    }
@@ -0,0 +1,244 @@
+"""
+Yerel tweet deposu.
+Scraper çıktıları aylık SQLite bölümlerine (`tweets_YYYY_MM.sqlite`) eklenir. Her bölümde
+zaman sütunu indeksli bir tablo ve metin için FTS5 tam metin indeksi bulunur; aynı
+kullanıcı + zaman + metin özetine sahip tweet ikinci kez eklenmez. Böylece "son 6 saatte
+$ZRO geçen tweet'ler" gibi seçimler ham JSON'u yeniden okumadan yapılabilir.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from incremental import parse_time, tweet_id
+from tweet_loader import LoadStats, iter_tweets
+
+INGEST_BATCH_SIZE = 5000
+UNDATED = 'undated'
+PARTITION_RE = re.compile(r'^tweets_(\d{4})_(\d{2})\.sqlite$')
+DURATION_RE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([smhdw])\s*$', re.IGNORECASE)
+DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 7 * 86400}
+TERM_RE = re.compile(r'[$#@]?\w+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tweets (
+    id TEXT PRIMARY KEY,
+    ts REAL,
+    username TEXT,
+    text TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tweets_ts ON tweets (ts);
+CREATE VIRTUAL TABLE IF NOT EXISTS tweets_fts USING fts5 (
+    text, content='tweets', content_rowid='rowid', tokenize='unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS tweets_fts_insert AFTER INSERT ON tweets BEGIN
+    INSERT INTO tweets_fts (rowid, text) VALUES (new.rowid, new.text);
+END;
+"""
+
+
+def parse_since(value: str, now: Optional[float] = None) -> float:
+    """'6h', '30m', '2d', '1w' gibi süreleri ya da ISO 8601 zamanı epoch saniyesine çevir"""
+    match = DURATION_RE.match(value)
+    if match:
+        now = time.time() if now is None else now
+        return now - float(match.group(1)) * DURATION_UNITS[match.group(2).lower()]
+    moment = parse_time(value)
+    if moment is None:
+        raise ValueError(f"Geçersiz zaman: {value} (örnek: 6h, 2d veya 2024-06-01T12:00)")
+    return moment
+
+
+def store_time(tweet: Dict[str, Any]) -> Optional[float]:
+    """Depoda bölümleme ve filtreleme için tweet zamanı: önce timestamp, yoksa scraped_at"""
+    return parse_time(tweet.get('timestamp')) or parse_time(tweet.get('scraped_at'))
+
+
+def partition_name(moment: Optional[float]) -> str:
+    if moment is None:
+        return UNDATED
+    return datetime.fromtimestamp(moment, tz=timezone.utc).strftime('%Y_%m')
+
+
+def _partition_bounds(name: str):
+    """Bölümün [başlangıç, bitiş) epoch aralığı; tarihsiz bölüm için None"""
+    match = re.match(r'^(\d{4})_(\d{2})$', name)
+    if not match:
+        return None
+    year, month = int(match.group(1)), int(match.group(2))
+    start = datetime(year, month, 1, tzinfo=timezone.utc)
+    end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+    return start.timestamp(), end.timestamp()
+
+
+def term_pattern(term: str) -> str:
+    """İşaretli terimin ('$ZRO', '#eth') yalnızca tam kelime olarak eşleştiği düzenli ifade"""
+    return r'(?<![\w$#@])' + re.escape(term) + r'(?!\w)'
+
+
+def _term_match(pattern: str, text: Optional[str]) -> bool:
+    return re.search(pattern, text or '', re.IGNORECASE) is not None
+
+
+def fts_query(match: str) -> str:
+    """Serbest metni FTS5 sorgusuna çevir (terimler AND ile, her biri tırnak içinde)"""
+    terms = [term.lstrip('$#@') for term in TERM_RE.findall(match)]
+    return ' '.join(f'"{term}"' for term in terms if term)
+
+
+class TweetStore:
+    """Aylık bölümlenmiş, tam metin indeksli SQLite tweet deposu"""
+
+    def __init__(self, store_dir: str = 'store'):
+        self.store_dir = store_dir
+        os.makedirs(store_dir, exist_ok=True)
+        self._connections: Dict[str, sqlite3.Connection] = {}
+        self._lock = threading.Lock()
+
+    def _connect(self, name: str) -> sqlite3.Connection:
+        conn = self._connections.get(name)
+        if conn is None:
+            path = os.path.join(self.store_dir, f"tweets_{name}.sqlite")
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(SCHEMA)
+            conn.create_function('term_match', 2, _term_match, deterministic=True)
+            self._connections[name] = conn
+        return conn
+
+    def partitions(self) -> List[str]:
+        """Diskteki bölümler, eskiden yeniye (tarihsiz bölüm sonda)"""
+        names = []
+        for filename in os.listdir(self.store_dir):
+            match = PARTITION_RE.match(filename)
+            if match:
+                names.append(f"{match.group(1)}_{match.group(2)}")
+        names.sort()
+        if os.path.exists(os.path.join(self.store_dir, f"tweets_{UNDATED}.sqlite")):
+            names.append(UNDATED)
+        return names
+
+    def ingest(self, tweets: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """Tweet'leri ekle; aynı kullanıcı + zaman + metin özetine sahip olanlar atlanır"""
+        added = duplicates = 0
+        batches: Dict[str, List[tuple]] = {}
+        pending = 0
+
+        def flush():
+            nonlocal added, duplicates, pending
+            with self._lock:
+                for name, rows in batches.items():
+                    conn = self._connect(name)
+                    with conn:
+                        # rowcount tetikleyicinin FTS yazımlarını saymaz; yalnızca eklenen tweet'ler
+                        inserted = conn.executemany(
+                            'INSERT OR IGNORE INTO tweets (id, ts, username, text, data) VALUES (?, ?, ?, ?, ?)',
+                            rows,
+                        ).rowcount
+                    added += inserted
+                    duplicates += len(rows) - inserted
+            batches.clear()
+            pending = 0
+
+        for tweet in tweets:
+            moment = store_time(tweet)
+            batches.setdefault(partition_name(moment), []).append((
+                tweet_id(tweet), moment, tweet.get('username'), tweet.get('text') or '',
+                json.dumps(tweet, ensure_ascii=False),
+            ))
+            pending += 1
+            if pending >= INGEST_BATCH_SIZE:
+                flush()
+        flush()
+        return {'added': added, 'duplicates': duplicates}
+
+    def ingest_file(self, path: str, stats: Optional[LoadStats] = None) -> Dict[str, int]:
+        """JSON/JSONL dosyasını akışla okuyup depoya ekle"""
+        stats = stats if stats is not None else LoadStats()
+        result = self.ingest(iter_tweets(path, stats))
+        result['skipped'] = stats.skipped
+        return result
+
+    def query(self, since: Optional[float] = None, until: Optional[float] = None,
+              match: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Zaman aralığı ve tam metin eşleşmesine göre tweet'leri en yeniden eskiye döndür"""
+        conditions, params = [], []
+        if since is not None:
+            conditions.append('t.ts >= ?')
+            params.append(since)
+        if until is not None:
+            conditions.append('t.ts < ?')
+            params.append(until)
+        join = ''
+        if match:
+            query = fts_query(match)
+            if query:
+                join = 'JOIN tweets_fts f ON f.rowid = t.rowid'
+                conditions.append('tweets_fts MATCH ?')
+                params.append(query)
+            # FTS '$' ve '#' işaretlerini yok sayar; cashtag/hashtag'ler FTS'in bulduğu satırlarda
+            # ayrıca işaretiyle ve tam kelime olarak aranır ($zro, $zrocoin ile eşleşmez)
+            for term in TERM_RE.findall(match):
+                if term[0] in '$#@':
+                    conditions.append('term_match(?, t.text)')
+                    params.append(term_pattern(term))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        sql = f'SELECT t.ts, t.data FROM tweets t {join} {where} ORDER BY t.ts DESC'
+
+        rows = []
+        with self._lock:
+            for name in reversed(self.partitions()):
+                bounds = _partition_bounds(name)
+                if bounds is None and (since is not None or until is not None):
+                    continue
+                if bounds and ((since is not None and bounds[1] <= since) or (until is not None and bounds[0] >= until)):
+                    continue
+                rows.extend(self._connect(name).execute(sql, params).fetchall())
+                if limit and len(rows) >= limit and since is None:
+                    break
+        rows.sort(key=lambda row: row[0] if row[0] is not None else float('-inf'), reverse=True)
+        if limit:
+            rows = rows[:limit]
+        return [json.loads(data) for _, data in rows]
+
+    def version(self) -> int:
+        """İçerik değiştiğinde değişen ucuz bir sayı (önbellek anahtarları için)"""
+        total = 0
+        with self._lock:
+            for name in self.partitions():
+                total += self._connect(name).execute('SELECT COALESCE(MAX(rowid), 0) FROM tweets').fetchone()[0]
+        return total
+
+    def stats(self) -> Dict[str, Any]:
+        """Bölüm başına tweet sayısı ve toplam boyut"""
+        partitions = {}
+        with self._lock:
+            for name in self.partitions():
+                partitions[name] = self._connect(name).execute('SELECT COUNT(*) FROM tweets').fetchone()[0]
+        size = sum(
+            os.path.getsize(os.path.join(self.store_dir, filename))
+            for filename in os.listdir(self.store_dir) if '.sqlite' in filename
+        )
+        return {'tweets': sum(partitions.values()), 'partitions': partitions, 'bytes': size}
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+
+
+def describe_selection(since: Optional[str] = None, match: Optional[str] = None) -> str:
+    """Depo seçimi için dosya adlarında kullanılabilecek kısa etiket (örn. store_6h_ZRO)"""
+    parts = ['store']
+    for value in (since, match):
+        if value:
+            parts.append(re.sub(r'\W+', '-', value).strip('-'))
+    return '_'.join(part for part in parts if part)